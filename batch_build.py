@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Pythonistas GDL Linktr.ee batch builder
+
+Builds many Linktr.ee pages at once, one per ``linktree_config.json``, using
+a pool of worker processes. Each site is built independently: a broken config
+is reported as a failure without affecting the other sites.
+
+Relative ``output_file`` values are resolved against the directory of the
+config file they come from.
+
+With ``--metrics`` each worker records timing spans for its builds and the
+parent merges them into one report; ``--profile`` only sees worker code with
+``--workers 1``.
+
+Usage:
+    python batch_build.py sites/ --workers 8
+    python batch_build.py "communities/*/linktree_config.json" --incremental
+    python batch_build.py sites/ --workers 1 --metrics metrics.json --profile build.prof
+"""
+
+import argparse
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import icon_assets
+import instrumentation
+import manage_links
+from manage_links import CONFIG, SOCIAL_MEDIA_PLATFORMS, LinkTreeManager, compile_stylesheet
+
+DEFAULT_PATTERN = "**/linktree_config.json"
+
+
+def find_configs(sources, pattern=DEFAULT_PATTERN) -> List[str]:
+    """Expand directories and glob patterns into a sorted list of config files"""
+    found = set()
+    for source in sources:
+        if os.path.isdir(source):
+            matches = glob.glob(os.path.join(source, pattern), recursive=True)
+        else:
+            matches = glob.glob(source, recursive=True)
+        found.update(os.path.abspath(path) for path in matches if os.path.isfile(path))
+    return sorted(found)
+
+
+def shared_assets() -> Dict:
+    """Precompute assets every worker can reuse instead of rebuilding them"""
+    compile_stylesheet(CONFIG['theme'])
+    for platform in SOCIAL_MEDIA_PLATFORMS.values():
+        icon_assets.icon_variants(platform['icon_path'], icon_assets.ICON_CACHE_DIR)
+    return {
+        'stylesheets': dict(manage_links._STYLESHEET_CACHE),
+        'icons': dict(icon_assets._ICON_CACHE),
+    }
+
+
+def _init_worker(assets):
+    """Seed a worker process with the assets precomputed by the parent"""
+    manage_links._STYLESHEET_CACHE.update(assets['stylesheets'])
+    icon_assets._ICON_CACHE.update(assets['icons'])
+
+
+def build_site(config_path, incremental=False, collect_metrics=False) -> Dict:
+    """Build a single site and return its result record; never raises"""
+    result = {
+        'config': config_path,
+        'output': None,
+        'ok': False,
+        'seconds': 0.0,
+        'links': 0,
+        'bytes': 0,
+        'error': None,
+        'metrics': None,
+        'next_transition': None,
+    }
+    metrics = instrumentation.Metrics() if collect_metrics else instrumentation.DISABLED
+    start = time.perf_counter()
+    try:
+        manager = LinkTreeManager(config_path, strict=True, verbose=False, metrics=metrics)
+        output_file = manager.config['output_file']
+        if not os.path.isabs(output_file):
+            output_file = os.path.join(os.path.dirname(config_path), output_file)
+        manager.config['output_file'] = output_file
+        if incremental:
+            manager.generate_html(incremental=True)
+        else:
+            manager.generate_html(stream=True)
+        result['output'] = output_file
+        result['links'] = sum(1 for link in manager.links if link['enabled'])
+        result['next_transition'] = manager.next_transition()
+        result['bytes'] = os.path.getsize(output_file)
+        result['ok'] = True
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    result['seconds'] = time.perf_counter() - start
+    if collect_metrics:
+        result['metrics'] = metrics.to_dict()
+    return result
+
+
+def build_sites(config_paths, workers: Optional[int] = None, incremental=False,
+                collect_metrics=False) -> List[Dict]:
+    """Build every config across a process pool and return per-site results
+
+    ``workers=1`` builds everything in the current process, which is handy
+    for debugging. Results are returned in the order of ``config_paths``.
+    """
+    assets = shared_assets()
+    if workers == 1:
+        return [build_site(path, incremental, collect_metrics) for path in config_paths]
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(assets,)) as pool:
+        futures = {pool.submit(build_site, path, incremental, collect_metrics): path
+                   for path in config_paths}
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                results[path] = future.result()
+            except Exception as e:
+                # The worker itself died (e.g. killed); record it and move on
+                results[path] = {
+                    'config': path, 'output': None, 'ok': False, 'seconds': 0.0,
+                    'links': 0, 'bytes': 0, 'error': f"{type(e).__name__}: {e}",
+                    'metrics': None, 'next_transition': None,
+                }
+    return [results[path] for path in config_paths]
+
+
+def print_report(results, wall_seconds):
+    """Print per-site timings and a summary line"""
+    for result in results:
+        if result['ok']:
+            print(f"OK    {result['seconds'] * 1000:8.1f} ms  {result['links']:6d} links  "
+                  f"{result['bytes']:9d} B  {result['output']}")
+        else:
+            print(f"FAIL  {result['seconds'] * 1000:8.1f} ms  {result['config']}: {result['error']}")
+    failed = sum(1 for result in results if not result['ok'])
+    print(f"\nBuilt {len(results) - failed}/{len(results)} sites in {wall_seconds:.2f}s"
+          f" ({failed} failed)")
+    # Cron can schedule the next run for the first publish/expire time across all sites
+    upcoming = [result for result in results if result['next_transition'] is not None]
+    if upcoming:
+        first = min(upcoming, key=lambda result: result['next_transition'])
+        print(f"Next scheduled change: {datetime.fromtimestamp(first['next_transition']).isoformat()}"
+              f" ({first['config']})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build many Linktr.ee pages in parallel")
+    parser.add_argument('sources', nargs='+', help="config directories or glob patterns")
+    parser.add_argument('--pattern', default=DEFAULT_PATTERN,
+                        help=f"config file pattern inside directories (default: {DEFAULT_PATTERN})")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="number of worker processes (default: CPU count)")
+    parser.add_argument('--incremental', action='store_true',
+                        help="reuse build caches and skip unchanged outputs")
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    config_paths = find_configs(args.sources, args.pattern)
+    if not config_paths:
+        print("No config files found.")
+        return 1
+
+    with instrumentation.from_args(args) as metrics:
+        start = time.perf_counter()
+        results = build_sites(config_paths, workers=args.workers, incremental=args.incremental,
+                              collect_metrics=metrics.enabled)
+        print_report(results, time.perf_counter() - start)
+        for result in results:
+            if result['metrics']:
+                metrics.merge(result['metrics'])
+    return 0 if all(result['ok'] for result in results) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Measure per-link memory: plain link dicts versus slotted Link records
+
+Builds the same synthetic links both ways and reports the memory each set
+holds, measured with tracemalloc (titles and URLs are shared between both
+so only the per-link containers are compared).
+
+Usage:
+    python bench_memory.py --count 100000
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+from manage_links import LinkCollection
+
+STYLES = ("default", "primary", "secondary", "tertiary", "highlight")
+
+
+def synthetic_links(count):
+    # Values come from JSON, so styles are fresh (non-interned) strings per link
+    return [
+        {"title": f"Link {i}", "url": f"https://example.com/{i}", "icon": None,
+         "style": ''.join(STYLES[i % 5]), "badge": None, "enabled": i % 10 != 0, "id": f"link-{i}"}
+        for i in range(count)
+    ]
+
+
+def measure(build) -> int:
+    """Return the bytes still allocated by ``build()``'s result"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        gc.collect()
+        used = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del result
+    return used
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare memory used by link dicts and Link records")
+    parser.add_argument('--count', type=int, default=100_000, help="number of links (default: 100000)")
+    args = parser.parse_args(argv)
+
+    source = synthetic_links(args.count)
+    # Copy dicts the way the dict-based LinkCollection did, styles decoded fresh per link
+    as_dicts = measure(lambda: [dict(link, style=''.join(link['style'])) for link in source])
+    as_links = measure(lambda: LinkCollection({**link, 'style': ''.join(link['style'])}
+                                              for link in source))
+
+    print(f"{args.count:,d} links")
+    print(f"  dicts: {as_dicts:>12,d} B  ({as_dicts / args.count:6.1f} B/link)")
+    print(f"  Link:  {as_links:>12,d} B  ({as_links / args.count:6.1f} B/link)")
+    print(f"  saved: {1 - as_links / as_dicts:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
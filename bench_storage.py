@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark the JSON and SQLite storage backends
+
+For each size a synthetic site is written in both formats, then the same
+workload is timed against each backend:
+
+- load: construct a LinkTreeManager from storage
+- update: change one link and save
+- render: render the enabled links (streamed from the database for SQLite)
+
+Usage:
+    python bench_storage.py --sizes 1000 100000 1000000
+"""
+
+import argparse
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+
+from manage_links import CONFIG, LinkTreeManager
+from sqlite_storage import SQLiteStorage, import_json
+
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000)
+
+
+def synthetic_config(count) -> dict:
+    """A config with ``count`` links, every tenth one disabled"""
+    return {
+        'revision': 1,
+        'config': CONFIG,
+        'links': [
+            {"title": f"Link {i}", "url": f"https://example.com/{i}", "icon": None,
+             "style": "default", "badge": None, "enabled": i % 10 != 0, "id": f"link-{i}"}
+            for i in range(count)
+        ],
+    }
+
+
+def _timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def bench_json(json_path, count) -> dict:
+    results = {}
+    manager = None
+
+    def load():
+        nonlocal manager
+        manager = LinkTreeManager(json_path, strict=True, verbose=False)
+
+    def update():
+        manager.update_link(f"link-{count // 2}", badge="Nuevo")
+        manager.save_config()
+
+    results['load'] = _timed(load)
+    results['update'] = _timed(update)
+    results['render'] = _timed(lambda: manager.render_html(io.StringIO()))
+    return results
+
+
+def bench_sqlite(db_path, count) -> dict:
+    results = {}
+    storage = SQLiteStorage(db_path)
+    manager = None
+
+    def load():
+        nonlocal manager
+        manager = LinkTreeManager(storage=storage, verbose=False)
+
+    def update():
+        manager.update_link(f"link-{count // 2}", badge="Nuevo")
+        manager.save_config()
+
+    try:
+        results['load'] = _timed(load)
+        results['update'] = _timed(update)
+        results['render'] = _timed(
+            lambda: manager.render_html(io.StringIO(), links=storage.iter_enabled_links()))
+    finally:
+        storage.close()
+    return results
+
+
+def run(sizes, workdir):
+    rows = []
+    for count in sizes:
+        json_path = os.path.join(workdir, f"links-{count}.json")
+        db_path = os.path.join(workdir, f"links-{count}.db")
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(synthetic_config(count), f, ensure_ascii=False)
+        import_json(json_path, db_path)
+
+        for backend, bench, path in (('json', bench_json, json_path),
+                                     ('sqlite', bench_sqlite, db_path)):
+            timings = bench(path, count)
+            rows.append((count, backend, timings, os.path.getsize(path)))
+            print(f"{count:>9,d}  {backend:<6}  load {timings['load'] * 1000:9.1f} ms  "
+                  f"update {timings['update'] * 1000:9.1f} ms  "
+                  f"render {timings['render'] * 1000:9.1f} ms  {os.path.getsize(path):>12,d} B")
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the JSON and SQLite storage backends")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES),
+                        help="link counts to benchmark (default: 1000 100000 1000000)")
+    parser.add_argument('--keep', metavar='DIR',
+                        help="write the generated files to DIR instead of a temporary directory")
+    args = parser.parse_args(argv)
+
+    workdir = args.keep or tempfile.mkdtemp(prefix="linktree-bench-")
+    os.makedirs(workdir, exist_ok=True)
+    try:
+        run(args.sizes, workdir)
+    finally:
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark streamed versus whole-file config loading for a full build
+
+For each size a synthetic config is written, then the page is built both
+ways:
+
+- full: ``LinkTreeManager`` loads (``json.load``), validates and holds every
+  link, then streams the page to the output file
+- streamed: ``config_stream.build`` reads the links array element by
+  element and renders each batch as it is validated
+
+Wall time is the best of ``--repeat`` untraced runs; peak memory is the
+tracemalloc peak of one more, traced run.
+
+Usage:
+    python bench_stream.py --sizes 10000 100000 1000000
+"""
+
+import argparse
+import gc
+import json
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+import config_stream
+from bench_storage import synthetic_config
+from manage_links import LinkTreeManager
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+
+
+def build_full(config_file, now):
+    manager = LinkTreeManager(config_file, strict=True, verbose=False)
+    manager.generate_html(stream=True, now=now)
+
+
+def build_streamed(config_file, now):
+    config_stream.build(config_file, now=now, verbose=False)
+
+
+def measure(build, config_file, now, repeat):
+    """Return (best seconds, peak traced bytes) of a build"""
+    elapsed = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        build(config_file, now)
+        elapsed = min(elapsed, time.perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        build(config_file, now)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return elapsed, peak
+
+
+def run(sizes, workdir, repeat=3):
+    now = time.time()
+    rows = []
+    for count in sizes:
+        config_file = os.path.join(workdir, f"links-{count}.json")
+        data = synthetic_config(count)
+        data['config'] = dict(data['config'], output_file=os.path.join(workdir, f"index-{count}.html"))
+        with open(config_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        del data
+
+        results = {}
+        for name, build in (('full', build_full), ('streamed', build_streamed)):
+            results[name] = measure(build, config_file, now, repeat)
+            elapsed, peak = results[name]
+            print(f"{count:>9,d}  {name:<8}  {elapsed * 1000:9.1f} ms  peak {peak / 2**20:9.1f} MiB")
+        (full_time, full_peak), (stream_time, stream_peak) = results['full'], results['streamed']
+        print(f"{'':>9}  speedup {full_time / stream_time:.2f}x, "
+              f"peak memory {stream_peak / full_peak:.1%} of full")
+        rows.append((count, results))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare streamed and whole-file config loading")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES),
+                        help="link counts to benchmark (default: 10000 100000 1000000)")
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per build (default: 3)")
+    parser.add_argument('--keep', metavar='DIR',
+                        help="write the generated files to DIR instead of a temporary directory")
+    args = parser.parse_args(argv)
+
+    workdir = args.keep or tempfile.mkdtemp(prefix="linktree-bench-")
+    os.makedirs(workdir, exist_ok=True)
+    try:
+        run(args.sizes, workdir, args.repeat)
+    finally:
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Pythonistas GDL Linktr.ee benchmark suite
+
+Synthesizes configs from 10 up to 1M links and times the manager's hot
+paths on each: load_config, save_config, add_link, update_link,
+reorder_links, move_link, auto_detect_social_media, generate_html, building
+the search index and search queries. For every operation it reports ops/sec (best of
+``--repeat`` runs), the peak memory of a single run (tracemalloc) and, for
+generate_html and the search index, the output size.
+
+Results are written as JSON. ``--compare baseline.json`` flags every
+operation whose throughput dropped, or whose peak memory grew, by more than
+``--threshold`` relative to a stored baseline, and exits with status 1.
+
+Usage:
+    python benchmark.py --sizes 10 1000 100000 1000000 --output results.json
+    python benchmark.py --compare baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from manage_links import CONFIG, LinkTreeManager, platform_for_host
+from search_index import SearchIndex
+
+DEFAULT_SIZES = (10, 1_000, 100_000, 1_000_000)
+DEFAULT_OUTPUT = "benchmark_results.json"
+DEFAULT_THRESHOLD = 0.10
+
+# Mutating operations run this many calls per timing so small sites are measurable
+BATCH_OPS = 1_000
+
+# URLs cycled through the synthetic links so platform detection sees a realistic mix
+SAMPLE_URLS = (
+    "https://www.facebook.com/PythonistasGdl/",
+    "https://www.instagram.com/pythonistas_gdl/",
+    "https://x.com/pythonistas_gdl/",
+    "https://m.youtube.com/@pythonistasgdl",
+    "https://discord.gg/pythonistas",
+    "https://github.com/pythonistas-gdl",
+    "https://pythonistas-gdl.org/eventos/{i}",
+    "https://example.com/charla/{i}",
+)
+STYLES = ("default", "primary", "secondary", "tertiary", "highlight")
+
+# Queries timed against the search index: common prefixes, multi-word and misses
+SEARCH_QUERIES = ("link", "link 12", "nuevo", "link-99", "li 5", "zzz", "l")
+
+
+def synthetic_config(count, output_file="index.html") -> Dict:
+    """A config with ``count`` links of mixed styles and platforms, every tenth disabled"""
+    return {
+        'revision': 1,
+        'config': dict(CONFIG, output_file=output_file),
+        'links': [
+            {"title": f"Link {i}", "url": SAMPLE_URLS[i % len(SAMPLE_URLS)].format(i=i),
+             "icon": "🔗", "style": STYLES[i % len(STYLES)],
+             "badge": "Nuevo" if i % 7 == 0 else None, "enabled": i % 10 != 0,
+             "id": f"link-{i}"}
+            for i in range(count)
+        ],
+    }
+
+
+def best_time(func: Callable, repeat, setup: Optional[Callable] = None,
+              teardown: Optional[Callable] = None) -> float:
+    """Return the fastest of ``repeat`` timed calls; setup/teardown are not timed"""
+    best = float('inf')
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+        if teardown:
+            teardown()
+    return best
+
+
+def peak_memory(func: Callable, setup: Optional[Callable] = None,
+                teardown: Optional[Callable] = None) -> int:
+    """Return the peak bytes allocated while running ``func`` once"""
+    if setup:
+        setup()
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    if teardown:
+        teardown()
+    return peak
+
+
+def _cases(manager, count) -> List[Dict]:
+    """The operations to benchmark against a loaded manager"""
+    ids = manager.links.ids()
+    batch = min(count, BATCH_OPS)
+    sample_ids = ids[::max(1, count // batch)][:batch]
+    urls = [link['url'] for link in manager.links][:max(batch, 10_000)]
+    added = []
+
+    def add_links():
+        for i in range(batch):
+            added.append(manager.add_link(f"Bench {i}", f"https://example.com/bench/{i}",
+                                          id=f"bench-{i}"))
+
+    def remove_added():
+        for id in added:
+            manager.links.remove(id)
+        added.clear()
+
+    def update_links():
+        for id in sample_ids:
+            manager.update_link(id, badge="Hoy")
+
+    def move_links():
+        for id, target in zip(sample_ids, reversed(sample_ids)):
+            if id != target:
+                manager.move_link(id, before=target)
+
+    def detect():
+        platform_for_host.cache_clear()
+        for url in urls:
+            manager.auto_detect_social_media(url)
+
+    queries = [SEARCH_QUERIES[i % len(SEARCH_QUERIES)] for i in range(batch)]
+
+    def search():
+        for query in queries:
+            manager.search(query)
+
+    return [
+        {'op': 'load_config', 'func': manager.load_config, 'ops': 1},
+        {'op': 'save_config', 'func': lambda: manager.save_config(force=True), 'ops': 1},
+        {'op': 'add_link', 'func': add_links, 'ops': batch, 'teardown': remove_added},
+        {'op': 'update_link', 'func': update_links, 'ops': len(sample_ids)},
+        {'op': 'reorder_links', 'func': lambda: manager.reorder_links(ids[::-1]), 'ops': 1,
+         'teardown': lambda: manager.reorder_links(ids)},
+        {'op': 'move_link', 'func': move_links, 'ops': len(sample_ids),
+         'teardown': lambda: manager.reorder_links(ids)},
+        {'op': 'auto_detect_social_media', 'func': detect, 'ops': len(urls)},
+        {'op': 'generate_html', 'func': lambda: manager.generate_html(stream=True), 'ops': 1,
+         'output': lambda: os.path.getsize(manager.config['output_file'])},
+        {'op': 'build_search_index', 'func': lambda: SearchIndex.build(manager.links), 'ops': 1,
+         'output': lambda: len(SearchIndex.build(manager.links).to_json().encode('utf-8'))},
+        {'op': 'search', 'func': search, 'ops': len(queries)},
+    ]
+
+
+def bench_size(count, workdir, repeat=3, memory=True) -> List[Dict]:
+    """Benchmark every operation on a synthetic site with ``count`` links"""
+    config_path = os.path.join(workdir, f"links-{count}.json")
+    output_file = os.path.join(workdir, f"links-{count}.html")
+    with open(config_path, 'w', encoding='utf-8') as f:
+        json.dump(synthetic_config(count, output_file), f, ensure_ascii=False)
+
+    manager = LinkTreeManager(config_path, strict=True, verbose=False)
+
+    results = []
+    for case in _cases(manager, count):
+        teardown = case.get('teardown')
+        seconds = best_time(case['func'], repeat, teardown=teardown)
+        result = {
+            'size': count,
+            'op': case['op'],
+            'ops': case['ops'],
+            'seconds': seconds,
+            'ops_per_sec': case['ops'] / seconds if seconds else float('inf'),
+            'peak_bytes': peak_memory(case['func'], teardown=teardown) if memory else None,
+            'output_bytes': case['output']() if 'output' in case else None,
+        }
+        results.append(result)
+        print(format_result(result))
+    return results
+
+
+def format_result(result) -> str:
+    line = (f"{result['size']:>9,d}  {result['op']:<25} {result['ops_per_sec']:>14,.1f} ops/s"
+            f"  {result['seconds'] * 1000:10.2f} ms")
+    if result['peak_bytes'] is not None:
+        line += f"  peak {result['peak_bytes'] / 1024:>10,.1f} KiB"
+    if result['output_bytes'] is not None:
+        line += f"  output {result['output_bytes']:>12,d} B"
+    return line
+
+
+def run(sizes, repeat=3, memory=True, workdir=None) -> Dict:
+    """Run the suite and return the results document"""
+    tmpdir = workdir or tempfile.mkdtemp(prefix="linktree-bench-")
+    os.makedirs(tmpdir, exist_ok=True)
+    try:
+        results = []
+        for count in sizes:
+            results.extend(bench_size(count, tmpdir, repeat, memory))
+    finally:
+        if not workdir:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+    return {
+        'meta': {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD) -> List[str]:
+    """Return a message for every result that regressed against the baseline"""
+    previous = {(result['size'], result['op']): result for result in baseline['results']}
+    regressions = []
+    for result in current['results']:
+        old = previous.get((result['size'], result['op']))
+        if old is None:
+            continue
+        label = f"{result['op']} @ {result['size']:,d} links"
+        if result['ops_per_sec'] < old['ops_per_sec'] * (1 - threshold):
+            regressions.append(f"{label}: {result['ops_per_sec']:,.1f} ops/s, was "
+                               f"{old['ops_per_sec']:,.1f} ({result['ops_per_sec'] / old['ops_per_sec'] - 1:+.0%})")
+        if result['peak_bytes'] and old.get('peak_bytes') and \
+                result['peak_bytes'] > old['peak_bytes'] * (1 + threshold):
+            regressions.append(f"{label}: peak {result['peak_bytes']:,d} B, was "
+                               f"{old['peak_bytes']:,d} ({result['peak_bytes'] / old['peak_bytes'] - 1:+.0%})")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Linktr.ee manager and renderer")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES),
+                        help="link counts to synthesize (default: 10 1000 100000 1000000)")
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per operation (best is kept)")
+    parser.add_argument('--no-memory', action='store_true', help="skip the tracemalloc peak memory pass")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help=f"results file (default: {DEFAULT_OUTPUT})")
+    parser.add_argument('--compare', metavar='BASELINE', help="flag regressions against a baseline results file")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="relative change that counts as a regression (default: 0.10)")
+    args = parser.parse_args(argv)
+
+    current = run(args.sizes, repeat=args.repeat, memory=not args.no_memory)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(current, f, indent=2)
+    print(f"\nResults saved to {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against {args.compare}:")
+            for message in regressions:
+                print(f"  REGRESSION  {message}")
+            return 1
+        print(f"No regressions against {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,138 @@
+"""
+Append-only operation journal for linktree_config.json
+
+In journaled storage mode every mutation is appended as one compact JSON
+line to ``<config>.journal`` instead of rewriting the whole config. Each
+record carries the revision it produces (``rev``), so replay is idempotent:
+records at or below the snapshot's revision are skipped.
+
+When the journal grows past a threshold it is renamed to
+``<config>.journal.compacting`` and folded into a fresh snapshot in the
+background while new records go to a fresh journal.
+
+A ``move`` carries the moved link's new order key, so replaying it touches
+only that link.
+
+Record shapes::
+
+    {"rev": 7, "op": "add", "link": {...}}
+    {"rev": 8, "op": "update", "id": "evento", "fields": {"badge": "Hoy"}}
+    {"rev": 9, "op": "delete", "id": "tiktok"}
+    {"rev": 10, "op": "reorder", "ids": [...]}
+    {"rev": 11, "op": "move", "id": "discord", "order": "Zz"}
+    {"rev": 12, "op": "theme", "fields": {"bg_color": "#FFFFFF"}}
+    {"rev": 13, "op": "config", "fields": {"logo_text": "PyGDL"}}
+"""
+
+import json
+import os
+import re
+from typing import Dict, Iterator, List, Optional
+
+# Journals larger than this are compacted into a new snapshot
+JOURNAL_COMPACT_BYTES = 1 << 20
+
+_SNAPSHOT_REVISION_RE = re.compile(rb'"revision"\s*:\s*(\d+)')
+
+
+def journal_path(config_file) -> str:
+    return f"{config_file}.journal"
+
+
+def compacting_path(config_file) -> str:
+    return f"{config_file}.journal.compacting"
+
+
+def append_records(path, records: List[Dict]) -> int:
+    """Append records as JSON lines, fsync, and return the journal size afterwards"""
+    data = ''.join(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n'
+                   for record in records).encode('utf-8')
+    fd = os.open(path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        if os.fstat(fd).st_size:
+            os.lseek(fd, -1, os.SEEK_END)
+            if os.read(fd, 1) != b'\n':
+                # Terminate a line torn by an earlier crash so it is skipped on replay
+                data = b'\n' + data
+        os.write(fd, data)
+        os.fsync(fd)
+        return os.fstat(fd).st_size
+    finally:
+        os.close(fd)
+
+
+def iter_records(path, after_revision=0) -> Iterator[Dict]:
+    """Yield records newer than ``after_revision``; lines torn by a crash are skipped"""
+    try:
+        f = open(path, 'rb')
+    except FileNotFoundError:
+        return
+    with f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record['rev'] > after_revision:
+                yield record
+
+
+def last_revision(path) -> Optional[int]:
+    """Return the revision of the last complete record, or None if there is none"""
+    try:
+        with open(path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            block = min(size, 64 * 1024)
+            f.seek(size - block)
+            tail = f.read()
+    except FileNotFoundError:
+        return None
+    for line in reversed(tail.splitlines()):
+        try:
+            return json.loads(line)['rev']
+        except (ValueError, KeyError):
+            continue
+    return None
+
+
+def snapshot_revision(config_file) -> int:
+    """Read the revision stamp from the start of a snapshot without parsing all of it"""
+    try:
+        with open(config_file, 'rb') as f:
+            head = f.read(256)
+    except FileNotFoundError:
+        return 0
+    match = _SNAPSHOT_REVISION_RE.search(head)
+    return int(match.group(1)) if match else 0
+
+
+def head_revision(config_file) -> int:
+    """Latest revision on disk across the journal, a pending compaction and the snapshot"""
+    revisions = [last_revision(journal_path(config_file)),
+                 last_revision(compacting_path(config_file)),
+                 snapshot_revision(config_file)]
+    return max(revision for revision in revisions if revision is not None)
+
+
+def apply_record(config, links, record):
+    """Apply one journal record to a config dict and a LinkCollection"""
+    op = record['op']
+    if op == 'add':
+        links.append(dict(record['link']))
+    elif op == 'update':
+        link = links.get(record['id'])
+        if link is not None:
+            link.update(record['fields'])
+    elif op == 'delete':
+        links.remove(record['id'])
+    elif op == 'reorder':
+        links.reorder(record['ids'])
+    elif op == 'move':
+        links.move_to_key(record['id'], record['order'])
+    elif op == 'theme':
+        config['theme'].update(record['fields'])
+    elif op == 'config':
+        config.update(record['fields'])
+    else:
+        raise ValueError(f"unknown journal record {op!r} at revision {record['rev']}")
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Streaming reader for very large linktree_config.json files
+
+``json.load`` materializes the whole document, so loading a config with a
+million links holds every link dict (and then every Link) in memory before
+the first byte of HTML is written. ``StreamedConfigStorage`` is a read-only
+storage backend that instead loads only the revision and the settings, and
+streams the ``links`` array one element at a time. Each element is decoded
+with ``json.JSONDecoder.raw_decode`` from a sliding text buffer, so only the
+current chunk of the file and one batch of links are in memory at a time.
+
+Links are validated batch by batch as they stream past (same checks and
+JSON paths as ``config_validation.validate_config``); once a batch fails no
+further links are produced, and ``ConfigValidationError`` listing every
+problem in the file is raised when the stream ends.
+
+``build`` wires it to the renderer: load -> validate -> render never holds
+the full link list, and the page replaces the output file only once the
+whole config has been read and validated. Configs with unapplied journal
+records must be loaded normally (or compacted) first.
+
+Usage:
+    python config_stream.py [config_file]
+
+    storage = StreamedConfigStorage("linktree_config.json")
+    manager = LinkTreeManager(storage=storage, strict=True)
+    with open("index.html", "w", encoding="utf-8") as f:
+        manager.render_html(f, links=storage.iter_links())
+"""
+
+import argparse
+import json
+import os
+import re
+import time
+from typing import Dict, Iterator, List
+
+import config_journal
+import instrumentation
+from config_validation import ConfigValidationError, LinkValidator, validate_config
+from manage_links import CONFIG, LINK_STYLES, Link, LinkCollection, LinkTreeManager
+
+# Characters read from the file at a time, and links validated per batch
+CHUNK_SIZE = 1 << 16
+BATCH_SIZE = 1000
+
+_WHITESPACE_RE = re.compile(r'[ \t\n\r]*')
+_SEPARATOR_RE = re.compile(r'[ \t\n\r]*,[ \t\n\r]*')
+
+
+class _JSONStream:
+    """Pull-style reader over a JSON text file: structure tokens and whole values"""
+
+    def __init__(self, f, source, chunk_size=CHUNK_SIZE):
+        self.f = f
+        self.source = source
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        # File offset (in characters) of buffer[0], for error messages
+        self.offset = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        """Drop the consumed text and read more; returns False at the end of the file"""
+        # Read at least as much as is buffered, so values larger than a chunk load in O(n)
+        data = self.f.read(max(self.chunk_size, len(self.buffer) - self.pos))
+        if not data:
+            self.eof = True
+            return False
+        self.offset += self.pos
+        self.buffer = self.buffer[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def error(self, message):
+        return ValueError(f"{self.source}: {message} at character {self.offset + self.pos}")
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character ('' at the end of the file)"""
+        while True:
+            self.pos = _WHITESPACE_RE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise self.error(f"expected {char!r}")
+        self.pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as e:
+                # Most likely cut off by the end of the buffer: read more and retry
+                if self.eof or not self._fill():
+                    raise ValueError(f"{self.source}: {e.msg} at character "
+                                     f"{self.offset + e.pos}") from None
+                continue
+            # A number at the very end of the buffer may continue in the next chunk
+            if end == len(self.buffer) and not self.eof and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def members(self) -> Iterator[str]:
+        """Yield the keys of an object; the caller consumes each member's value"""
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            if not isinstance(key, str):
+                raise self.error("expected an object key")
+            self.expect(':')
+            yield key
+            char = self.peek()
+            self.pos += 1
+            if char == '}':
+                return
+            if char != ',':
+                self.pos -= 1
+                raise self.error("expected ',' or '}'")
+
+    def elements(self) -> Iterator:
+        """Yield the values of an array one by one"""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        scan_once = self.decoder.scan_once
+        separator = _SEPARATOR_RE.match
+        while True:
+            # Fast path: the element and the separator after it are both in the buffer
+            buffer = self.buffer
+            try:
+                value, end = scan_once(buffer, self.pos)
+                match = separator(buffer, end)
+            except (StopIteration, json.JSONDecodeError):
+                match = None
+            if match is not None and match.end() < len(buffer):
+                self.pos = match.end()
+                yield value
+                continue
+            yield self.value()
+            char = self.peek()
+            self.pos += 1
+            if char == ']':
+                return
+            if char != ',':
+                self.pos -= 1
+                raise self.error("expected ',' or ']'")
+            self.peek()
+
+
+class StreamedConfigStorage:
+    """Read-only storage backend streaming the links of a JSON config file"""
+
+    def __init__(self, path="linktree_config.json", batch_size=BATCH_SIZE, chunk_size=CHUNK_SIZE):
+        self.path = path
+        self.batch_size = batch_size
+        self.chunk_size = chunk_size
+
+    def __str__(self):
+        return self.path
+
+    def _open(self):
+        return open(self.path, 'r', encoding='utf-8')
+
+    def read_header(self) -> Dict:
+        """Return the top-level members except ``links`` (skipped element by element)"""
+        header = {}
+        with self._open() as f:
+            stream = _JSONStream(f, self.path, self.chunk_size)
+            if stream.peek() != '{':
+                raise ConfigValidationError(self.path, [("$", "must be an object")])
+            for key in stream.members():
+                if key == 'links' and stream.peek() == '[':
+                    for _ in stream.elements():
+                        pass
+                else:
+                    header[key] = stream.value()
+                if 'config' in header and 'revision' in header:
+                    break
+        return header
+
+    def load(self, manager) -> bool:
+        """Load the revision and settings into ``manager``; links are left to ``iter_links``"""
+        header = self.read_header()
+        problems = validate_config(header, LINK_STYLES, CONFIG)
+        if problems:
+            raise ConfigValidationError(self.path, problems)
+        revision = header.get('revision', 0)
+        if config_journal.head_revision(self.path) > revision:
+            raise ValueError(f"{self.path} has journal records newer than revision {revision}; "
+                             f"load it without streaming to apply them")
+        manager.config.update(header.get('config', {}))
+        manager.links = LinkCollection()
+        manager.revision = revision
+        manager._pending.clear()
+        return True
+
+    def iter_links(self) -> Iterator[Link]:
+        """Stream every link in display (file) order, validating them batch by batch
+
+        Raises ConfigValidationError with every problem in the links array
+        once the stream ends; no link is produced after the first bad batch.
+        """
+        validator = LinkValidator(LINK_STYLES)
+        with self._open() as f:
+            stream = _JSONStream(f, self.path, self.chunk_size)
+            for key in stream.members():
+                if key != 'links':
+                    stream.value()
+                    continue
+                if stream.peek() != '[':
+                    raise ConfigValidationError(self.path, [("$.links", "must be an array")])
+                batch: List = []
+                for data in stream.elements():
+                    batch.append(data)
+                    if len(batch) >= self.batch_size:
+                        yield from self._checked(batch, validator)
+                        batch = []
+                yield from self._checked(batch, validator)
+            # Read to the end, so a file cut off after the links is not taken as complete
+            if stream.peek():
+                raise stream.error("unexpected data after the config")
+        if validator.problems:
+            raise ConfigValidationError(self.path, validator.problems)
+
+    @staticmethod
+    def _checked(batch, validator) -> Iterator[Link]:
+        validator.check(batch)
+        if not validator.problems:
+            yield from map(Link.from_dict, batch)
+
+    def iter_enabled_links(self) -> Iterator[Link]:
+        """Stream enabled links in display order, for rendering"""
+        return (link for link in self.iter_links() if link['enabled'])
+
+    def save(self, manager, force=False):
+        raise ValueError(f"{self.path} is opened read-only for streaming; "
+                         f"load it without a storage backend to edit it")
+
+
+def build(config_file="linktree_config.json", now=None, verbose=True, metrics=None) -> str:
+    """Render the page straight from a streamed config; returns the output file
+
+    The page is written to a temporary file next to the output and moved
+    into place only when every link has been read and validated, so a bad
+    config leaves the previous page untouched.
+    """
+    storage = StreamedConfigStorage(config_file)
+    manager = LinkTreeManager(config_file, strict=True, verbose=verbose, storage=storage,
+                              metrics=metrics)
+    now = time.time() if now is None else now
+    output_file = manager.config['output_file']
+    tmp_path = f"{output_file}.tmp"
+    with manager.metrics.span("generate_html"):
+        # The search index needs its own pass: its file name goes into the page
+        manager._publish_search_index(now, links=storage.iter_links())
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                manager.render_html(f, links=storage.iter_links(), now=now)
+            os.replace(tmp_path, output_file)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        manager.metrics.count("bytes_written", os.path.getsize(output_file))
+    manager._log(f"HTML generated and saved to {output_file}")
+    return output_file
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the page from a streamed config file")
+    parser.add_argument('config_file', nargs='?', default="linktree_config.json")
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    with instrumentation.from_args(args) as metrics:
+        try:
+            build(args.config_file, metrics=metrics)
+        except (OSError, ValueError) as e:
+            print(e)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Load-time validation of linktree_config.json
+
+``validate_config`` checks the parsed JSON once, before any link is built:
+required link keys and their types, URL shape, the style enum, duplicate
+IDs, schedule dates, the theme's hex colors and the types of the basic
+settings. Every problem is reported with its JSON path (``$.links[12].url``)
+instead of the first one surfacing as a ``KeyError`` halfway through
+rendering.
+
+The links are first checked field by field across the whole array, each
+field read from every link with ``itemgetter`` and tested at once with set
+operations. That only says whether everything is valid (about a second for
+a million links); when it is not, the links are checked again one by one
+to report each problem with its path.
+
+Usage:
+    python config_validation.py [config_file ...]
+"""
+
+import argparse
+import json
+import re
+from itertools import repeat
+from operator import itemgetter
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from link_schedule import SCHEDULE_FIELDS, parse_time
+
+HEX_COLOR_RE = re.compile(r'^#(?:[0-9a-fA-F]{3}){1,2}$')
+
+# Absolute web URLs with a host, plus mailto: and tel: links
+URL_RE = re.compile(r'https?://[^\s/?#]+(?:[/?#]\S*)?|mailto:[^\s@]+@\S+|tel:\+?[0-9 ().-]+',
+                    re.IGNORECASE)
+_WEB_PREFIXES = ("https://", "http://")
+_EMPTY_HOST_RE = re.compile(r'://(?:[/?# ]|$)')
+
+# Problems listed in an error message before the rest are summarized
+MAX_REPORTED = 20
+
+
+_NONE = type(None)
+_STR = frozenset({str})
+_OPTIONAL_STR = frozenset({str, _NONE})
+_BOOL = frozenset({bool})
+
+# Fields every saved link has, in the order their problems are reported,
+# and the types each may hold
+_LINK_FIELDS = ('title', 'url', 'id', 'style', 'enabled', 'icon', 'badge', 'order')
+_FIELD_TYPES = {'title': _STR, 'url': _STR, 'id': _STR, 'style': _STR, 'enabled': _BOOL,
+                'icon': _OPTIONAL_STR, 'badge': _OPTIONAL_STR, 'order': _OPTIONAL_STR}
+# Fields a link may leave out
+_OPTIONAL_FIELDS = frozenset({'style', 'enabled', 'icon', 'badge', 'order'})
+# Fields whose type is all the whole-array check needs to know, ``order`` last
+_TYPED_FIELDS = ('title', 'enabled', 'icon', 'badge', 'order')
+
+_JSON_TYPES = {str: "a string", bool: "true or false", int: "a number", float: "a number",
+               list: "an array", dict: "an object", _NONE: "null"}
+
+Problem = Tuple[str, str]
+
+
+class ConfigValidationError(ValueError):
+    """The config has one or more invalid values; ``errors`` lists every ``(path, message)``"""
+
+    def __init__(self, source, errors: List[Problem]):
+        self.source = source
+        self.errors = errors
+        lines = [f"  {path}: {message}" for path, message in errors[:MAX_REPORTED]]
+        if len(errors) > MAX_REPORTED:
+            lines.append(f"  ... and {len(errors) - MAX_REPORTED} more")
+        noun = "problem" if len(errors) == 1 else "problems"
+        super().__init__(f"{len(errors)} {noun} in {source}:\n" + "\n".join(lines))
+
+
+def _json_type(value) -> str:
+    return _JSON_TYPES.get(type(value), type(value).__name__)
+
+
+def _expected(types) -> str:
+    names = sorted({_JSON_TYPES[t] for t in types if t is not _NONE})
+    return " or ".join(names) + (" or null" if _NONE in types else "")
+
+
+def _add_unique(seen: Set[str], ids: Sequence[str]) -> bool:
+    """Add ``ids`` to ``seen`` unless one is empty, repeated or already seen
+
+    Returns False, leaving ``seen`` untouched, if any is.
+    """
+    if not seen:
+        # Adding them is the duplicate check, and cheap to undo while ``seen`` was empty
+        seen.update(ids)
+        if len(seen) == len(ids) and '' not in seen:
+            return True
+        seen.clear()
+        return False
+    new = set(ids)
+    if len(new) != len(ids) or '' in new or not seen.isdisjoint(new):
+        return False
+    seen |= new
+    return True
+
+
+def _link_path(offset=0, positions=None) -> Callable[[int, str], str]:
+    """JSON path of a link field; ``positions`` maps checked links back to the file"""
+    if positions is None:
+        return lambda i, key: f"$.links[{offset + i}].{key}"
+    return lambda i, key: f"$.links[{offset + positions[i]}].{key}"
+
+
+def _urls_look_valid(urls: Sequence) -> bool:
+    """Conservative whole-column check: True only if every URL is a plain http(s) URL
+
+    Much cheaper than matching ``URL_RE`` URL by URL; when it says no, the
+    caller does that to find the actual offenders (and any non-strings).
+    """
+    try:
+        if not all(map(str.startswith, urls, repeat(_WEB_PREFIXES))):
+            return False
+    except TypeError:
+        return False
+    joined = ' '.join(urls)
+    # isprintable() is False for every whitespace character except the separator
+    return (joined.isprintable() and joined.count(' ') == len(urls) - 1
+            and _EMPTY_HOST_RE.search(joined) is None)
+
+
+def _links_look_valid(links: Sequence[Dict], styles, seen_ids: Set[str]) -> bool:
+    """Whole-array check: True only if every link has every saved field, all valid
+
+    Each field is read from every link with ``itemgetter`` and tested at
+    once, so a missing key ends the check early. ``order`` may be missing
+    from every link (files saved before links had order keys) but not from
+    just some. IDs are added to ``seen_ids`` only when everything passed.
+    """
+    fields = _TYPED_FIELDS
+    if 'order' not in links[0]:
+        if any(map(dict.__contains__, links, repeat('order'))):
+            return False
+        fields = fields[:-1]
+    try:
+        for key in fields:
+            if not set(map(type, map(itemgetter(key), links))) <= _FIELD_TYPES[key]:
+                return False
+        if not styles.issuperset(map(itemgetter('style'), links)):
+            return False
+        urls = list(map(itemgetter('url'), links))
+        ids = list(map(itemgetter('id'), links))
+    except (KeyError, TypeError):  # a missing field, or unhashable styles
+        return False
+    # The URL check rejects non-strings itself
+    return _urls_look_valid(urls) and set(map(type, ids)) <= _STR and _add_unique(seen_ids, ids)
+
+
+def _check_schedule(i, link: Dict, path, problems: List[Problem]):
+    for key in SCHEDULE_FIELDS:
+        value = link.get(key)
+        if value is None:
+            continue
+        if not isinstance(value, str):
+            problems.append((path(i, key), f"must be a string or null, got {_json_type(value)}"))
+            continue
+        try:
+            parse_time(value)
+        except ValueError:
+            problems.append((path(i, key), f"must be an ISO 8601 date/time, got {value!r}"))
+
+
+def _report_links(links: Sequence[Dict], styles, path, problems: List[Problem], seen_ids: Set[str]):
+    """Check the links one by one and report every problem"""
+    first: Dict[str, int] = {}
+    for i, link in enumerate(links):
+        for key in _LINK_FIELDS:
+            if key not in link:
+                if key not in _OPTIONAL_FIELDS:
+                    problems.append((path(i, key), "is required"))
+                continue
+            value = link[key]
+            types = _FIELD_TYPES[key]
+            if type(value) not in types:
+                problems.append((path(i, key), f"must be {_expected(types)}, got {_json_type(value)}"))
+            elif key == 'url' and not URL_RE.fullmatch(value):
+                problems.append((path(i, key), f"is not an http(s), mailto: or tel: URL: {value!r}"))
+            elif key == 'style' and value not in styles:
+                problems.append((path(i, key), f"must be one of {', '.join(sorted(styles))}, "
+                                               f"got {value!r}"))
+            elif key != 'id':
+                continue
+            elif value == '':
+                problems.append((path(i, key), "must not be empty"))
+            elif value in first:
+                problems.append((path(i, key), f"duplicate id {value!r} (first used at "
+                                               f"{path(first[value], key)})"))
+            elif value in seen_ids:
+                problems.append((path(i, key), f"duplicate id {value!r} (used by an earlier link)"))
+            else:
+                first[value] = i
+        _check_schedule(i, link, path, problems)
+    seen_ids.update(first)
+
+
+def _validate_links(links: Sequence[Dict], styles, path, problems: List[Problem],
+                    seen_ids: Optional[Set[str]] = None):
+    """Check every link; ``seen_ids`` holds the IDs of links checked in earlier batches"""
+    seen_ids = set() if seen_ids is None else seen_ids
+    if not links:
+        return
+    if not _links_look_valid(links, styles, seen_ids):
+        _report_links(links, styles, path, problems, seen_ids)
+        return
+    # Only a few links are scheduled: find them by key and check them one by one
+    if any(any(map(dict.__contains__, links, repeat(key))) for key in SCHEDULE_FIELDS):
+        for i, link in enumerate(links):
+            if not link.keys().isdisjoint(SCHEDULE_FIELDS):
+                _check_schedule(i, link, path, problems)
+
+
+def _validate_settings(config: Dict, defaults: Dict, problems: List[Problem]):
+    """Check the theme colors and that known settings keep their default's type"""
+    for key, value in config.items():
+        default = defaults.get(key)
+        if key == 'theme' or default is None:
+            continue
+        # JSON has no int/float distinction worth enforcing; bool is not a number here
+        expected = {type(default)} | ({int, float} if type(default) in (int, float) else set())
+        if type(value) not in expected:
+            problems.append((f"$.config.{key}", f"must be {_expected(expected)}, got {_json_type(value)}"))
+
+    if 'theme' not in config:
+        return
+    theme = config['theme']
+    if not isinstance(theme, dict):
+        problems.append(("$.config.theme", f"must be an object, got {_json_type(theme)}"))
+        return
+    # A theme in the file replaces the default one, so it needs every color
+    for key in defaults['theme']:
+        if key not in theme:
+            problems.append((f"$.config.theme.{key}", "is required"))
+    for key, value in theme.items():
+        if not isinstance(value, str) or not HEX_COLOR_RE.match(value):
+            problems.append((f"$.config.theme.{key}", f"must be a hex color like #4391C1, got {value!r}"))
+
+
+def _path_key(problem: Problem):
+    # Sort "$.links[10]" after "$.links[9]"
+    return [int(part) if part.isdigit() else part for part in re.split(r'(\d+)', problem[0])]
+
+
+def validate_config(data, styles, defaults) -> List[Problem]:
+    """Return every ``(json_path, message)`` problem in a parsed config, in file order
+
+    ``styles`` are the allowed link styles and ``defaults`` the default
+    config, whose theme lists the required colors and whose values give
+    the expected type of each setting.
+    """
+    if not isinstance(data, dict):
+        return [("$", f"must be an object, got {_json_type(data)}")]
+    problems: List[Problem] = []
+
+    revision = data.get('revision', 0)
+    if type(revision) is not int or revision < 0:
+        problems.append(("$.revision", f"must be a non-negative integer, got {revision!r}"))
+
+    config = data.get('config', {})
+    if isinstance(config, dict):
+        _validate_settings(config, defaults, problems)
+    else:
+        problems.append(("$.config", f"must be an object, got {_json_type(config)}"))
+
+    links = data.get('links', [])
+    if isinstance(links, list):
+        validator = LinkValidator(styles)
+        validator.check(links)
+        problems.extend(validator.problems)
+    else:
+        problems.append(("$.links", f"must be an array, got {_json_type(links)}"))
+    return sorted(problems, key=_path_key)
+
+
+def validate_link(data: Dict, styles) -> List[Problem]:
+    """Return the problems of a single link dict, each path being just the field name"""
+    problems: List[Problem] = []
+    _validate_links([data], frozenset(styles), lambda i, key: key, problems)
+    return problems
+
+
+def validate_settings(config: Dict, defaults: Dict) -> List[Problem]:
+    """Return the problems of a config's settings and theme, as ``validate_config`` reports them"""
+    problems: List[Problem] = []
+    _validate_settings(config, defaults, problems)
+    return problems
+
+
+class LinkValidator:
+    """Validate a links array batch by batch, e.g. while it is streamed from disk
+
+    Positions in the reported paths continue across batches and duplicate
+    IDs are caught across batches too (only the IDs are kept, not the links).
+    """
+
+    def __init__(self, styles):
+        self.styles = frozenset(styles)
+        self.problems: List[Problem] = []
+        self.count = 0
+        self._ids: Set[str] = set()
+
+    def check(self, links: Sequence):
+        """Validate the next batch of links; ``problems`` stays in file order"""
+        offset = self.count
+        self.count += len(links)
+        reported = len(self.problems)
+        if set(map(type, links)) <= {dict}:
+            _validate_links(links, self.styles, _link_path(offset), self.problems, self._ids)
+        else:
+            positions = [i for i, link in enumerate(links) if type(link) is not dict]
+            for i in positions:
+                self.problems.append((f"$.links[{offset + i}]",
+                                      f"must be an object, got {_json_type(links[i])}"))
+            skip = set(positions)
+            positions = [i for i in range(len(links)) if i not in skip]
+            _validate_links([links[i] for i in positions], self.styles, _link_path(offset, positions),
+                            self.problems, self._ids)
+        self.problems[reported:] = sorted(self.problems[reported:], key=_path_key)
+
+
+def main(argv=None):
+    # Imported here: manage_links imports this module
+    from manage_links import CONFIG, LINK_STYLES
+
+    parser = argparse.ArgumentParser(description="Validate Linktr.ee config files")
+    parser.add_argument('config_files', nargs='*', default=["linktree_config.json"])
+    args = parser.parse_args(argv)
+
+    ok = True
+    for config_file in args.config_files:
+        try:
+            with open(config_file, 'rb') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"{config_file}: {e}")
+            ok = False
+            continue
+        problems = validate_config(data, LINK_STYLES, CONFIG)
+        if problems:
+            print(ConfigValidationError(config_file, problems))
+            ok = False
+        else:
+            print(f"{config_file}: OK")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,259 @@
+"""
+Icon asset pipeline for the Linktr.ee page
+
+The social icons in ``images/`` are 512x512 PNGs but are displayed at 24x24
+CSS pixels. This module downsizes them to 1x and 2x variants with a small
+stdlib-only PNG codec, then either inlines them as data URIs (when they are
+small enough) or writes them as content-hashed files that can be cached
+forever.
+
+Processed icons are memoized per source file in ``_ICON_CACHE`` so repeated
+builds in the same process (and batch build workers seeded by the parent)
+never decode the same PNG twice, and on disk in ``ICON_CACHE_DIR`` (keyed by
+the source content hash) so later processes skip the work too.
+"""
+
+import base64
+import hashlib
+import os
+import struct
+import zlib
+from typing import Dict, Optional, Tuple
+
+# Directory (relative to the output file) for fingerprinted icon files
+ICON_ASSETS_DIR = "assets"
+
+# Hidden directory (relative to the output file) holding resized variants
+ICON_CACHE_DIR = ".icon_cache"
+
+# Icons are shown at this many CSS pixels; variants are made for 1x and 2x
+ICON_CSS_SIZE = 24
+
+# Icons whose 2x variant is at most this many bytes are inlined as data URIs
+INLINE_LIMIT = 4096
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# Source channel count per PNG colour type (palette expands to RGBA)
+_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+
+# (source path, mtime_ns, size) -> {scale: png_bytes}
+_ICON_CACHE: Dict[Tuple[str, int, int], Dict[int, bytes]] = {}
+
+
+class UnsupportedPNG(ValueError):
+    """Raised for PNG variants the stdlib codec does not handle"""
+
+
+def _paeth(a, b, c):
+    p = a + b - c
+    pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+    if pa <= pb and pa <= pc:
+        return a
+    return b if pb <= pc else c
+
+
+def decode_png(data: bytes) -> Tuple[int, int, bytearray]:
+    """Decode an 8-bit, non-interlaced PNG into ``(width, height, rgba_bytes)``"""
+    if not data.startswith(PNG_SIGNATURE):
+        raise UnsupportedPNG("not a PNG file")
+    pos = len(PNG_SIGNATURE)
+    idat = []
+    palette = transparency = None
+    width = height = color_type = 0
+    while pos < len(data):
+        length, kind = struct.unpack('>I4s', data[pos:pos + 8])
+        body = data[pos + 8:pos + 8 + length]
+        pos += 12 + length
+        if kind == b'IHDR':
+            width, height, depth, color_type, _, _, interlace = struct.unpack('>IIBBBBB', body)
+            if depth != 8 or interlace or color_type not in _CHANNELS:
+                raise UnsupportedPNG(f"depth={depth} color_type={color_type} interlace={interlace}")
+        elif kind == b'PLTE':
+            palette = body
+        elif kind == b'tRNS':
+            transparency = body
+        elif kind == b'IDAT':
+            idat.append(body)
+        elif kind == b'IEND':
+            break
+
+    bpp = _CHANNELS[color_type]
+    stride = width * bpp
+    raw = zlib.decompress(b''.join(idat))
+    pixels = bytearray(stride * height)
+    prev = bytearray(stride)
+    for y in range(height):
+        start = y * (stride + 1)
+        filter_type = raw[start]
+        line = bytearray(raw[start + 1:start + 1 + stride])
+        if filter_type == 1:
+            for i in range(bpp, stride):
+                line[i] = (line[i] + line[i - bpp]) & 0xFF
+        elif filter_type == 2:
+            for i in range(stride):
+                line[i] = (line[i] + prev[i]) & 0xFF
+        elif filter_type == 3:
+            for i in range(stride):
+                left = line[i - bpp] if i >= bpp else 0
+                line[i] = (line[i] + ((left + prev[i]) >> 1)) & 0xFF
+        elif filter_type == 4:
+            for i in range(stride):
+                left = line[i - bpp] if i >= bpp else 0
+                up_left = prev[i - bpp] if i >= bpp else 0
+                line[i] = (line[i] + _paeth(left, prev[i], up_left)) & 0xFF
+        pixels[y * stride:(y + 1) * stride] = line
+        prev = line
+
+    if color_type == 6:
+        return width, height, pixels
+    rgba = bytearray(width * height * 4)
+    if color_type == 3:
+        alpha = transparency or b''
+        table = [bytes(palette[i * 3:i * 3 + 3]) + bytes([alpha[i] if i < len(alpha) else 255])
+                 for i in range(len(palette) // 3)]
+        for i, index in enumerate(pixels):
+            rgba[i * 4:i * 4 + 4] = table[index]
+    else:
+        for i in range(width * height):
+            px = pixels[i * bpp:(i + 1) * bpp]
+            if color_type == 0:
+                rgba[i * 4:i * 4 + 4] = bytes((px[0], px[0], px[0], 255))
+            elif color_type == 4:
+                rgba[i * 4:i * 4 + 4] = bytes((px[0], px[0], px[0], px[1]))
+            else:
+                rgba[i * 4:i * 4 + 4] = bytes((px[0], px[1], px[2], 255))
+    return width, height, rgba
+
+
+def resize_rgba(width, height, rgba, new_width, new_height) -> bytearray:
+    """Area-average downscale of RGBA pixels, weighting colour by alpha"""
+    out = bytearray(new_width * new_height * 4)
+    x_bounds = [(x * width // new_width, max((x + 1) * width // new_width, x * width // new_width + 1))
+                for x in range(new_width)]
+    for oy in range(new_height):
+        y0 = oy * height // new_height
+        y1 = max((oy + 1) * height // new_height, y0 + 1)
+        for ox, (x0, x1) in enumerate(x_bounds):
+            r = g = b = a = 0
+            for y in range(y0, y1):
+                row = y * width * 4
+                for i in range(row + x0 * 4, row + x1 * 4, 4):
+                    alpha = rgba[i + 3]
+                    r += rgba[i] * alpha
+                    g += rgba[i + 1] * alpha
+                    b += rgba[i + 2] * alpha
+                    a += alpha
+            count = (y1 - y0) * (x1 - x0)
+            o = (oy * new_width + ox) * 4
+            if a:
+                out[o:o + 4] = bytes((r // a, g // a, b // a, (a + count // 2) // count))
+    return out
+
+
+def encode_png(width, height, rgba) -> bytes:
+    """Encode RGBA pixels as a PNG, picking the cheapest filter per row"""
+    stride = width * 4
+    raw = bytearray()
+    prev = bytes(stride)
+    for y in range(height):
+        line = rgba[y * stride:(y + 1) * stride]
+        candidates = [
+            b'\x00' + bytes(line),
+            b'\x01' + bytes((line[i] - (line[i - 4] if i >= 4 else 0)) & 0xFF for i in range(stride)),
+            b'\x02' + bytes((line[i] - prev[i]) & 0xFF for i in range(stride)),
+            b'\x04' + bytes((line[i] - _paeth(line[i - 4] if i >= 4 else 0, prev[i],
+                                              prev[i - 4] if i >= 4 else 0)) & 0xFF
+                            for i in range(stride)),
+        ]
+        # Minimum sum of absolute differences is the usual filter heuristic
+        raw += min(candidates, key=lambda c: sum(v if v < 128 else 256 - v for v in c[1:]))
+        prev = line
+
+    def chunk(kind, body):
+        return (struct.pack('>I', len(body)) + kind + body
+                + struct.pack('>I', zlib.crc32(kind + body) & 0xFFFFFFFF))
+
+    header = struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0)
+    return (PNG_SIGNATURE + chunk(b'IHDR', header)
+            + chunk(b'IDAT', zlib.compress(bytes(raw), 9)) + chunk(b'IEND', b''))
+
+
+def _resize_variants(data) -> Dict[int, bytes]:
+    """Produce 1x and 2x PNG variants of an icon; unsupported PNGs are kept as-is"""
+    try:
+        width, height, rgba = decode_png(data)
+    except (UnsupportedPNG, zlib.error, struct.error):
+        return {1: data, 2: data}
+    variants = {}
+    for scale in (1, 2):
+        size = ICON_CSS_SIZE * scale
+        if width <= size and height <= size:
+            variants[scale] = data
+        else:
+            variants[scale] = encode_png(size, size, resize_rgba(width, height, rgba, size, size))
+    return variants
+
+
+def icon_variants(path, cache_dir=None) -> Optional[Dict[int, bytes]]:
+    """Return ``{1: png, 2: png}`` right-sized variants of an icon, or None if missing"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    variants = _ICON_CACHE.get(key)
+    if variants is not None:
+        return variants
+
+    with open(path, 'rb') as f:
+        data = f.read()
+    cached = None
+    if cache_dir:
+        source_hash = hashlib.sha256(data).hexdigest()[:16]
+        cached = {scale: os.path.join(cache_dir, f"{source_hash}@{scale}x.png") for scale in (1, 2)}
+        try:
+            variants = {}
+            for scale, cache_path in cached.items():
+                with open(cache_path, 'rb') as f:
+                    variants[scale] = f.read()
+        except OSError:
+            variants = None
+
+    if variants is None:
+        variants = _resize_variants(data)
+        if cached:
+            os.makedirs(cache_dir, exist_ok=True)
+            for scale, cache_path in cached.items():
+                with open(cache_path, 'wb') as f:
+                    f.write(variants[scale])
+    _ICON_CACHE[key] = variants
+    return variants
+
+
+def publish_icon(path, output_dir, inline_limit=INLINE_LIMIT) -> Optional[Dict[str, str]]:
+    """Make an icon available to the page and return its ``src``/``srcset`` attributes
+
+    Small icons become a data URI of the 2x variant; larger ones are written
+    once as ``<name>-<hash>.png`` / ``<name>-<hash>@2x.png`` under
+    ``ICON_ASSETS_DIR`` next to the output file.
+    """
+    variants = icon_variants(path, os.path.join(output_dir, ICON_CACHE_DIR))
+    if variants is None:
+        return None
+    if len(variants[2]) <= inline_limit:
+        encoded = base64.b64encode(variants[2]).decode('ascii')
+        return {'src': f"data:image/png;base64,{encoded}", 'srcset': None}
+
+    name = os.path.splitext(os.path.basename(path))[0]
+    urls = {}
+    for scale, suffix in ((1, ''), (2, '@2x')):
+        digest = hashlib.sha256(variants[scale]).hexdigest()[:10]
+        filename = f"{name}-{digest}{suffix}.png"
+        target = os.path.join(output_dir, ICON_ASSETS_DIR, filename)
+        if not os.path.exists(target):
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, 'wb') as f:
+                f.write(variants[scale])
+        urls[scale] = f"{ICON_ASSETS_DIR}/{filename}"
+    return {'src': urls[1], 'srcset': f"{urls[2]} 2x"}
@@ -0,0 +1,260 @@
+"""
+Link health checker for the Linktr.ee page
+
+Probes URLs concurrently with asyncio using a tiny stdlib HTTP/1.1 client:
+
+- one pool of keep-alive connections per origin (scheme, host, port)
+- a cap on concurrent requests per host and overall
+- a timeout per request
+- ``HEAD`` first, falling back to ``GET`` for servers that reject ``HEAD``
+- redirects are followed up to ``MAX_REDIRECTS``; a longer chain is broken
+- only http(s) URLs are probed: ``mailto:``/``tel:`` links are reported as
+  skipped (``ok`` and ``skipped`` both true)
+
+Results are stored in an on-disk JSON cache with a TTL, so repeated runs
+only re-probe entries that expired.
+"""
+
+import asyncio
+import json
+import os
+import ssl
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+DEFAULT_CACHE_FILE = ".linkcheck_cache.json"
+DEFAULT_TTL = 6 * 60 * 60
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_PER_HOST = 4
+DEFAULT_CONCURRENCY = 32
+MAX_REDIRECTS = 5
+
+# Bodies larger than this are not drained; the connection is dropped instead
+MAX_DRAIN_BYTES = 1 << 20
+
+USER_AGENT = "PythonistasGDL-LinkChecker/1.0"
+
+
+def is_web_url(url) -> bool:
+    """True for the http(s) URLs the checker probes"""
+    return urlsplit(url).scheme.lower() in ('http', 'https')
+
+
+class HostPool:
+    """Keep-alive connections and a concurrency cap for a single origin"""
+
+    def __init__(self, scheme, host, port, limit):
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.semaphore = asyncio.Semaphore(limit)
+        self.idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+
+    async def connect(self):
+        """Reuse an idle connection or open a new one"""
+        while self.idle:
+            reader, writer = self.idle.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return reader, writer
+            writer.close()
+        context = ssl.create_default_context() if self.scheme == 'https' else None
+        return await asyncio.open_connection(self.host, self.port, ssl=context)
+
+    def release(self, reader, writer, reusable):
+        if reusable:
+            self.idle.append((reader, writer))
+        else:
+            writer.close()
+
+    def close(self):
+        for _, writer in self.idle:
+            writer.close()
+        self.idle.clear()
+
+
+async def _read_response(reader, method) -> Tuple[int, Dict[str, str], bool]:
+    """Read status and headers, drain the body; returns (status, headers, reusable)"""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("connection closed before response")
+    parts = status_line.decode('latin-1').split(None, 2)
+    status = int(parts[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    reusable = headers.get('connection', '').lower() != 'close'
+    if method == 'HEAD' or status in (204, 304) or 100 <= status < 200:
+        return status, headers, reusable
+    if headers.get('transfer-encoding', '').lower() == 'chunked':
+        drained = 0
+        while True:
+            size = int((await reader.readline()).split(b';')[0].strip() or b'0', 16)
+            drained += size
+            if size == 0:
+                await reader.readline()
+                break
+            if drained > MAX_DRAIN_BYTES:
+                return status, headers, False
+            await reader.readexactly(size + 2)
+    elif 'content-length' in headers:
+        length = int(headers['content-length'])
+        if length > MAX_DRAIN_BYTES:
+            return status, headers, False
+        await reader.readexactly(length)
+    else:
+        # Body delimited by connection close
+        return status, headers, False
+    return status, headers, reusable
+
+
+class LinkChecker:
+    """Checks URLs concurrently with per-host connection pools"""
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, per_host=DEFAULT_PER_HOST,
+                 concurrency=DEFAULT_CONCURRENCY):
+        self.timeout = timeout
+        self.per_host = per_host
+        self.concurrency = concurrency
+        self.pools: Dict[Tuple[str, str, int], HostPool] = {}
+
+    def _pool(self, scheme, host, port) -> HostPool:
+        key = (scheme, host, port)
+        pool = self.pools.get(key)
+        if pool is None:
+            pool = self.pools[key] = HostPool(scheme, host, port, self.per_host)
+        return pool
+
+    async def request(self, method, url) -> Tuple[int, Dict[str, str]]:
+        """Send one request over a pooled connection and return (status, headers)
+
+        Only connecting, sending and reading count against ``timeout``.
+        """
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise ValueError(f"unsupported URL: {url}")
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        pool = self._pool(parts.scheme, parts.hostname, port)
+        target = parts.path or '/'
+        if parts.query:
+            target += '?' + parts.query
+        host_header = parts.hostname if parts.port is None else f"{parts.hostname}:{parts.port}"
+        request = (f"{method} {target} HTTP/1.1\r\nHost: {host_header}\r\n"
+                   f"User-Agent: {USER_AGENT}\r\nAccept: */*\r\n\r\n").encode('latin-1')
+
+        # Waiting for a slot on the host is not part of the request's timeout
+        async with pool.semaphore:
+            return await asyncio.wait_for(self._exchange(pool, method, request), self.timeout)
+
+    @staticmethod
+    async def _exchange(pool, method, request) -> Tuple[int, Dict[str, str]]:
+        """Write the request and read the response, retrying once on a stale connection"""
+        for attempt in range(2):
+            reader, writer = await pool.connect()
+            try:
+                writer.write(request)
+                await writer.drain()
+                status, headers, reusable = await _read_response(reader, method)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                writer.close()
+                if attempt:
+                    raise
+                continue
+            except BaseException:
+                writer.close()
+                raise
+            pool.release(reader, writer, reusable)
+            return status, headers
+
+    async def probe(self, url) -> Dict:
+        """Check one URL: HEAD with GET fallback, following redirects"""
+        start = time.perf_counter()
+        result = {'url': url, 'status': None, 'ok': False, 'error': None, 'skipped': False,
+                  'final_url': url, 'elapsed': 0.0, 'checked_at': time.time()}
+        if not is_web_url(url):
+            result['ok'] = result['skipped'] = True
+            return result
+        try:
+            current = url
+            for method in ('HEAD', 'GET'):
+                current = url
+                for _ in range(MAX_REDIRECTS + 1):
+                    status, headers = await self.request(method, current)
+                    location = headers.get('location')
+                    if not (300 <= status < 400 and location):
+                        break
+                    current = urljoin(current, location)
+                else:
+                    # The chain did not end within the limit; GET would not end it either
+                    result['status'] = status
+                    result['error'] = f"too many redirects (more than {MAX_REDIRECTS})"
+                    break
+                result['status'] = status
+                if status < 400:
+                    break
+            result['final_url'] = current
+            result['ok'] = (result['error'] is None and result['status'] is not None
+                            and result['status'] < 400)
+        except asyncio.TimeoutError:
+            result['error'] = f"timeout after {self.timeout}s"
+        except (OSError, ValueError, asyncio.IncompleteReadError) as e:
+            result['error'] = f"{type(e).__name__}: {e}"
+        result['elapsed'] = time.perf_counter() - start
+        return result
+
+    async def check(self, urls) -> Dict[str, Dict]:
+        """Probe all URLs concurrently and return ``{url: result}``"""
+        limiter = asyncio.Semaphore(self.concurrency)
+
+        async def bounded(url):
+            async with limiter:
+                return await self.probe(url)
+
+        try:
+            results = await asyncio.gather(*(bounded(url) for url in urls))
+        finally:
+            for pool in self.pools.values():
+                pool.close()
+        return {result['url']: result for result in results}
+
+
+def load_cache(cache_file) -> Dict[str, Dict]:
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(cache_file, cache):
+    tmp_path = f"{cache_file}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, cache_file)
+
+
+def check_urls(urls, cache_file: Optional[str] = DEFAULT_CACHE_FILE, ttl=DEFAULT_TTL,
+               timeout=DEFAULT_TIMEOUT, per_host=DEFAULT_PER_HOST,
+               concurrency=DEFAULT_CONCURRENCY) -> Dict[str, Dict]:
+    """Check URLs, reusing cached results younger than ``ttl`` seconds
+
+    Pass ``cache_file=None`` to always probe and keep nothing on disk.
+    """
+    urls = list(dict.fromkeys(urls))
+    cache = load_cache(cache_file) if cache_file else {}
+    now = time.time()
+    # Skipping a non-web link costs nothing, so those are never taken from the cache
+    stale = [url for url in urls if url not in cache or not is_web_url(url)
+             or now - cache[url].get('checked_at', 0) >= ttl]
+
+    if stale:
+        checker = LinkChecker(timeout=timeout, per_host=per_host, concurrency=concurrency)
+        cache.update(asyncio.run(checker.check(stale)))
+        if cache_file:
+            save_cache(cache_file, cache)
+    return {url: dict(cache[url], cached=url not in stale) for url in urls}
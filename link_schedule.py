@@ -0,0 +1,104 @@
+"""
+Publish/expire windows for links
+
+A link with ``publish_at`` and/or ``expire_at`` (ISO 8601 strings; naive
+times are local time) is only rendered while ``publish_at <= now <
+expire_at``. Either end may be left out.
+
+``Timeline`` keeps every publish and expire instant of the scheduled links
+in one sorted event list. The active set is maintained by sweeping a cursor
+over that list, so moving from one instant to the next only touches the
+events in between, and the next instant at which the rendered output
+changes is a single bisect.
+"""
+
+from bisect import bisect_right
+from datetime import datetime
+from typing import Iterable, List, Optional, Set, Tuple
+
+SCHEDULE_FIELDS = ("publish_at", "expire_at")
+
+
+def parse_time(value) -> Optional[float]:
+    """Convert an ISO 8601 string (or None) to a POSIX timestamp
+
+    Raises ValueError for anything that is not a valid ISO 8601 date/time.
+    """
+    if value is None:
+        return None
+    if not isinstance(value, str):
+        raise ValueError(f"expected an ISO 8601 string, got {value!r}")
+    return datetime.fromisoformat(value).timestamp()
+
+
+def window(link) -> Tuple[Optional[float], Optional[float]]:
+    """Return the (publish, expire) timestamps of a link"""
+    return parse_time(link.get('publish_at')), parse_time(link.get('expire_at'))
+
+
+def is_scheduled(link) -> bool:
+    return link.get('publish_at') is not None or link.get('expire_at') is not None
+
+
+def is_live(link, now) -> bool:
+    """Check a single link's window directly (for links outside a Timeline)"""
+    publish, expire = window(link)
+    return (publish is None or publish <= now) and (expire is None or now < expire)
+
+
+class Timeline:
+    """Sorted publish/expire events for the scheduled links of a site"""
+
+    def __init__(self, links: Iterable = ()):
+        events: List[Tuple[float, int, str]] = []
+        always: Set[str] = set()
+        for link in links:
+            if not is_scheduled(link):
+                continue
+            publish, expire = window(link)
+            if publish is not None and expire is not None and expire <= publish:
+                continue  # an empty window is never live
+            if publish is None:
+                always.add(link['id'])
+            else:
+                events.append((publish, 1, link['id']))
+            if expire is not None:
+                events.append((expire, -1, link['id']))
+        # Expiries sort before publications at the same instant
+        events.sort()
+        self._events = events
+        self._times = [event[0] for event in events]
+        self._active = always
+        self._cursor = 0  # events[:_cursor] are applied to _active
+
+    def __len__(self):
+        return len(self._events)
+
+    def _seek(self, now):
+        """Move the cursor so exactly the events at or before ``now`` are applied"""
+        target = bisect_right(self._times, now)
+        active = self._active
+        while self._cursor < target:
+            _, kind, id = self._events[self._cursor]
+            if kind > 0:
+                active.add(id)
+            else:
+                active.discard(id)
+            self._cursor += 1
+        while self._cursor > target:
+            self._cursor -= 1
+            _, kind, id = self._events[self._cursor]
+            if kind > 0:
+                active.discard(id)
+            else:
+                active.add(id)
+
+    def active_at(self, now) -> Set[str]:
+        """IDs of the scheduled links that are live at ``now`` (do not mutate)"""
+        self._seek(now)
+        return self._active
+
+    def next_transition(self, now) -> Optional[float]:
+        """Timestamp of the first publish/expire event after ``now``, or None"""
+        index = bisect_right(self._times, now)
+        return self._times[index] if index < len(self._times) else None
@@ -1,4 +1,4 @@
-0#!/usr/bin/env python3
+#!/usr/bin/env python3
 """
 Pythonistas GDL Linktr.ee Page Manager
 
@@ -9,61 +9,120 @@ This script helps manage your Linktr.ee style page by providing functions to:
 - Disable/enable links
 - Generate the HTML file
 
+Every action is also a subcommand for scripts and cron jobs (``--json``
+prints one machine-readable result object); without a command the
+interactive menu starts.
+
 Usage:
-    python linktr_manager.py
+    python manage_links.py
+    python -m manage_links add --title "Meetup" --url https://example.com/meetup --badge Nuevo
+    python -m manage_links --json move meetup --before discord --rebuild
+    python -m manage_links toggle meetup --off
+    python -m manage_links theme --bg-color "#FFE566"
+    python -m manage_links batch changes.json --rebuild
+    python -m manage_links build --incremental
+    python -m manage_links --json check-links --ttl 0
+    python -m manage_links bench --sizes 10 1000 --no-memory
 """
 
+import argparse
+import bisect
+import copy
+import hashlib
 import json
 import os
 import re
+import string
+import sys
+import time
+from contextlib import contextmanager, redirect_stdout
+from functools import lru_cache
+from operator import attrgetter
 from datetime import datetime
-from typing import Dict, List, Optional, Union
+from enum import Enum
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import instrumentation
+import order_keys
+
+# Modules only some commands need are imported where they are used, keeping
+# `--help` and the CLI's argument parsing quick
+if TYPE_CHECKING:
+    import link_schedule
+    import search_index
+
+try:
+    import brotli
+except ImportError:  # optional dependency, only used for .br artifacts
+    brotli = None
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
 
 # Social media platform mapping
 SOCIAL_MEDIA_PLATFORMS = {
     "facebook": {
         "name": "Facebook",
         "icon_path": "images/facebook.png",
-        "icon_type": "image"
+        "icon_type": "image",
+        "domains": ["facebook.com", "fb.com", "fb.me", "fb.watch"]
     },
     "instagram": {
         "name": "Instagram",
         "icon_path": "images/instagram.png",
-        "icon_type": "image"
+        "icon_type": "image",
+        "domains": ["instagram.com", "instagr.am"]
     },
     "twitter": {
         "name": "Twitter/X",
         "icon_path": "images/twitter.png",
-        "icon_type": "image"
+        "icon_type": "image",
+        "domains": ["twitter.com", "x.com"]
     },
     "youtube": {
         "name": "YouTube",
         "icon_path": "images/youtube.png",
-        "icon_type": "image"
+        "icon_type": "image",
+        "domains": ["youtube.com", "youtu.be", "youtube-nocookie.com"]
     },
     "tiktok": {
         "name": "TikTok",
         "icon_path": "images/tiktok.png",
-        "icon_type": "image"
+        "icon_type": "image",
+        "domains": ["tiktok.com"]
     },
     "linkedin": {
         "name": "LinkedIn",
         "icon_path": "images/linkedin.png",
-        "icon_type": "image"
+        "icon_type": "image",
+        "domains": ["linkedin.com", "lnkd.in"]
     },
     "discord": {
         "name": "Discord",
         "icon_path": "images/discord.png",
-        "icon_type": "image"
+        "icon_type": "image",
+        "domains": ["discord.com", "discord.gg", "discordapp.com"]
     },
     "telegram": {
         "name": "Telegram",
         "icon_path": "images/telegram.png",
-        "icon_type": "image"
+        "icon_type": "image",
+        "domains": ["t.me", "telegram.me", "telegram.org"]
     },
     # Add more platforms as needed
 }
 
+# Registered domain -> platform ID, built from the "domains" of each platform
+PLATFORM_HOSTS = {
+    domain: platform_id
+    for platform_id, platform in SOCIAL_MEDIA_PLATFORMS.items()
+    for domain in platform.get("domains", ())
+}
+
 # Base configuration
 CONFIG = {
     "title": "print(\"Hola Pythonistas GDL!\")",
@@ -79,9 +138,31 @@ CONFIG = {
         "text_color": "#000000",
         "logo_bg": "#4D9457"
     },
-    "output_file": "index.html"
+    "output_file": "index.html",
+    "optimize_icons": True,
+    # Paginated output: at most this many links and bytes on the first screen,
+    # the rest in lazily fetched chunks of about chunk_links links
+    "inline_links": 20,
+    "first_screen_bytes": 14336,
+    "chunk_links": 25,
+    # Emit a prebuilt search index next to the page and a search box on it
+    "search_index": False
 }
 
+# Link styles understood by generate_html
+LINK_STYLES = ("default", "primary", "secondary", "tertiary", "highlight")
+
+# Keys every link carries, in JSON order, followed by the optional schedule window and
+# the fractional order key (see order_keys.py)
+LINK_FIELDS = ("title", "url", "icon", "style", "badge", "enabled", "id", "publish_at", "expire_at",
+               "order")
+
+# Seconds to wait for the config file lock before giving up
+LOCK_TIMEOUT = 10.0
+
+# Bump whenever the HTML templates change so stale build caches are discarded
+BUILD_CACHE_VERSION = 3
+
 # Default links structure
 DEFAULT_LINKS = [
     {
@@ -185,212 +266,51 @@ DEFAULT_LINKS = [
     }
 ]
 
-class LinkTreeManager:
-    """Manager for a Linktr.ee style page"""
-    
-    def __init__(self, config_file="linktree_config.json"):
-        self.config_file = config_file
-        self.config = CONFIG.copy()
-        self.links = []
-        self.load_config()
-        
-    def load_config(self):
-        """Load configuration from file if exists, otherwise use default"""
-        if os.path.exists(self.config_file):
-            try:
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.config.update(data.get('config', {}))
-                    self.links = data.get('links', DEFAULT_LINKS)
-            except Exception as e:
-                print(f"Error loading config file: {e}")
-                print("Using default configuration instead.")
-                self.links = DEFAULT_LINKS
-        else:
-            print("No config file found. Using default configuration.")
-            self.links = DEFAULT_LINKS
-    
-    def save_config(self):
-        """Save current configuration to file"""
-        data = {
-            'config': self.config,
-            'links': self.links
-        }
-        with open(self.config_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        print(f"Configuration saved to {self.config_file}")
-
-    def add_link(self, title, url, icon="🔗", style="default", badge=None, enabled=True, id=None):
-        """Add a new link to the list"""
-        # Try to auto-detect social media
-        social_media = self.auto_detect_social_media(url)
-
-        if social_media and id is None:
-            # Use the detected platform ID
-            id = social_media["id"]
-            if not title or title == "":
-                title = social_media["title"]
-
-        if id is None:
-            # Generate an ID from the title
-            id = re.sub(r'[^a-z0-9]', '', title.lower())
-
-        # Check if ID already exists
-        existing_ids = [link['id'] for link in self.links]
-        if id in existing_ids:
-            id = f"{id}_{len(self.links)}"
-
-        new_link = {
-            "title": title,
-            "url": url,
-            "icon": icon,
-            "style": style,
-            "badge": badge,
-            "enabled": enabled,
-            "id": id
-        }
-
-        self.links.append(new_link)
-        print(f"Added new link: {title}")
-    
-    def update_link(self, id, **kwargs):
-        """Update an existing link by ID"""
-        for i, link in enumerate(self.links):
-            if link['id'] == id:
-                for key, value in kwargs.items():
-                    if key in link:
-                        link[key] = value
-                print(f"Updated link: {link['title']}")
-                return True
-        print(f"Link with ID '{id}' not found")
-        return False
-    
-    def disable_link(self, id):
-        """Disable a link by ID"""
-        return self.update_link(id, enabled=False)
-    
-    def enable_link(self, id):
-        """Enable a link by ID"""
-        return self.update_link(id, enabled=True)
-    
-    def delete_link(self, id):
-        """Delete a link by ID"""
-        for i, link in enumerate(self.links):
-            if link['id'] == id:
-                del self.links[i]
-                print(f"Deleted link with ID: {id}")
-                return True
-        print(f"Link with ID '{id}' not found")
-        return False
-    
-    def reorder_links(self, id_list):
-        """Reorder links based on a list of IDs"""
-        if len(id_list) != len(self.links):
-            print("Error: Number of IDs does not match number of links")
-            return False
-            
-        # Check if all IDs exist
-        existing_ids = [link['id'] for link in self.links]
-        for id in id_list:
-            if id not in existing_ids:
-                print(f"Error: ID '{id}' not found")
-                return False
-        
-        # Create a new ordered list
-        new_links = []
-        for id in id_list:
-            for link in self.links:
-                if link['id'] == id:
-                    new_links.append(link)
-                    break
-        
-        self.links = new_links
-        print("Links reordered successfully")
-        return True
-    
-    def get_link_ids(self):
-        """Return a list of all link IDs with their titles"""
-        return [(link['id'], link['title']) for link in self.links]
-    
-    def update_theme(self, **kwargs):
-        """Update theme colors"""
-        for key, value in kwargs.items():
-            if key in self.config['theme']:
-                self.config['theme'][key] = value
-        print("Theme updated")
-    
-    def update_config(self, **kwargs):
-        """Update basic configuration"""
-        for key, value in kwargs.items():
-            if key in self.config and key != 'theme':
-                self.config[key] = value
-        print("Configuration updated")
-
-    def auto_detect_social_media(self, url):
-        """Auto-detect social media platform from URL and set appropriate icon"""
-        for platform_id, platform in SOCIAL_MEDIA_PLATFORMS.items():
-            if platform_id in url.lower():
-                return {
-                    "id": platform_id,
-                    "title": platform["name"],
-                    "icon": "🔗"  # Default fallback, but we'll use the image
-                }
-        return None
-
-    def generate_html(self):
-        """Generate HTML for the Linktr.ee style page"""
-        # HTML template with placeholders
-        html = f"""<!DOCTYPE html>
-    <html lang="es">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>{self.config['logo_text']}</title>
-        <link href="https://fonts.googleapis.com/css2?family=Poppins:wght@400;600&display=swap" rel="stylesheet">
-        <style>
-            * {{
+# Stylesheet for the generated page. It depends only on the theme, so it is
+# compiled once and cached per theme (see compile_stylesheet).
+STYLESHEET_TEMPLATE = string.Template("""            * {
                 margin: 0;
                 padding: 0;
                 box-sizing: border-box;
                 font-family: 'Poppins', sans-serif;
-            }}
+            }
 
-            body {{
-                background-color: {self.config['theme']['bg_color']};
+            body {
+                background-color: ${bg_color};
                 display: flex;
                 flex-direction: column;
                 align-items: center;
                 padding: 2rem 1rem;
                 min-height: 100vh;
-            }}
+            }
 
-            .container {{
+            .container {
                 max-width: 600px;
                 width: 100%;
-            }}
+            }
 
-            .profile {{
+            .profile {
                 display: flex;
                 flex-direction: column;
                 align-items: center;
                 margin-bottom: 2rem;
-            }}
+            }
 
-            .logo {{
+            .logo {
                 width: 120px;
                 height: 120px;
                 border-radius: 50%;
-                background-color: {self.config['theme']['bg_color']};
+                background-color: ${bg_color};
                 display: flex;
                 justify-content: center;
                 align-items: center;
                 margin-bottom: 1rem;
                 position: relative;
                 overflow: hidden;
-                border: 3px solid {self.config['theme']['text_color']};
-            }}
+                border: 3px solid ${text_color};
+            }
 
-            .logo-text {{
+            .logo-text {
                 position: absolute;
                 bottom: 0;
                 background-color: rgba(0, 0, 0, 0.7);
@@ -399,101 +319,101 @@ class LinkTreeManager:
                 text-align: center;
                 padding: 4px;
                 font-size: 12px;
-            }}
+            }
 
-            h1 {{
+            h1 {
                 font-size: 1.8rem;
                 margin-bottom: 0.5rem;
                 text-align: center;
-                color: {self.config['theme']['text_color']};
-            }}
+                color: ${text_color};
+            }
 
-            .description {{
+            .description {
                 text-align: center;
                 margin-bottom: 2rem;
                 max-width: 500px;
-                color: {self.config['theme']['text_color']};
-            }}
+                color: ${text_color};
+            }
 
-            .links {{
+            .links {
                 display: flex;
                 flex-direction: column;
                 gap: 1rem;
                 width: 100%;
-            }}
+            }
 
-            .link {{
+            .link {
                 display: flex;
                 align-items: center;
                 justify-content: center;
                 background-color: white;
-                border: 2px solid {self.config['theme']['text_color']};
+                border: 2px solid ${text_color};
                 border-radius: 25px;
                 padding: 12px;
                 text-decoration: none;
-                color: {self.config['theme']['text_color']};
+                color: ${text_color};
                 font-size: 1.1rem;
                 font-weight: 600;
                 transition: transform 0.2s, background-color 0.2s, color 0.2s;
                 width: 100%;
                 box-sizing: border-box;
                 position: relative;
-            }}
+            }
 
-            .link:hover {{
+            .link:hover {
                 transform: scale(1.05);
                 box-shadow: 0 5px 10px rgba(0, 0, 0, 0.2);
-            }}
+            }
 
-            .link.primary {{
-                background-color: {self.config['theme']['primary_color']};
-                border-color: {self.config['theme']['primary_color']};
+            .link.primary {
+                background-color: ${primary_color};
+                border-color: ${primary_color};
                 color: white;
-            }}
+            }
 
-            .link.primary:hover {{
-                background-color: #b93030; /* Darkened primary color for hover */
-                border-color: #b93030;
+            .link.primary:hover {
+                background-color: ${primary_hover}; /* Darkened primary color for hover */
+                border-color: ${primary_hover};
                 color: white;
-            }}
+            }
 
-            .link.secondary {{
-                background-color: {self.config['theme']['secondary_color']};
-                border-color: {self.config['theme']['secondary_color']};
+            .link.secondary {
+                background-color: ${secondary_color};
+                border-color: ${secondary_color};
                 color: white;
-            }}
+            }
 
-            .link.secondary:hover {{
-                background-color: #397ca3; /* Darkened secondary color for hover */
-                border-color: #397ca3;
+            .link.secondary:hover {
+                background-color: ${secondary_hover}; /* Darkened secondary color for hover */
+                border-color: ${secondary_hover};
                 color: white;
-            }}
+            }
 
-            .link.tertiary {{
-                background-color: {self.config['theme']['tertiary_color']};
-                border-color: {self.config['theme']['tertiary_color']};
+            .link.tertiary {
+                background-color: ${tertiary_color};
+                border-color: ${tertiary_color};
                 color: white;
-            }}
+            }
 
-            .link.tertiary:hover {{
-                background-color: #407a49; /* Darkened tertiary color for hover */
-                border-color: #407a49;
+            .link.tertiary:hover {
+                background-color: ${tertiary_hover}; /* Darkened tertiary color for hover */
+                border-color: ${tertiary_hover};
                 color: white;
-            }}
+            }
 
-            .link.highlight {{
-                background-color: {self.config['theme']['highlight_color']};
-                border-color: {self.config['theme']['highlight_color']};
-                color: {self.config['theme']['text_color']};
-            }}
+            .link.highlight {
+                background-color: ${highlight_color};
+                border-color: ${highlight_color};
+                color: ${text_color};
+            }
 
-            .link.highlight:hover {{
-                background-color: #d6b326; /* Darkened highlight color for hover */
-                border-color: #d6b326;
-                color: {self.config['theme']['text_color']};
-            }}
+            .link.highlight:hover {
+                background-color: ${highlight_hover}; /* Darkened highlight color for hover */
+                border-color: ${highlight_hover};
+                color: ${text_color};
+            }
 
-            .link-icon {{
+            .link-icon {
                 width: 24px;
                 height: 24px;
                 margin-right: 10px;
@@ -501,38 +421,38 @@ class LinkTreeManager:
                 justify-content: center;
                 align-items: center;
                 font-size: 1rem;
-            }}
+            }
 
-            .link-content {{
+            .link-content {
                 display: flex;
                 align-items: center;
                 justify-content: center;
-            }}
+            }
 
-            .social-icon {{
+            .social-icon {
                 width: 24px;
                 height: 24px;
                 margin-right: 10px;
                 display: flex;
                 justify-content: center;
                 align-items: center;
-            }}
+            }
 
-            .social-icon img {{
+            .social-icon img {
                 width: 100%;
                 height: 100%;
                 object-fit: contain;
-            }}
+            }
 
-            .footer {{
+            .footer {
                 margin-top: 3rem;
                 text-align: center;
                 font-size: 0.8rem;
                 opacity: 0.7;
-                color: {self.config['theme']['text_color']};
-            }}
+                color: ${text_color};
+            }
 
-            .snake-decoration {{
+            .snake-decoration {
                 position: absolute;
                 top: 10px;
                 right: 10px;
@@ -540,52 +460,1190 @@ class LinkTreeManager:
                 height: 150px;
                 opacity: 0.1;
                 z-index: -1;
-            }}
+            }
 
-            @media (max-width: 600px) {{
-                h1 {{
+            @media (max-width: 600px) {
+                h1 {
                     font-size: 1.5rem;
-                }}
+                }
 
-                .link {{
+                .link {
                     font-size: 1rem;
                     padding: 10px;
-                }}
+                }
 
-                .snake-decoration {{
+                .snake-decoration {
                     width: 100px;
                     height: 100px;
-                }}
-            }}
+                }
+            }
 
-            .badge {{
+            .badge {
                 position: absolute;
                 top: -8px;
                 right: -8px;
                 background-color: white;
-                color: {self.config['theme']['text_color']};
+                color: ${text_color};
                 font-size: 0.7rem;
                 padding: 4px 8px;
                 border-radius: 10px;
-                border: 1px solid {self.config['theme']['text_color']};
-            }}
+                border: 1px solid ${text_color};
+            }
+
+            .link.primary .badge {
+                border-color: ${primary_color};
+            }
+
+            .link.secondary .badge {
+                border-color: ${secondary_color};
+            }
+
+            .link.tertiary .badge {
+                border-color: ${tertiary_color};
+            }
+
+            .link.highlight .badge {
+                border-color: ${highlight_color};
+            }
+""")
+
+# Hover backgrounds are the style colour darkened by this factor
+HOVER_DARKEN_FACTOR = 0.85
+
+class Style(str, Enum):
+    """Link styles understood by generate_html"""
+    DEFAULT = "default"
+    PRIMARY = "primary"
+    SECONDARY = "secondary"
+    TERTIARY = "tertiary"
+    HIGHLIGHT = "highlight"
+
+    # Render as the plain value in f-strings and templates
+    __str__ = str.__str__
+    __format__ = str.__format__
+
+
+def _intern_style(value):
+    """Return the shared Style member for ``value``; unknown styles are interned as-is"""
+    try:
+        return Style(value)
+    except ValueError:
+        return sys.intern(value) if isinstance(value, str) else value
+
+
+class Link:
+    """A single link, stored in slots instead of a per-link dict.
+
+    Supports the mapping access the templates use (``link['title']``,
+    ``link.get('badge')``), but only for the known ``LINK_FIELDS``: assigning
+    any other key raises ``KeyError``. Keys from the JSON file that are not
+    link fields are kept in ``extra`` so ``from_dict``/``to_dict`` round-trip
+    losslessly. ``publish_at``/``expire_at`` and ``order`` are only serialized
+    when set; ``order`` is managed by ``LinkCollection``.
+    """
+
+    __slots__ = ('title', 'url', 'icon', '_style', 'badge', 'enabled', 'id',
+                 'publish_at', 'expire_at', 'order', 'extra')
+
+    def __init__(self, title, url, icon=None, style=Style.DEFAULT, badge=None,
+                 enabled=True, id=None, extra=None, publish_at=None, expire_at=None, order=None):
+        self.title = title
+        self.url = url
+        self.icon = icon
+        self._style = _intern_style(style)
+        self.badge = badge
+        self.enabled = enabled
+        self.id = id
+        self.publish_at: Optional[str] = publish_at
+        self.expire_at: Optional[str] = expire_at
+        self.order: Optional[str] = order
+        self.extra: Optional[Dict] = extra or None
+
+    @property
+    def style(self):
+        return self._style
+
+    @style.setter
+    def style(self, value):
+        self._style = _intern_style(value)
 
-            .link.primary .badge {{
-                border-color: {self.config['theme']['primary_color']};
-            }}
+    @classmethod
+    def from_dict(cls, data) -> 'Link':
+        """Build a Link from a link dict (or copy another Link)"""
+        if isinstance(data, Link):
+            return data.copy()
+        extra = {key: value for key, value in data.items() if key not in LINK_FIELDS}
+        return cls(data['title'], data['url'], data.get('icon'), data.get('style', Style.DEFAULT),
+                   data.get('badge'), data.get('enabled', True), data['id'], extra,
+                   data.get('publish_at'), data.get('expire_at'), data.get('order'))
+
+    def to_dict(self) -> Dict:
+        """Return the link in its JSON shape, ``style`` as a plain string"""
+        data = {
+            "title": self.title,
+            "url": self.url,
+            "icon": self.icon,
+            "style": str(self._style),
+            "badge": self.badge,
+            "enabled": self.enabled,
+            "id": self.id,
+        }
+        if self.publish_at is not None:
+            data["publish_at"] = self.publish_at
+        if self.expire_at is not None:
+            data["expire_at"] = self.expire_at
+        if self.order is not None:
+            data["order"] = self.order
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def copy(self) -> 'Link':
+        return Link(self.title, self.url, self.icon, self._style, self.badge, self.enabled,
+                    self.id, dict(self.extra) if self.extra else None,
+                    self.publish_at, self.expire_at, self.order)
+
+    def __getitem__(self, key):
+        if key in LINK_FIELDS:
+            return getattr(self, key)
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key not in LINK_FIELDS:
+            raise KeyError(f"unknown link field {key!r}")
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in LINK_FIELDS or bool(self.extra and key in self.extra)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return self.to_dict().keys()
+
+    def items(self):
+        return self.to_dict().items()
+
+    def update(self, fields=(), **kwargs):
+        """Set several fields at once; unknown keys raise ``KeyError`` before anything changes"""
+        fields = dict(fields, **kwargs)
+        unknown = set(fields) - set(LINK_FIELDS)
+        if unknown:
+            raise KeyError(f"unknown link fields: {', '.join(sorted(unknown))}")
+        for key, value in fields.items():
+            setattr(self, key, value)
+
+    def __eq__(self, other):
+        if isinstance(other, Link):
+            other = other.to_dict()
+        return self.to_dict() == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Link({self.to_dict()!r})"
+
+
+class LinkCollection:
+    """Ordered collection of ``Link`` records indexed by link ID.
+
+    Links are kept in display order in ``_slots``, which is also ascending
+    order of their fractional ``order`` keys, while ``_index`` maps each ID to
+    its link. Lookups by ID are O(1) and a link's slot is found by bisecting
+    on its key, so no per-position bookkeeping is needed: moving a link only
+    gives that link a new key between its new neighbours.
+    """
+
+    def __init__(self, links=()):
+        self._slots: List[Link] = [Link.from_dict(link) for link in links]
+        self._index: Dict[str, Link] = {}
+        self._assign_keys()
+        self._reindex()
+
+    def _assign_keys(self):
+        """Give links without a usable order key one that keeps the current order
+
+        Keys from the file are kept while they ascend in file order; if they
+        do not (the file was reordered by hand), every key is reassigned.
+        """
+        slots = self._slots
+        previous = None
+        missing = []
+        for pos, link in enumerate(slots):
+            key = link.order
+            if key is not None:
+                try:
+                    order_keys.validate(key)
+                except ValueError:
+                    key = None
+            if key is None:
+                missing.append(pos)
+                continue
+            if previous is not None and key <= previous:
+                for link, key in zip(slots, order_keys.keys_between(None, None, len(slots))):
+                    link.order = key
+                return
+            if missing:
+                self._fill_keys(missing, previous, key)
+                missing = []
+            previous = key
+        if missing:
+            self._fill_keys(missing, previous, None)
+
+    def _fill_keys(self, positions, after, before):
+        for pos, key in zip(positions, order_keys.keys_between(after, before, len(positions))):
+            self._slots[pos].order = key
+
+    def _reindex(self):
+        """Rebuild the ID index; the first link wins when IDs repeat"""
+        self._index = {}
+        for link in self._slots:
+            self._index.setdefault(link.id, link)
+
+    def _position(self, link) -> int:
+        """Slot of ``link``, found by its (unique) order key"""
+        return bisect.bisect_left(self._slots, link.order, key=attrgetter('order'))
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __iter__(self):
+        return iter(self._slots)
+
+    def __contains__(self, id):
+        return id in self._index
+
+    def __getitem__(self, pos):
+        return self._slots[pos]
+
+    def __repr__(self):
+        return f"LinkCollection({self.to_list()!r})"
+
+    def get(self, id) -> Optional['Link']:
+        """Return the link with the given ID, or None"""
+        return self._index.get(id)
+
+    def ids(self) -> List[str]:
+        """Return link IDs in display order"""
+        return [link['id'] for link in self]
+
+    def append(self, link):
+        """Append a link (a Link or a link dict) at the end of the collection
+
+        The link keeps its order key if it sorts after every other link
+        (as when a journaled ``add`` is replayed); otherwise it gets a new one.
+        """
+        if not isinstance(link, Link):
+            link = Link.from_dict(link)
+        last_key = self._slots[-1].order if self._slots else None
+        if link.order is None or (last_key is not None and link.order <= last_key):
+            link.order = order_keys.key_between(last_key, None)
+        self._index.setdefault(link['id'], link)
+        self._slots.append(link)
+
+    def remove(self, id) -> Optional['Link']:
+        """Remove the link with the given ID and return it, or None"""
+        link = self._index.pop(id, None)
+        if link is None:
+            return None
+        del self._slots[self._position(link)]
+        if len(self._index) != len(self._slots):
+            # Another link shares this ID; let it take over the index entry
+            self._reindex()
+        return link
+
+    def reorder(self, id_list) -> bool:
+        """Reorder links to follow ``id_list``; returns False unless it lists every ID exactly once
+
+        Every link gets a fresh order key.
+        """
+        index = self._index
+        if (len(id_list) != len(self._slots) or len(set(id_list)) != len(id_list)
+                or any(id not in index for id in id_list)):
+            return False
+        self._slots = [index[id] for id in id_list]
+        for link, key in zip(self._slots, order_keys.keys_between(None, None, len(self._slots))):
+            link.order = key
+        self._reindex()
+        return True
+
+    def key_for(self, id, before=None, after=None) -> Optional[str]:
+        """Order key that puts link ``id`` right before link ``before`` or right after ``after``
+
+        Returns None if any of the IDs is unknown.
+        """
+        link = self.get(id)
+        target = self.get(before if before is not None else after)
+        if link is None or target is None or target is link:
+            return None
+        slots = self._slots
+        pos = self._position(target)
+        if before is not None:
+            lower = slots[pos - 1] if pos > 0 else None
+            if lower is link:
+                return link.order  # already there
+            upper = target
+        else:
+            upper = slots[pos + 1] if pos + 1 < len(slots) else None
+            if upper is link:
+                return link.order
+            lower = target
+        return order_keys.key_between(lower.order if lower is not None else None,
+                                      upper.order if upper is not None else None)
+
+    def move_to_key(self, id, key) -> bool:
+        """Give a link a new order key and move it to match; returns False if the ID is unknown
+
+        Raises ValueError for a malformed key or one another link already has.
+        """
+        link = self.get(id)
+        if link is None:
+            return False
+        order_keys.validate(key)
+        slots = self._slots
+        target = bisect.bisect_left(slots, key, key=attrgetter('order'))
+        if target < len(slots) and slots[target].order == key and slots[target] is not link:
+            raise ValueError(f"order key {key!r} is already used by {slots[target].id!r}")
+        current = self._position(link)
+        del slots[current]
+        link.order = key
+        slots.insert(target - 1 if current < target else target, link)
+        return True
+
+    def move(self, id, position) -> bool:
+        """Move a link to ``position`` in display order; returns False if the ID is unknown"""
+        link = self.get(id)
+        if link is None:
+            return False
+        slots = self._slots
+        current = self._position(link)
+        if position == current:
+            return True
+
+        def neighbour(i):
+            # Slot i of the order without the moved link
+            if not 0 <= i < len(slots) - 1:
+                return None
+            return slots[i if i < current else i + 1].order
+
+        return self.move_to_key(id, order_keys.key_between(neighbour(position - 1),
+                                                           neighbour(position)))
+
+    def to_list(self) -> List[Dict]:
+        """Return the links as a plain list of dicts (for JSON and templates)"""
+        return [link.to_dict() for link in self]
+
+
+def content_hash(data) -> str:
+    """Return a stable SHA-256 hex digest of a JSON-serializable value"""
+    payload = json.dumps(data, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def darken_hex(color, factor=HOVER_DARKEN_FACTOR) -> str:
+    """Darken a ``#rgb`` or ``#rrggbb`` colour by multiplying each channel by ``factor``"""
+    digits = color.lstrip('#')
+    if len(digits) == 3:
+        digits = ''.join(c * 2 for c in digits)
+    channels = (int(digits[i:i + 2], 16) for i in (0, 2, 4))
+    return '#' + ''.join(f"{min(255, round(c * factor)):02x}" for c in channels)
+
+
+# Compiled stylesheets keyed by theme hash, shared by every manager in the process
+_STYLESHEET_CACHE: Dict[str, str] = {}
+
+
+def compile_stylesheet(theme) -> str:
+    """Return the page CSS for ``theme``, compiling it only once per distinct theme"""
+    key = content_hash(theme)
+    css = _STYLESHEET_CACHE.get(key)
+    if css is None:
+        values = dict(theme)
+        for style in ('primary', 'secondary', 'tertiary', 'highlight'):
+            values[f"{style}_hover"] = darken_hex(theme[f"{style}_color"])
+        css = STYLESHEET_TEMPLATE.substitute(values)
+        _STYLESHEET_CACHE[key] = css
+    return css
+
+
+@lru_cache(maxsize=65536)
+def platform_for_host(host) -> Optional[str]:
+    """Return the platform ID for a hostname, matching it or any parent domain"""
+    labels = host.lower().rstrip('.').split('.')
+    # Try "m.facebook.com", then "facebook.com"; a bare TLD never matches
+    for i in range(len(labels) - 1):
+        platform_id = PLATFORM_HOSTS.get('.'.join(labels[i:]))
+        if platform_id is not None:
+            return platform_id
+    return None
+
+
+def detect_platform(url) -> Optional[str]:
+    """Return the platform ID for a URL based on its hostname, or None"""
+    url = url.strip()
+    if '//' not in url:
+        # Scheme-less input such as "discord.gg/abc"
+        url = '//' + url
+    try:
+        host = urlsplit(url).hostname
+    except ValueError:
+        return None
+    return platform_for_host(host) if host else None
+
+
+def register_platform(platform_id, name, icon_path, domains, icon_type="image"):
+    """Add (or replace) a social platform and index its domains for detection"""
+    SOCIAL_MEDIA_PLATFORMS[platform_id] = {
+        "name": name,
+        "icon_path": icon_path,
+        "icon_type": icon_type,
+        "domains": list(domains),
+    }
+    for domain in domains:
+        PLATFORM_HOSTS[domain.lower()] = platform_id
+    platform_for_host.cache_clear()
+
+
+_CSS_COMMENT_RE = re.compile(r'/\*.*?\*/', re.S)
+_CSS_PUNCT_RE = re.compile(r'\s*([{};,>])\s*')
+_CSS_COLON_RE = re.compile(r':\s+')
+_HTML_COMMENT_RE = re.compile(r'<!--.*?-->', re.S)
+_STYLE_BLOCK_RE = re.compile(r'(<style>)(.*?)(</style>)', re.S)
+_BETWEEN_TAGS_RE = re.compile(r'>\s+<')
+_SELF_CLOSE_RE = re.compile(r'\s+/>')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def minify_css(css) -> str:
+    """Strip comments and insignificant whitespace from a stylesheet"""
+    css = _CSS_COMMENT_RE.sub('', css)
+    css = _WHITESPACE_RE.sub(' ', css)
+    css = _CSS_PUNCT_RE.sub(r'\1', css)
+    css = _CSS_COLON_RE.sub(':', css)
+    return css.replace(';}', '}').strip()
+
+
+def minify_html(html) -> str:
+    """Minify the generated page: inline CSS, comments, SVG and whitespace between tags"""
+    html = _HTML_COMMENT_RE.sub('', html)
+    html = _STYLE_BLOCK_RE.sub(lambda m: m.group(1) + minify_css(m.group(2)) + m.group(3), html)
+    html = _WHITESPACE_RE.sub(' ', html)
+    html = _BETWEEN_TAGS_RE.sub('><', html)
+    html = _SELF_CLOSE_RE.sub('/>', html)
+    return html.strip()
+
+
+@contextmanager
+def file_lock(lock_path, timeout=LOCK_TIMEOUT):
+    """Hold an exclusive advisory lock on ``lock_path``; yields the seconds spent waiting"""
+    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+    start = time.perf_counter()
+    try:
+        while True:
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                else:
+                    msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+                break
+            except OSError:
+                if time.perf_counter() - start >= timeout:
+                    raise TimeoutError(f"could not lock {lock_path} within {timeout}s")
+                time.sleep(0.005)
+        try:
+            yield time.perf_counter() - start
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    finally:
+        os.close(fd)
+
+
+def atomic_write(path, data: bytes):
+    """Replace ``path`` with ``data`` so readers see either the old or the new file
+
+    The data goes to a temp file that is fsynced and renamed over ``path``;
+    the directory is fsynced too so the rename survives a crash. If writing
+    fails, the temp file is removed and ``path`` is left as it was.
+    """
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    if fcntl is not None:
+        dir_fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+class BuildCache:
+    """Content-addressed cache of rendered page fragments
+
+    Stores the rendered head and footer keyed by a hash of the config block,
+    one fragment per link keyed by a hash of the link dict, and the hash of
+    the last output written so unchanged builds can skip the disk write.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.config_key = None
+        self.head = None
+        self.footer = None
+        self.fragments: Dict[str, str] = {}
+        self.output_hash = None
+        self.output_stat = None
+        self.load()
+
+    def load(self):
+        """Load the cache from disk; a missing or unreadable cache starts empty"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') != BUILD_CACHE_VERSION:
+            return
+        self.config_key = data.get('config_key')
+        self.head = data.get('head')
+        self.footer = data.get('footer')
+        self.fragments = data.get('fragments', {})
+        self.output_hash = data.get('output_hash')
+        self.output_stat = data.get('output_stat')
+
+    def save(self):
+        """Write the cache next to the output file, replacing it atomically"""
+        data = {
+            'version': BUILD_CACHE_VERSION,
+            'config_key': self.config_key,
+            'head': self.head,
+            'footer': self.footer,
+            'fragments': self.fragments,
+            'output_hash': self.output_hash,
+            'output_stat': self.output_stat,
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+
+    def output_matches(self, output_file, digest) -> bool:
+        """Check whether ``output_file`` on disk already has content hash ``digest``"""
+        try:
+            st = os.stat(output_file)
+        except OSError:
+            return False
+        if self.output_hash == digest and self.output_stat == [st.st_size, st.st_mtime_ns]:
+            return True
+        with open(output_file, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest() == digest
+
+    def record_output(self, output_file, digest):
+        """Remember the hash and stat of the output file as it is now on disk"""
+        st = os.stat(output_file)
+        self.output_hash = digest
+        self.output_stat = [st.st_size, st.st_mtime_ns]
+
+
+class ConfigConflictError(RuntimeError):
+    """The config file changed on disk since this manager loaded or saved it"""
+
+
+class BatchError(ValueError):
+    """A batch operation failed validation; nothing from the batch was applied"""
+
+    def __init__(self, index, operation, message):
+        super().__init__(f"operation {index} ({operation.get('op')!r}): {message}")
+        self.index = index
+        self.operation = operation
+
+
+class LinkTreeManager:
+    """Manager for a Linktr.ee style page"""
+    
+    def __init__(self, config_file="linktree_config.json", strict=False, verbose=True,
+                 journal=False, journal_threshold=None,
+                 storage=None, metrics=None):
+        self.config_file = config_file
+        self.strict = strict
+        self.verbose = verbose
+        # Optional storage backend (e.g. sqlite_storage.SQLiteStorage) replacing the JSON file
+        self.storage = storage
+        # Journaled storage: saves append the pending mutations to a journal
+        self.journal = journal
+        if journal_threshold is None:
+            import config_journal
+            journal_threshold = config_journal.JOURNAL_COMPACT_BYTES
+        self.journal_threshold = journal_threshold
+        self._pending: List[Dict] = []
+        self._compactor = None
+        # Revision stamp of the config as loaded/saved, and the on-disk state
+        # ((inode, mtime, size), sha256) it corresponds to
+        self.revision = 0
+        self._disk_state = None
+        # Time spent waiting for the config file lock
+        self.lock_wait = 0.0
+        self.lock_wait_total = 0.0
+        # Timing spans and counters (see instrumentation.py); a no-op by default
+        self.metrics = instrumentation.DISABLED if metrics is None else metrics
+        self.config = copy.deepcopy(CONFIG)
+        self.links = LinkCollection()
+        self._icons = None
+        # Publish/expire timeline of the enabled links, built on first use
+        self._timeline: Optional[link_schedule.Timeline] = None
+        # Search index of the visible links and the time until which it stays valid
+        self._search: Optional[Tuple[search_index.SearchIndex, Optional[float]]] = None
+        # Search box markup for the page being built (empty unless search_index is on)
+        self._search_markup = ""
+        self.load_config()
 
-            .link.secondary .badge {{
-                border-color: {self.config['theme']['secondary_color']};
-            }}
+    def _links_changed(self):
+        """Drop state derived from the links (timeline, search index)"""
+        self._timeline = None
+        self._search = None
 
-            .link.tertiary .badge {{
-                border-color: {self.config['theme']['tertiary_color']};
-            }}
+    def _log(self, message):
+        """Print a progress message unless the manager is running quietly"""
+        if self.verbose:
+            print(message)
 
-            .link.highlight .badge {{
-                border-color: {self.config['theme']['highlight_color']};
-            }}
-        </style>
+    def _record(self, operation):
+        """Queue a mutation for the journal or storage backend (no-op otherwise)"""
+        if self.journal or self.storage is not None:
+            self._pending.append(operation)
+
+    @property
+    def links(self) -> LinkCollection:
+        """Links indexed by ID; plain lists assigned here are wrapped"""
+        return self._links
+
+    @links.setter
+    def links(self, links):
+        self._links = links if isinstance(links, LinkCollection) else LinkCollection(links)
+        self._links_changed()
+        
+    def _read_config_file(self):
+        """Parse the config file and remember its revision and on-disk state"""
+        import config_validation
+
+        with open(self.config_file, 'rb') as f:
+            st = os.fstat(f.fileno())
+            raw = f.read()
+        with self.metrics.span("parse"):
+            data = json.loads(raw)
+        with self.metrics.span("validate"):
+            problems = config_validation.validate_config(data, LINK_STYLES, CONFIG)
+        if problems:
+            raise config_validation.ConfigValidationError(self.config_file, problems)
+        self.config.update(data.get('config', {}))
+        with self.metrics.span("links"):
+            self.links = data.get('links', DEFAULT_LINKS)
+        self.revision = data.get('revision', 0)
+        self._disk_state = ((st.st_ino, st.st_mtime_ns, st.st_size), hashlib.sha256(raw).hexdigest())
+        # Journal records are replayed whether or not this manager journals
+        # its own saves, so every manager sees the latest state
+        self._replay_journal()
+
+    def _replay_journal(self):
+        """Apply journal records newer than the snapshot, oldest first"""
+        import config_journal
+
+        for path in (config_journal.compacting_path(self.config_file),
+                     config_journal.journal_path(self.config_file)):
+            for record in config_journal.iter_records(path, self.revision):
+                config_journal.apply_record(self.config, self.links, record)
+                self.revision = record['rev']
+        self._links_changed()
+
+    def load_config(self):
+        """Load configuration from file if exists, otherwise use default"""
+        with self.metrics.span("load"):
+            if self.storage is not None:
+                if not self.storage.load(self):
+                    self._log("Storage is empty. Using default configuration.")
+                    self.links = DEFAULT_LINKS
+            elif self.strict:
+                self._read_config_file()
+            elif os.path.exists(self.config_file):
+                try:
+                    self._read_config_file()
+                except Exception as e:
+                    self._log(f"Error loading config file: {e}")
+                    self._log("Using default configuration instead.")
+                    self.links = DEFAULT_LINKS
+            else:
+                self._log("No config file found. Using default configuration.")
+                self.links = DEFAULT_LINKS
+
+    def _changed_revision(self):
+        """Return the on-disk revision if the file changed since we last read or wrote it
+
+        Returns None when the file is unchanged, missing or unreadable (a
+        corrupt file has nothing worth protecting).
+        """
+        try:
+            st = os.stat(self.config_file)
+        except FileNotFoundError:
+            return None
+        if self._disk_state and self._disk_state[0] == (st.st_ino, st.st_mtime_ns, st.st_size):
+            return None
+        with open(self.config_file, 'rb') as f:
+            raw = f.read()
+        if self._disk_state and self._disk_state[1] == hashlib.sha256(raw).hexdigest():
+            return None
+        try:
+            return json.loads(raw).get('revision', 0)
+        except (ValueError, AttributeError):
+            return None
+
+    def _write_config(self, force=False):
+        """Atomically write config and links under the config lock
+
+        Unless ``force`` is set, the save is refused with ConfigConflictError
+        when the file on disk is newer than what this manager loaded. Each
+        successful save bumps ``revision``.
+        """
+        import config_journal
+
+        with file_lock(f"{self.config_file}.lock") as waited:
+            self.lock_wait = waited
+            self.lock_wait_total += waited
+            disk_revision = self._changed_revision()
+            # Journal records newer than what we loaded are unsaved-by-us changes too
+            journal_revision = config_journal.head_revision(self.config_file)
+            if journal_revision > self.revision and disk_revision is None:
+                disk_revision = journal_revision
+            if disk_revision is not None and not force:
+                raise ConfigConflictError(
+                    f"{self.config_file} was modified by someone else (revision {disk_revision} "
+                    f"on disk, {self.revision} loaded); reload it or save with force=True"
+                )
+            # The new snapshot supersedes every journal record written so far
+            revision = max(self.revision, disk_revision or 0, journal_revision) + 1
+            data = {
+                'revision': revision,
+                'config': self.config,
+                'links': self.links.to_list()
+            }
+            raw = json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+            atomic_write(self.config_file, raw)
+            st = os.stat(self.config_file)
+            self.revision = revision
+            self._disk_state = ((st.st_ino, st.st_mtime_ns, st.st_size), hashlib.sha256(raw).hexdigest())
+
+    def _append_journal(self, force=False):
+        """Append pending mutations to the journal under the config lock
+
+        Write cost is proportional to the number of pending changes. Once the
+        journal grows past ``journal_threshold`` it is compacted in the
+        background.
+        """
+        import config_journal
+
+        with file_lock(f"{self.config_file}.lock") as waited:
+            self.lock_wait = waited
+            self.lock_wait_total += waited
+            head = config_journal.head_revision(self.config_file)
+            if head != self.revision and not force:
+                raise ConfigConflictError(
+                    f"{self.config_file} was modified by someone else (revision {head} "
+                    f"on disk, {self.revision} loaded); reload it or save with force=True"
+                )
+            revision = max(self.revision, head)
+            records = []
+            for operation in self._pending:
+                revision += 1
+                records.append({'rev': revision, **operation})
+            path = config_journal.journal_path(self.config_file)
+            size = config_journal.append_records(path, records) if records else 0
+            self.revision = revision
+            self._pending.clear()
+
+            compacting = config_journal.compacting_path(self.config_file)
+            if size > self.journal_threshold and not os.path.exists(compacting):
+                import threading
+
+                # Rotate under the lock; new records go to a fresh journal
+                os.replace(path, compacting)
+                self._compactor = threading.Thread(target=compact_journal,
+                                                   args=(self.config_file,), daemon=False)
+                self._compactor.start()
+
+    def wait_for_compaction(self):
+        """Block until a background journal compaction (if any) has finished"""
+        if self._compactor is not None:
+            self._compactor.join()
+            self._compactor = None
+
+    def save_config(self, force=False):
+        """Save current configuration to file"""
+        with self.metrics.span("save"):
+            if self.storage is not None:
+                self.storage.save(self, force)
+                self._log(f"Configuration saved to {self.storage} (revision {self.revision})")
+                return
+            if self.journal and os.path.exists(self.config_file):
+                self._append_journal(force)
+            else:
+                self._write_config(force)
+                self._pending.clear()
+        self._log(f"Configuration saved to {self.config_file} (revision {self.revision})")
+
+    def add_link(self, title, url, icon="🔗", style="default", badge=None, enabled=True, id=None,
+                 publish_at=None, expire_at=None):
+        """Add a new link to the list"""
+        # Try to auto-detect social media
+        social_media = self.auto_detect_social_media(url)
+
+        if social_media and id is None:
+            # Use the detected platform ID
+            id = social_media["id"]
+            if not title or title == "":
+                title = social_media["title"]
+
+        if id is None:
+            # Generate an ID from the title
+            id = re.sub(r'[^a-z0-9]', '', title.lower())
+
+        # Check if ID already exists
+        if id in self.links:
+            id = f"{id}_{len(self.links)}"
+
+        new_link = Link(title, url, icon, style, badge, enabled, id,
+                        publish_at=publish_at, expire_at=expire_at)
+        self._check_link(new_link)
+
+        self.links.append(new_link)
+        self._links_changed()
+        self._record({'op': 'add', 'link': new_link.to_dict()})
+        self._log(f"Added new link: {title}")
+        return id
+    
+    def update_link(self, id, **kwargs):
+        """Update an existing link by ID"""
+        if 'order' in kwargs:
+            raise KeyError("'order' cannot be updated; use move_link")
+        link = self.links.get(id)
+        if link is None:
+            self._log(f"Link with ID '{id}' not found")
+            return False
+        updated = link.copy()
+        updated.update(kwargs)
+        self._check_link(updated)
+        link.update(kwargs)
+        self._links_changed()
+        self._record({'op': 'update', 'id': id, 'fields': kwargs})
+        self._log(f"Updated link: {link['title']}")
+        return True
+    
+    def _check_link(self, link):
+        """Raise ConfigValidationError unless ``link`` would pass load-time validation"""
+        import config_validation
+
+        problems = config_validation.validate_link(link.to_dict(), LINK_STYLES)
+        if problems:
+            raise config_validation.ConfigValidationError(f"link {link.id!r}", problems)
+
+    def _check_settings(self, config):
+        """Raise ConfigValidationError unless ``config`` would pass load-time validation"""
+        import config_validation
+
+        problems = config_validation.validate_settings(config, CONFIG)
+        if problems:
+            raise config_validation.ConfigValidationError("config", problems)
+
+    def disable_link(self, id):
+        """Disable a link by ID"""
+        return self.update_link(id, enabled=False)
+    
+    def enable_link(self, id):
+        """Enable a link by ID"""
+        return self.update_link(id, enabled=True)
+    
+    def delete_link(self, id):
+        """Delete a link by ID"""
+        if self.links.remove(id) is None:
+            self._log(f"Link with ID '{id}' not found")
+            return False
+        self._links_changed()
+        self._record({'op': 'delete', 'id': id})
+        self._log(f"Deleted link with ID: {id}")
+        return True
+    
+    def reorder_links(self, id_list):
+        """Reorder links based on a list of IDs"""
+        if len(id_list) != len(self.links):
+            self._log("Error: Number of IDs does not match number of links")
+            return False
+            
+        # Check if all IDs exist, each listed once
+        seen = set()
+        for id in id_list:
+            if id not in self.links:
+                self._log(f"Error: ID '{id}' not found")
+                return False
+            if id in seen:
+                self._log(f"Error: ID '{id}' is listed more than once")
+                return False
+            seen.add(id)
+
+        self.links.reorder(id_list)
+        self._links_changed()
+        self._record({'op': 'reorder', 'ids': list(id_list)})
+        self._log("Links reordered successfully")
+        return True
+
+    def move_link(self, id, before=None, after=None):
+        """Move one link right before the link ``before`` or right after the link ``after``"""
+        if (before is None) == (after is None):
+            self._log("Error: give exactly one of before or after")
+            return False
+        key = self.links.key_for(id, before=before, after=after)
+        if key is None:
+            self._log(f"Error: cannot move '{id}' next to '{before if before is not None else after}'")
+            return False
+        self.links.move_to_key(id, key)
+        self._links_changed()
+        self._record({'op': 'move', 'id': id, 'order': key})
+        self._log(f"Moved link: {id}")
+        return True
+    
+    def _apply_operation(self, index, operation):
+        """Validate and apply a single batch operation, returning the affected ID"""
+        import config_validation
+        import link_schedule
+
+        def fail(message):
+            raise BatchError(index, operation, message)
+
+        kind = operation.get('op')
+        fields = {key: value for key, value in operation.items() if key != 'op'}
+
+        if kind in ('add', 'update'):
+            unknown = set(fields) - set(LINK_FIELDS)
+            if unknown:
+                fail(f"unknown link fields: {', '.join(sorted(unknown))}")
+            if 'style' in fields and fields['style'] not in LINK_STYLES:
+                fail(f"invalid style {fields['style']!r}")
+            if 'enabled' in fields and not isinstance(fields['enabled'], bool):
+                fail("'enabled' must be true or false")
+            if 'order' in fields:
+                fail("'order' is set by move operations")
+            for key in ('title', 'url'):
+                if key in fields and not isinstance(fields[key], str):
+                    fail(f"'{key}' must be a string")
+            for key in ('icon', 'badge'):
+                if fields.get(key) is not None and not isinstance(fields[key], str):
+                    fail(f"'{key}' must be a string or null")
+            if fields.get('id') is not None and (not isinstance(fields['id'], str) or not fields['id']):
+                fail("'id' must be a non-empty string")
+            # Same rule as load-time validation, so a saved batch always loads again
+            if 'url' in fields and not config_validation.URL_RE.fullmatch(fields['url']):
+                fail(f"'url' must be an http(s), mailto: or tel: URL, got {fields['url']!r}")
+            # An added link may leave the title empty to take the platform name
+            if kind == 'update' and 'title' in fields and not fields['title'].strip():
+                fail("'title' must not be empty")
+            for key in link_schedule.SCHEDULE_FIELDS:
+                try:
+                    link_schedule.parse_time(fields.get(key))
+                except ValueError:
+                    fail(f"'{key}' must be an ISO 8601 date/time or null")
+
+        if kind == 'add':
+            if 'url' not in fields:
+                fail("'url' is required")
+            if fields.get('id') is not None and fields['id'] in self.links:
+                fail(f"link ID {fields['id']!r} already exists")
+            fields.setdefault('title', '')
+            if not fields['title'] and detect_platform(fields['url']) is None:
+                fail("'title' is required unless the URL is a known social platform")
+            return self.add_link(**fields)
+
+        if kind != 'theme' and kind != 'config' and fields.get('id') not in self.links:
+            fail(f"link ID {fields.get('id')!r} not found")
+
+        if kind == 'update':
+            id = fields.pop('id')
+            if not fields:
+                fail("nothing to update")
+            self.update_link(id, **fields)
+            return id
+        elif kind == 'delete':
+            self.delete_link(fields['id'])
+            return fields['id']
+        elif kind == 'move':
+            targets = [key for key in ('before', 'after') if key in fields]
+            if targets:
+                if len(targets) > 1 or 'position' in fields:
+                    fail("give only one of 'before', 'after' or 'position'")
+                target = fields[targets[0]]
+                if target not in self.links or target == fields['id']:
+                    fail(f"'{targets[0]}' must be the ID of another link")
+                self.move_link(fields['id'], **{targets[0]: target})
+                return fields['id']
+            position = fields.get('position')
+            if not isinstance(position, int) or not 0 <= position < len(self.links):
+                fail(f"'position' must be an integer between 0 and {len(self.links) - 1}")
+            self.links.move(fields['id'], position)
+            self._links_changed()
+            self._record({'op': 'move', 'id': fields['id'], 'order': self.links.get(fields['id']).order})
+            return fields['id']
+        elif kind == 'toggle':
+            link = self.links.get(fields['id'])
+            enabled = fields.get('enabled', not link['enabled'])
+            if not isinstance(enabled, bool):
+                fail("'enabled' must be true or false")
+            self.update_link(fields['id'], enabled=enabled)
+            return fields['id']
+        elif kind == 'theme':
+            for key, value in fields.items():
+                if key not in self.config['theme']:
+                    fail(f"unknown theme color {key!r}")
+                if not isinstance(value, str) or not config_validation.HEX_COLOR_RE.match(value):
+                    fail(f"invalid hex color {value!r} for {key}")
+            self.update_theme(**fields)
+            return None
+        elif kind == 'config':
+            for key in fields:
+                if key not in self.config or key == 'theme':
+                    fail(f"unknown config key {key!r}")
+            try:
+                self.update_config(**fields)
+            except config_validation.ConfigValidationError as e:
+                fail("; ".join(f"{path} {message}" for path, message in e.errors))
+            return None
+        fail("unknown operation")
+
+    def apply_batch(self, operations, save=True, rebuild=False):
+        """Apply many operations as one transaction, saving once"""
+        saved_config = copy.deepcopy(self.config)
+        saved_links = self.links
+        saved_verbose = self.verbose
+        saved_pending = len(self._pending)
+        self.links = LinkCollection(saved_links)
+        self.verbose = False
+        try:
+            try:
+                results = [self._apply_operation(index, operation)
+                           for index, operation in enumerate(operations)]
+                if save:
+                    self.save_config()
+            except Exception:
+                self.config = saved_config
+                self.links = saved_links
+                del self._pending[saved_pending:]
+                raise
+            if rebuild:
+                self.generate_html(incremental=True)
+        finally:
+            self.verbose = saved_verbose
+        return results
+
+    def get_link_ids(self):
+        """Return a list of all link IDs with their titles"""
+        return [(link['id'], link['title']) for link in self.links]
+    
+    def update_theme(self, **kwargs):
+        """Update theme colors"""
+        fields = {key: value for key, value in kwargs.items() if key in self.config['theme']}
+        self._check_settings({'theme': dict(self.config['theme'], **fields)})
+        self.config['theme'].update(fields)
+        self._record({'op': 'theme', 'fields': fields})
+        self._log("Theme updated")
+    
+    def update_config(self, **kwargs):
+        """Update basic configuration"""
+        fields = {key: value for key, value in kwargs.items() if key in self.config and key != 'theme'}
+        self._check_settings(fields)
+        self.config.update(fields)
+        self._record({'op': 'config', 'fields': fields})
+        self._log("Configuration updated")
+
+    def auto_detect_social_media(self, url):
+        """Auto-detect social media platform from URL and set appropriate icon"""
+        platform_id = detect_platform(url)
+        if platform_id is None:
+            return None
+        return {
+            "id": platform_id,
+            "title": SOCIAL_MEDIA_PLATFORMS[platform_id]["name"],
+            "icon": "🔗"  # Default fallback, but we'll use the image
+        }
+
+    def check_links(self, cache_file=None, ttl=None, **options):
+        """Check that every enabled link still resolves; returns ``{link_id: result}``"""
+        import link_checker
+
+        if cache_file is None:
+            cache_file = os.path.join(os.path.dirname(self.config_file), link_checker.DEFAULT_CACHE_FILE)
+        if ttl is None:
+            ttl = link_checker.DEFAULT_TTL
+        enabled = [link for link in self.links if link['enabled']]
+        results = link_checker.check_urls([link['url'] for link in enabled],
+                                          cache_file=cache_file, ttl=ttl, **options)
+
+        report = {}
+        for link in enabled:
+            result = results[link['url']]
+            report[link['id']] = result
+            if not result['ok']:
+                reason = result['error'] or f"HTTP {result['status']}"
+                self._log(f"Broken link '{link['id']}': {link['url']} ({reason})")
+        broken = sum(1 for result in report.values() if not result['ok'])
+        skipped = sum(1 for result in report.values() if result.get('skipped'))
+        self._log(f"Checked {len(report) - skipped} links, {broken} broken, {skipped} skipped")
+        return report
+
+    def _icon_attrs(self):
+        """Map platform IDs to the src/srcset of their icons for the current build
+
+        With ``optimize_icons`` enabled the icons go through the asset pipeline
+        (right-sized, inlined or fingerprinted); otherwise, or if an icon cannot
+        be processed, the original ``icon_path`` is used.
+        """
+        if self._icons is None:
+            output_dir = os.path.dirname(self.config['output_file'])
+            icons = {}
+            with self.metrics.span("icons"):
+                for platform_id, platform in SOCIAL_MEDIA_PLATFORMS.items():
+                    asset = None
+                    if self.config.get('optimize_icons'):
+                        from icon_assets import publish_icon
+                        asset = publish_icon(platform['icon_path'], output_dir)
+                    icons[platform_id] = asset or {'src': platform['icon_path'], 'srcset': None}
+            self._icons = icons
+        return self._icons
+
+    def _render_head(self):
+        """Render everything up to and including the opening of the links list"""
+        with self.metrics.span("css"):
+            stylesheet = compile_stylesheet(self.config['theme'])
+        return f"""<!DOCTYPE html>
+    <html lang="es">
+    <head>
+        <meta charset="UTF-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+        <title>{self.config['logo_text']}</title>
+        <link href="https://fonts.googleapis.com/css2?family=Poppins:wght@400;600&display=swap" rel="stylesheet">
+        <style>
+{stylesheet}        </style>
     </head>
     <body>
         <!-- Snake decoration -->
@@ -617,26 +1675,27 @@ class LinkTreeManager:
             <div class="links">
     """
 
-        # Add each enabled link
-        for link in self.links:
-            if link['enabled']:
-                # Add class based on style
-                style_class = f" {link['style']}" if link['style'] != "default" else ""
-
-                # Add badge if exists
-                badge_html = f'<span class="badge">{link["badge"]}</span>' if link['badge'] else ''
-
-                # Check if this is a known social media platform
-                platform_id = link['id'].lower()
-                if platform_id in SOCIAL_MEDIA_PLATFORMS:
-                    # Use the platform-specific image icon
-                    platform = SOCIAL_MEDIA_PLATFORMS[platform_id]
-                    icon_html = f'<div class="social-icon"><img src="{platform["icon_path"]}" alt="{platform["name"]}" /></div>'
-                else:
-                    # Use the emoji icon
-                    icon_html = f'<div class="link-icon">{link["icon"]}</div>'
+    def _render_link(self, link):
+        """Render the HTML fragment for a single link"""
+        # Add class based on style
+        style_class = f" {link['style']}" if link['style'] != "default" else ""
+
+        # Add badge if exists
+        badge_html = f'<span class="badge">{link["badge"]}</span>' if link['badge'] else ''
 
-                html += f"""            <a href="{link['url']}" class="link{style_class}" id="{link['id']}">
+        # Check if this is a known social media platform
+        platform_id = link['id'].lower()
+        if platform_id in SOCIAL_MEDIA_PLATFORMS:
+            # Use the platform-specific image icon
+            platform = SOCIAL_MEDIA_PLATFORMS[platform_id]
+            icon = self._icon_attrs()[platform_id]
+            srcset = f' srcset="{icon["srcset"]}"' if icon['srcset'] else ''
+            icon_html = f'<div class="social-icon"><img src="{icon["src"]}"{srcset} alt="{platform["name"]}" /></div>'
+        else:
+            # Use the emoji icon
+            icon_html = f'<div class="link-icon">{link["icon"]}</div>'
+
+        return f"""            <a href="{link['url']}" class="link{style_class}" id="{link['id']}">
                         <div class="link-content">
                             {icon_html}
                             {link['title']}
@@ -645,34 +1704,315 @@ class LinkTreeManager:
                     </a>
 
         """
-        
-        # Close HTML
-        html += f"""        </div>
+
+    def _render_footer(self, extra=""):
+        """Render the closing of the links list, the footer and the document end
+
+        ``extra`` markup (e.g. the lazy-loading script) and the search box, if
+        enabled, go right before ``</body>``.
+        """
+        extra += self._search_markup
+        return f"""        </div>
         
         <div class="footer">
             {self.config['footer']}
         </div>
     </div>
-</body>
+{extra}</body>
 </html>"""
-        
-        # Write to file
-        with open(self.config['output_file'], 'w', encoding='utf-8') as f:
+
+    def timeline(self) -> 'link_schedule.Timeline':
+        """Publish/expire timeline of the enabled links, rebuilt after changes"""
+        if self._timeline is None:
+            import link_schedule
+
+            self._timeline = link_schedule.Timeline(link for link in self.links if link['enabled'])
+        return self._timeline
+
+    def next_transition(self, now=None) -> Optional[float]:
+        """POSIX time at which a scheduled link next appears or disappears, or None"""
+        return self.timeline().next_transition(time.time() if now is None else now)
+
+    def _search_index(self, now=None, links=None) -> 'search_index.SearchIndex':
+        """Search index of the links visible at ``now``, reused until links or visibility change
+
+        ``links`` indexes those links (e.g. a stream) instead, without caching.
+        """
+        import search_index
+
+        now = time.time() if now is None else now
+        if links is not None:
+            return search_index.SearchIndex.build(self._visible_links(links, now))
+        if self._search is not None:
+            index, valid_until = self._search
+            if valid_until is None or now < valid_until:
+                return index
+        index = search_index.SearchIndex.build(self._visible_links(now=now))
+        self._search = (index, self.next_transition(now))
+        return index
+
+    def search(self, query, limit=None, now=None) -> List[Dict]:
+        """Find visible links whose title, badge or ID words start with every query word"""
+        import search_index
+
+        if limit is None:
+            limit = search_index.DEFAULT_LIMIT
+        return [{'id': id, 'title': title, 'url': url}
+                for id, title, url in self._search_index(now).query(query, limit)]
+
+    def _publish_search_index(self, now=None, links=None):
+        """Write the search index next to the output file and prepare the search box markup"""
+        self._search_markup = ""
+        if not self.config.get('search_index'):
+            return
+        import search_index
+
+        with self.metrics.span("search_index"):
+            name, written = search_index.publish_index(self._search_index(now, links),
+                                                       self.config['output_file'])
+        self.metrics.count("bytes_written", written)
+        self._search_markup = search_index.search_html(name)
+
+    def _visible_links(self, links=None, now=None):
+        """Yield the links to render at ``now``: enabled and inside their schedule window"""
+        import link_schedule
+
+        now = time.time() if now is None else now
+        if links is None:
+            live = self.timeline().active_at(now)
+            for link in self.links:
+                if link.enabled and (link.publish_at is None and link.expire_at is None
+                                     or link.id in live):
+                    yield link
+            return
+        for link in links:
+            if link['enabled'] and (not link_schedule.is_scheduled(link)
+                                    or link_schedule.is_live(link, now)):
+                yield link
+
+    def iter_html(self, links=None, now=None):
+        """Yield the page chunk by chunk: head and CSS, one fragment per visible link, footer"""
+        self._icons = None
+        yield self._render_head()
+        span = self.metrics.span("render_link")
+        rendered = 0
+        for link in self._visible_links(links, now):
+            with span:
+                fragment = self._render_link(link)
+            rendered += 1
+            yield fragment
+        self.metrics.count("links_rendered", rendered)
+        yield self._render_footer()
+
+    def render_html(self, sink, links=None, now=None):
+        """Stream the page into a file-like sink and return the number of characters written"""
+        written = 0
+        span = self.metrics.span("write")
+        for chunk in self.iter_html(links, now):
+            with span:
+                written += sink.write(chunk)
+        return written
+
+    def _build_cache_path(self):
+        """Default build cache location: a hidden file next to the output file"""
+        output_dir, output_name = os.path.split(self.config['output_file'])
+        return os.path.join(output_dir, f".{output_name}.buildcache.json")
+
+    def _generate_incremental(self, cache_file=None, now=None):
+        """Rebuild only changed fragments and skip the write if the output is unchanged"""
+        output_file = self.config['output_file']
+        cache = BuildCache(cache_file or self._build_cache_path())
+        dirty = False
+
+        # Head, footer and every fragment depend on the config, platform map and icons
+        self._icons = None
+        config_key = content_hash([BUILD_CACHE_VERSION, self.config, SOCIAL_MEDIA_PLATFORMS,
+                                   self._icon_attrs()])
+        if cache.config_key != config_key:
+            cache.config_key = config_key
+            cache.head = self._render_head()
+            cache.footer = self._render_footer()
+            cache.fragments = {}
+            dirty = True
+
+        fragments = {}
+        chunks = [cache.head]
+        for link in self._visible_links(now=now):
+            # The order key is not rendered; leaving it out keeps fragments valid across moves
+            data = link.to_dict()
+            data.pop('order', None)
+            key = content_hash(data)
+            fragment = fragments.get(key) or cache.fragments.get(key)
+            if fragment is None:
+                fragment = self._render_link(link)
+                dirty = True
+            fragments[key] = fragment
+            chunks.append(fragment)
+        # The search box names the current (fingerprinted) index, so it is never cached
+        chunks.append(self._render_footer() if self._search_markup else cache.footer)
+        if len(fragments) != len(cache.fragments):
+            dirty = True
+        cache.fragments = fragments
+
+        html = "".join(chunks)
+        digest = hashlib.sha256(html.encode('utf-8')).hexdigest()
+        if cache.output_matches(output_file, digest):
+            self._log(f"{output_file} is up to date, nothing to write")
+        else:
+            with self.metrics.span("write"), open(output_file, 'w', encoding='utf-8') as f:
+                f.write(html)
+            self.metrics.count("bytes_written", os.path.getsize(output_file))
+            self._log(f"HTML generated and saved to {output_file}")
+            dirty = True
+
+        if dirty or cache.output_hash != digest:
+            cache.record_output(output_file, digest)
+            cache.save()
+        return html
+
+    def _generate_optimized(self, now=None):
+        """Write minified HTML plus precompressed siblings and print a size report"""
+        import gzip
+
+        output_file = self.config['output_file']
+        raw = "".join(self.iter_html(now=now))
+        with self.metrics.span("minify"):
+            html = minify_html(raw)
+        data = html.encode('utf-8')
+        with self.metrics.span("write"), open(output_file, 'wb') as f:
+            f.write(data)
+
+        sizes = [("raw", len(raw.encode('utf-8'))), ("minified", len(data))]
+        with self.metrics.span("compress"):
+            compressed = gzip.compress(data, compresslevel=9, mtime=0)
+        with self.metrics.span("write"), open(f"{output_file}.gz", 'wb') as f:
+            f.write(compressed)
+        sizes.append(("gzip", len(compressed)))
+        if brotli is not None:
+            with self.metrics.span("compress"):
+                compressed = brotli.compress(data, quality=11)
+            with self.metrics.span("write"), open(f"{output_file}.br", 'wb') as f:
+                f.write(compressed)
+            sizes.append(("brotli", len(compressed)))
+        self.metrics.count("bytes_written", sum(size for _, size in sizes[1:]))
+
+        self._log(f"Optimized HTML saved to {output_file}")
+        for label, size in sizes:
+            self._log(f"  {label:<9}{size:>9} bytes  ({size / sizes[0][1]:.0%})")
+        return html
+
+    def _generate_paginated(self, now=None):
+        """Write the first screen inline and the remaining links as lazily fetched chunks"""
+        import page_chunks
+
+        output_file = self.config['output_file']
+        self._icons = None
+        head = self._render_head()
+        span = self.metrics.span("render_link")
+        fragments = []
+        for link in self._visible_links(now=now):
+            with span:
+                fragments.append((link['id'], self._render_link(link)))
+        self.metrics.count("links_rendered", len(fragments))
+
+        # Size the first screen against a footer carrying a same-length manifest URL
+        footer = self._render_footer(page_chunks.loader_html(page_chunks.manifest_url(output_file)))
+        base_bytes = len(head.encode('utf-8')) + len(footer.encode('utf-8'))
+        inline = page_chunks.split_inline(fragments, base_bytes, self.config['first_screen_bytes'],
+                                          self.config['inline_links'])
+        chunks = page_chunks.split_chunks(fragments[inline:], self.config['chunk_links'])
+        with self.metrics.span("write"):
+            manifest, written = page_chunks.publish_chunks(chunks, output_file)
+
+        html = "".join([head, *(fragment for _, fragment in fragments[:inline]),
+                        self._render_footer(page_chunks.loader_html(manifest))])
+        with self.metrics.span("write"), open(output_file, 'w', encoding='utf-8') as f:
             f.write(html)
-        
-        print(f"HTML generated and saved to {self.config['output_file']}")
+        self.metrics.count("bytes_written", written + os.path.getsize(output_file))
+        self._log(f"HTML generated and saved to {output_file} "
+                  f"({inline} links inline, {len(fragments) - inline} in {len(chunks)} chunks)")
         return html
 
-def interactive_menu():
+    def generate_html(self, stream=False, incremental=False, cache_file=None, optimize=False,
+                      now=None, paginate=False):
+        """Generate HTML for the Linktr.ee style page"""
+        with self.metrics.span("generate_html"):
+            now = time.time() if now is None else now
+            self._publish_search_index(now)
+
+            if paginate:
+                return self._generate_paginated(now)
+
+            if optimize:
+                return self._generate_optimized(now)
+
+            if incremental:
+                return self._generate_incremental(cache_file, now)
+
+            output_file = self.config['output_file']
+            if stream:
+                with open(output_file, 'w', encoding='utf-8') as f:
+                    self.render_html(f, now=now)
+                self.metrics.count("bytes_written", os.path.getsize(output_file))
+                self._log(f"HTML generated and saved to {output_file}")
+                return None
+
+            html = "".join(self.iter_html(now=now))
+
+            # Write to file
+            with self.metrics.span("write"), open(output_file, 'w', encoding='utf-8') as f:
+                f.write(html)
+            self.metrics.count("bytes_written", os.path.getsize(output_file))
+
+            self._log(f"HTML generated and saved to {output_file}")
+            return html
+
+def compact_journal(config_file):
+    """Fold a rotated journal into a fresh snapshot of ``config_file``
+
+    Runs in a background thread after a save rotates the journal. The
+    snapshot keeps the revision of the last folded record, so replaying a
+    journal left behind by a crash never applies a record twice. If a full
+    save replaces the snapshot while the journal is being folded, the
+    compaction is abandoned rather than overwriting the newer snapshot.
+    """
+    import config_journal
+
+    compacting = config_journal.compacting_path(config_file)
+    snapshot = config_journal.snapshot_revision(config_file)
+    # Loading replays the rotated journal (and anything appended since) on top of the snapshot
+    manager = LinkTreeManager(config_file, strict=True, verbose=False)
+    data = {
+        'revision': manager.revision,
+        'config': manager.config,
+        'links': manager.links.to_list()
+    }
+    raw = json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    with file_lock(f"{config_file}.lock"):
+        current = config_journal.snapshot_revision(config_file)
+        if current != snapshot:
+            # A full save landed meanwhile; it supersedes every rotated record
+            # (saves stamp a revision above the journal head), so only drop them
+            rotated = config_journal.last_revision(compacting)
+            if rotated is None or rotated < current:
+                os.remove(compacting)
+            return
+        atomic_write(config_file, raw)
+        os.remove(compacting)
+
+
+def interactive_menu(config_file="linktree_config.json"):
     """Interactive menu for managing the Linktr.ee page"""
-    manager = LinkTreeManager()
+    from config_validation import HEX_COLOR_RE, ConfigValidationError
+
+    manager = LinkTreeManager(config_file)
     
     while True:
         print("\n===== Pythonistas GDL Linktr.ee Manager =====")
         print("1. View all links")
         print("2. Add new link")
         print("3. Update existing link")
-        print("4. Reorder links")
+        print("4. Move a link")
         print("5. Enable/disable link")
         print("6. Delete link")
         print("7. Update theme colors")
@@ -694,7 +2034,7 @@ def interactive_menu():
             print("\n--- Current Links ---")
             for i, (id, title) in enumerate(manager.get_link_ids()):
                 # Find the link
-                link = next((l for l in manager.links if l['id'] == id), None)
+                link = manager.links.get(id)
                 status = "✅" if link and link['enabled'] else "❌"
                 print(f"{i+1}. [{status}] {title} (ID: {id})")
         
@@ -738,6 +2078,9 @@ def interactive_menu():
                     badge = None
                     
                 manager.add_link(title, url, icon, style, badge)
+            except ConfigValidationError as e:
+                print(e)
+                continue
             except EOFError:
                 print("\nEOF detected. Returning to menu...")
                 continue
@@ -788,32 +2131,32 @@ def interactive_menu():
                     manager.update_link(link_id, title=title, url=url, icon=icon, style=style, badge=badge)
                 else:
                     print("Invalid selection.")
+            except ConfigValidationError as e:
+                print(e)
+                continue
             except (ValueError, EOFError):
                 print("Invalid input or EOF detected. Returning to menu...")
                 continue
         
         elif choice == '4':
-            print("\n--- Reorder Links ---")
+            print("\n--- Move Link ---")
             current_ids = []
             for i, (id, title) in enumerate(manager.get_link_ids()):
                 print(f"{i+1}. {title} (ID: {id})")
                 current_ids.append(id)
-            
-            print("\nEnter the new order as a comma-separated list of numbers.")
-            print("Example: 3,1,2 would move the third item to first, first to second, etc.")
-            
+
             try:
-                order_input = input("New order: ")
-                new_order = [int(x.strip()) for x in order_input.split(',')]
-                
-                # Convert to zero-based and validate
-                new_order = [x-1 for x in new_order]
-                if min(new_order) < 0 or max(new_order) >= len(current_ids):
+                moved = int(input("\nNumber of the link to move: ")) - 1
+                target = input("Move it before which number? (or 'end' to move it last): ").strip()
+                if not 0 <= moved < len(current_ids):
                     print("Invalid input: numbers must be between 1 and", len(current_ids))
+                elif target.lower() == 'end':
+                    if current_ids[-1] != current_ids[moved]:
+                        manager.move_link(current_ids[moved], after=current_ids[-1])
+                elif 0 < int(target) <= len(current_ids):
+                    manager.move_link(current_ids[moved], before=current_ids[int(target) - 1])
                 else:
-                    # Create new ID order
-                    new_id_order = [current_ids[i] for i in new_order]
-                    manager.reorder_links(new_id_order)
+                    print("Invalid input: numbers must be between 1 and", len(current_ids))
             except (ValueError, EOFError):
                 print("Invalid input or EOF detected. Returning to menu...")
                 continue
@@ -822,7 +2165,7 @@ def interactive_menu():
             print("\n--- Enable/Disable Link ---")
             for i, (id, title) in enumerate(manager.get_link_ids()):
                 # Find the link status
-                link = next((l for l in manager.links if l['id'] == id), None)
+                link = manager.links.get(id)
                 status = "Enabled" if link and link['enabled'] else "Disabled"
                 print(f"{i+1}. {title} - {status} (ID: {id})")
             
@@ -877,7 +2220,7 @@ def interactive_menu():
                     
                     new_color = input(f"Enter new {color_key} (hex format, e.g. #FFE566): ")
                     # Simple hex color validation
-                    if re.match(r'^#(?:[0-9a-fA-F]{3}){1,2}$', new_color):
+                    if HEX_COLOR_RE.match(new_color):
                         manager.update_theme(**{color_key: new_color})
                     else:
                         print("Invalid color format. Please use hex format (e.g. #FFE566)")
@@ -925,7 +2268,10 @@ def interactive_menu():
             
         elif choice == '10':
             print("\n--- Saving Configuration ---")
-            manager.save_config()
+            try:
+                manager.save_config()
+            except ConfigConflictError as e:
+                print(f"Not saved: {e}")
         
         else:
             print("Invalid choice. Please try again.")
@@ -937,10 +2283,233 @@ def interactive_menu():
             manager.save_config()
     except EOFError:
         print("\nEOF detected. Saving configuration and exiting...")
-        manager.save_config()
+        try:
+            manager.save_config()
+        except ConfigConflictError as e:
+            print(f"Not saved: {e}")
+    except ConfigConflictError as e:
+        print(f"Not saved: {e}")
     
     print("Thank you for using Pythonistas GDL Linktr.ee Manager!")
 
+
+
+def _empty_to_none(value):
+    """``--badge ''`` and friends clear the field"""
+    return value or None
+
+
+def _build_parser():
+    parser = argparse.ArgumentParser(
+        description="Manage the Pythonistas GDL Linktr.ee page. Without a command the "
+                    "interactive menu starts.")
+    parser.add_argument('--config', default="linktree_config.json",
+                        help="config file (default: linktree_config.json)")
+    parser.add_argument('--journal', action='store_true',
+                        help="append changes to the config journal instead of rewriting the file")
+    parser.add_argument('--json', action='store_true', help="print the result as one JSON object")
+    instrumentation.add_arguments(parser)
+    commands = parser.add_subparsers(dest='command', metavar='command')
+
+    # Every change goes through apply_batch: validated first, then saved once
+    change = argparse.ArgumentParser(add_help=False)
+    change.add_argument('--rebuild', action='store_true',
+                        help="regenerate the HTML (incrementally) after saving")
+
+    build = commands.add_parser('build', help="generate the HTML page")
+    mode = build.add_mutually_exclusive_group()
+    mode.add_argument('--stream', action='store_true',
+                      help="render while reading the config, without loading every link")
+    mode.add_argument('--incremental', action='store_true', help="reuse unchanged fragments")
+    mode.add_argument('--optimize', action='store_true', help="minify and precompress the output")
+    mode.add_argument('--paginate', action='store_true',
+                      help="inline the first screen and lazy-load the rest in chunks")
+
+    # Link fields left out of the command line are left out of the operation
+    add = commands.add_parser('add', parents=[change], argument_default=argparse.SUPPRESS,
+                              help="add a link")
+    add.add_argument('--url', required=True)
+    add.add_argument('--title', help="may be omitted for known social platforms")
+    add.add_argument('--id', help="default: derived from the platform or the title")
+    add.add_argument('--disabled', dest='enabled', action='store_false', help="add the link disabled")
+
+    update = commands.add_parser('update', parents=[change], argument_default=argparse.SUPPRESS,
+                                 help="change fields of a link")
+    update.add_argument('id')
+    update.add_argument('--title')
+    update.add_argument('--url')
+
+    for sub in (add, update):
+        sub.add_argument('--icon')
+        sub.add_argument('--style', choices=LINK_STYLES)
+        sub.add_argument('--badge', type=_empty_to_none, help="'' removes the badge")
+        for field in ('publish_at', 'expire_at'):
+            sub.add_argument(f"--{field.replace('_', '-')}", dest=field, type=_empty_to_none,
+                             metavar='ISO8601', help="'' removes it")
+
+    delete = commands.add_parser('delete', parents=[change], help="delete a link")
+    delete.add_argument('id')
+
+    move = commands.add_parser('move', parents=[change], help="move a link")
+    move.add_argument('id')
+    target = move.add_mutually_exclusive_group(required=True)
+    target.add_argument('--before', metavar='ID', help="put it right before this link")
+    target.add_argument('--after', metavar='ID', help="put it right after this link")
+    target.add_argument('--position', type=int, help="put it at this 0-based position")
+
+    toggle = commands.add_parser('toggle', parents=[change], help="enable or disable a link")
+    toggle.add_argument('id')
+    state = toggle.add_mutually_exclusive_group()
+    state.add_argument('--on', dest='enabled', action='store_const', const=True)
+    state.add_argument('--off', dest='enabled', action='store_const', const=False)
+
+    theme = commands.add_parser('theme', parents=[change], argument_default=argparse.SUPPRESS,
+                                help="change theme colors")
+    for key in CONFIG['theme']:
+        theme.add_argument(f"--{key.replace('_', '-')}", dest=key, metavar='HEX')
+
+    batch = commands.add_parser('batch', parents=[change],
+                                help="apply a JSON list of operations from a file ('-' for stdin)")
+    batch.add_argument('file')
+
+    check = commands.add_parser('check-links',
+                                help="probe every enabled link (exit status 1 if any is broken)")
+    check.add_argument('--ttl', type=float, help="seconds a cached result stays valid (0 re-checks all)")
+    check.add_argument('--timeout', type=float, help="seconds per request")
+    check.add_argument('--concurrency', type=int, help="requests in flight overall")
+
+    bench = commands.add_parser('bench', help="run the benchmark suite (see benchmark.py)")
+    bench.add_argument('--sizes', type=int, nargs='+',
+                       help="link counts (default: 10 1000 100000 1000000)")
+    bench.add_argument('--repeat', type=int, default=3, help="timed runs per operation")
+    bench.add_argument('--no-memory', action='store_true', help="skip the peak memory pass")
+    return parser
+
+
+def _cli_manager(args, metrics):
+    # A missing file starts from the defaults; an unreadable or invalid one is an error
+    return LinkTreeManager(args.config, strict=os.path.exists(args.config), verbose=False,
+                           journal=args.journal, metrics=metrics)
+
+
+def _read_operations(path) -> List[Dict]:
+    if path == '-':
+        operations = json.load(sys.stdin)
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            operations = json.load(f)
+    if not isinstance(operations, list) or not all(isinstance(op, dict) for op in operations):
+        raise ValueError(f"{path}: expected a JSON array of operation objects")
+    return operations
+
+
+def _cli_operation(args) -> Dict:
+    """The batch operation for a single-change command"""
+    if args.command in ('add', 'update'):
+        # Options left out of the command line are absent, so None means "clear it"
+        fields = {key: value for key, value in vars(args).items() if key in LINK_FIELDS}
+    elif args.command == 'theme':
+        fields = {key: value for key, value in vars(args).items() if key in CONFIG['theme']}
+        if not fields:
+            raise ValueError("give at least one color to change")
+    else:
+        fields = {key: value for key, value in vars(args).items()
+                  if key in ('id', 'before', 'after', 'position', 'enabled') and value is not None}
+    return {'op': args.command, **fields}
+
+
+def _cli_change(args, metrics):
+    operations = _read_operations(args.file) if args.command == 'batch' else [_cli_operation(args)]
+    manager = _cli_manager(args, metrics)
+    results = manager.apply_batch(operations, rebuild=args.rebuild)
+    manager.wait_for_compaction()
+    result = {'revision': manager.revision, 'results': results}
+    if args.command == 'batch':
+        return result, f"Applied {len(results)} operations (revision {manager.revision})"
+    if args.command == 'theme':
+        return result, f"Theme updated (revision {manager.revision})"
+    result['id'] = results[0]
+    if args.command == 'toggle':
+        result['enabled'] = manager.links.get(results[0])['enabled']
+    verb = {'add': "Added", 'update': "Updated", 'delete': "Deleted", 'move': "Moved",
+            'toggle': "Enabled" if result.get('enabled') else "Disabled"}[args.command]
+    return result, f"{verb} link {results[0]!r} (revision {manager.revision})"
+
+
+def _cli_build(args, metrics):
+    import config_journal
+
+    # Journal records not yet folded into the snapshot need a full load to apply them
+    pending = config_journal.head_revision(args.config) > config_journal.snapshot_revision(args.config)
+    if args.stream and not pending:
+        import config_stream
+        output_file = config_stream.build(args.config, verbose=False, metrics=metrics)
+    else:
+        manager = _cli_manager(args, metrics)
+        manager.generate_html(stream=True, incremental=args.incremental, optimize=args.optimize,
+                              paginate=args.paginate)
+        output_file = manager.config['output_file']
+    size = os.path.getsize(output_file)
+    return {'output_file': output_file, 'bytes': size}, f"HTML generated as {output_file} ({size:,d} bytes)"
+
+
+def _cli_check_links(args, metrics):
+    manager = _cli_manager(args, metrics)
+    options = {key: getattr(args, key) for key in ('timeout', 'concurrency')
+               if getattr(args, key) is not None}
+    report = manager.check_links(ttl=args.ttl, **options)
+    broken = [id for id, result in report.items() if not result['ok']]
+    skipped = [id for id, result in report.items() if result.get('skipped')]
+    lines = [f"Checked {len(report) - len(skipped)} links, {len(broken)} broken, "
+             f"{len(skipped)} skipped"]
+    for id in broken:
+        reason = report[id]['error'] or f"HTTP {report[id]['status']}"
+        lines.append(f"  {id}: {manager.links.get(id)['url']} ({reason})")
+    return ({'ok': not broken, 'checked': len(report) - len(skipped), 'broken': broken,
+             'skipped': skipped, 'links': report}, "\n".join(lines))
+
+
+def _cli_bench(args, metrics):
+    import benchmark
+
+    # The suite prints a row per measurement; keep stdout for the JSON document
+    with redirect_stdout(sys.stderr if args.json else sys.stdout):
+        document = benchmark.run(args.sizes or benchmark.DEFAULT_SIZES, repeat=args.repeat,
+                                 memory=not args.no_memory)
+    return document, f"{len(document['results'])} measurements"
+
+
+_CLI_COMMANDS = {'build': _cli_build, 'check-links': _cli_check_links, 'bench': _cli_bench}
+
+
+def main(argv=None):
+    """Run one command (or the interactive menu without one) and return the exit status
+
+    Changes are applied with ``apply_batch``, so an invalid one leaves the
+    config untouched. With ``--json`` the result, or the error, is printed
+    as a single JSON object (``--metrics -`` then goes to stderr); the exit
+    status is 1 on errors and when ``check-links`` finds broken links.
+    """
+    args = _build_parser().parse_args(argv)
+    if args.command is None:
+        print("Welcome to Pythonistas GDL Linktr.ee Manager!")
+        interactive_menu(args.config)
+        return 0
+
+    handler = _CLI_COMMANDS.get(args.command, _cli_change)
+    try:
+        with instrumentation.from_args(args, sys.stderr if args.json else None) as metrics:
+            result, message = handler(args, metrics)
+    except (OSError, ValueError, KeyError, ConfigConflictError) as e:
+        error = str(e.args[0]) if isinstance(e, KeyError) and e.args else str(e)
+        result, message = {'ok': False, 'error': error}, f"Error: {error}"
+    output = {'ok': True, 'command': args.command, **result}
+    if args.json:
+        print(json.dumps(output, ensure_ascii=False))
+    else:
+        print(message, file=sys.stdout if output['ok'] else sys.stderr)
+    return 0 if output['ok'] else 1
+
+
 if __name__ == "__main__":
-    print("Welcome to Pythonistas GDL Linktr.ee Manager!")
-    interactive_menu()
\ No newline at end of file
+    raise SystemExit(main())
@@ -0,0 +1,176 @@
+"""
+Fractional order keys for link ordering
+
+Every link carries an ``order`` string, and links are displayed in
+ascending (plain string) order of those keys. A key can always be generated
+between any two others, so moving a link only changes that link's key.
+
+Keys use the variable-length integer plus fraction scheme from
+https://observablehq.com/@dgreensp/implementing-fractional-indexing with
+base-62 digits: the first character encodes the length of the integer part
+(``a`` = 1 digit, ``b`` = 2, ..., ``A``-``Z`` for "negative" integers before
+``a0``), followed by an optional fraction without trailing zeros. Appending
+increments the integer part, so keys for a million links in a row stay
+four or five characters long.
+"""
+
+import re
+from typing import List, Optional
+
+DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+INTEGER_ZERO = "a0"
+SMALLEST_INTEGER = "A" + DIGITS[0] * 26
+
+_KEY_RE = re.compile(r'[A-Za-z][0-9A-Za-z]*')
+_NEXT_DIGIT = dict(zip(DIGITS, DIGITS[1:]))
+_PREVIOUS_DIGIT = dict(zip(DIGITS[1:], DIGITS))
+
+
+def _integer_length(head) -> int:
+    if "a" <= head <= "z":
+        return ord(head) - ord("a") + 2
+    if "A" <= head <= "Z":
+        return ord("Z") - ord(head) + 2
+    raise ValueError(f"invalid order key head {head!r}")
+
+
+def _integer_part(key) -> str:
+    length = _integer_length(key[0])
+    if length > len(key):
+        raise ValueError(f"invalid order key {key!r}")
+    return key[:length]
+
+
+def validate(key):
+    """Raise ValueError unless ``key`` is a well-formed order key"""
+    if not isinstance(key, str) or not _KEY_RE.fullmatch(key) or key == SMALLEST_INTEGER:
+        raise ValueError(f"invalid order key {key!r}")
+    length = _integer_length(key[0])
+    if length > len(key) or (length < len(key) and key[-1] == DIGITS[0]):
+        raise ValueError(f"invalid order key {key!r}")
+
+
+def _midpoint(a: str, b: Optional[str]) -> str:
+    """A fraction strictly between fractions ``a`` and ``b`` (None meaning 1)"""
+    if b is not None:
+        # Skip the common prefix, treating a missing digit of ``a`` as zero
+        n = 0
+        while n < len(b) and (a[n] if n < len(a) else DIGITS[0]) == b[n]:
+            n += 1
+        if n > 0:
+            return b[:n] + _midpoint(a[n:], b[n:])
+    digit_a = DIGITS.index(a[0]) if a else 0
+    digit_b = DIGITS.index(b[0]) if b is not None else len(DIGITS)
+    if digit_b - digit_a > 1:
+        return DIGITS[round((digit_a + digit_b) / 2)]
+    if b is not None and len(b) > 1:
+        return b[0]
+    return DIGITS[digit_a] + _midpoint(a[1:], None)
+
+
+def _increment_integer(x) -> Optional[str]:
+    if x[-1] in _NEXT_DIGIT:
+        return x[:-1] + _NEXT_DIGIT[x[-1]]
+    head, digits = x[0], list(x[1:])
+    for i in range(len(digits) - 1, -1, -1):
+        d = DIGITS.index(digits[i]) + 1
+        if d < len(DIGITS):
+            digits[i] = DIGITS[d]
+            return head + ''.join(digits)
+        digits[i] = DIGITS[0]
+    if head == "Z":
+        return "a" + DIGITS[0]
+    if head == "z":
+        return None
+    head = chr(ord(head) + 1)
+    if head > "a":
+        digits.append(DIGITS[0])
+    else:
+        digits.pop()
+    return head + ''.join(digits)
+
+
+def _decrement_integer(x) -> Optional[str]:
+    if x[-1] in _PREVIOUS_DIGIT:
+        return x[:-1] + _PREVIOUS_DIGIT[x[-1]]
+    head, digits = x[0], list(x[1:])
+    for i in range(len(digits) - 1, -1, -1):
+        d = DIGITS.index(digits[i]) - 1
+        if d >= 0:
+            digits[i] = DIGITS[d]
+            return head + ''.join(digits)
+        digits[i] = DIGITS[-1]
+    if head == "a":
+        return "Z" + DIGITS[-1]
+    if head == "A":
+        return None
+    head = chr(ord(head) - 1)
+    if head < "Z":
+        digits.append(DIGITS[-1])
+    else:
+        digits.pop()
+    return head + ''.join(digits)
+
+
+def key_between(a: Optional[str], b: Optional[str]) -> str:
+    """Return a key sorting strictly between ``a`` and ``b`` (None means unbounded)"""
+    if a is not None:
+        validate(a)
+    if b is not None:
+        validate(b)
+    if a is not None and b is not None and a >= b:
+        raise ValueError(f"order key {a!r} is not before {b!r}")
+    if a is None:
+        if b is None:
+            return INTEGER_ZERO
+        integer = _integer_part(b)
+        fraction = b[len(integer):]
+        if integer == SMALLEST_INTEGER:
+            return integer + _midpoint("", fraction)
+        if integer < b:
+            return integer
+        key = _decrement_integer(integer)
+        if key is None:
+            raise ValueError("cannot generate an order key before the smallest key")
+        return key
+    integer = _integer_part(a)
+    fraction = a[len(integer):]
+    if b is None:
+        key = _increment_integer(integer)
+        return integer + _midpoint(fraction, None) if key is None else key
+    integer_b = _integer_part(b)
+    if integer == integer_b:
+        return integer + _midpoint(fraction, b[len(integer_b):])
+    key = _increment_integer(integer)
+    if key is None:
+        raise ValueError("cannot generate an order key after the largest key")
+    return key if key < b else integer + _midpoint(fraction, None)
+
+
+def keys_between(a: Optional[str], b: Optional[str], n) -> List[str]:
+    """Return ``n`` ascending keys between ``a`` and ``b``, spread to keep them short"""
+    if n <= 0:
+        return []
+    if n == 1:
+        return [key_between(a, b)]
+    if b is None:
+        return _run(key_between(a, None), n, _increment_integer)
+    if a is None:
+        return _run(key_between(None, b), n, _decrement_integer)[::-1]
+    middle = n // 2
+    key = key_between(a, b)
+    return [*keys_between(a, key, middle), key, *keys_between(key, b, n - middle - 1)]
+
+
+def _run(first, n, step) -> List[str]:
+    """``n`` consecutive integer keys starting at ``first`` (which has no fraction)"""
+    keys = [first]
+    key = first
+    for _ in range(n - 1):
+        following = step(key) if len(key) == _integer_length(key[0]) else None
+        if following is None:
+            # Out of integers (or ``first`` has a fraction): extend the fraction instead
+            following = key_between(key, None) if step is _increment_integer else key_between(None, key)
+        keys.append(following)
+        key = following
+    return keys
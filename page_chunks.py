@@ -0,0 +1,144 @@
+"""
+Lazy-loaded output for very large link lists
+
+The paginated build renders the first links inline, within a first-screen
+byte budget, and writes the rest as fingerprinted HTML chunk files in
+``chunks/`` next to the page, listed in a fingerprinted JSON manifest. A
+small inline script fetches the manifest and then the next chunk whenever
+the end of the list scrolls into view.
+
+Chunk boundaries are content-defined: a chunk ends after every link whose
+ID hashes to zero modulo ``chunk_links``, so chunks hold ``chunk_links``
+links on average. Editing one link only changes (and renames) the one
+chunk that contains it, and adding or removing a link changes at most two
+neighbouring chunks. Chunk files are never rewritten once they exist, and
+files no longer referenced are removed.
+"""
+
+import hashlib
+import json
+import os
+import zlib
+from typing import List, Optional, Sequence, Tuple
+
+CHUNKS_DIR = "chunks"
+
+# Fall back to a positional boundary if IDs happen not to produce one for this long
+MAX_CHUNK_FACTOR = 4
+
+LOADER_SCRIPT = """<script>
+(function () {
+    var sentinel = document.getElementById('more-links');
+    var list = document.querySelector('.links');
+    var chunks = null;
+    var loading = false;
+    var observer = new IntersectionObserver(function (entries) {
+        if (!entries[0].isIntersecting || loading) return;
+        loading = true;
+        var manifest = chunks ? Promise.resolve(chunks) : fetch(sentinel.getAttribute('data-manifest'))
+            .then(function (response) { return response.json(); })
+            .then(function (urls) { return chunks = urls; });
+        manifest.then(function (urls) {
+            return urls.length ? fetch(urls.shift()).then(function (response) { return response.text(); }) : '';
+        }).then(function (html) {
+            list.insertAdjacentHTML('beforeend', html);
+            loading = false;
+            observer.unobserve(sentinel);
+            if (chunks.length) observer.observe(sentinel);
+        });
+    }, {rootMargin: '600px'});
+    observer.observe(sentinel);
+})();
+</script>
+"""
+
+
+def is_boundary(link_id, chunk_links) -> bool:
+    """True if a chunk ends after the link with this ID"""
+    return zlib.crc32(str(link_id).encode('utf-8')) % chunk_links == 0
+
+
+def split_inline(fragments: Sequence[Tuple[str, str]], base_bytes, budget,
+                 max_links) -> int:
+    """Return how many leading fragments fit in the first screen
+
+    ``base_bytes`` is the size of everything else on the page (head,
+    footer, loader). At least one link is always inlined.
+    """
+    used = base_bytes
+    for count, (_, fragment) in enumerate(fragments):
+        used += len(fragment.encode('utf-8'))
+        if count >= max_links or (count and used > budget):
+            return count
+    return len(fragments)
+
+
+def split_chunks(fragments: Sequence[Tuple[str, str]], chunk_links) -> List[str]:
+    """Group ``(link_id, fragment)`` pairs into chunk bodies at content-defined boundaries"""
+    chunks, current = [], []
+    for link_id, fragment in fragments:
+        current.append(fragment)
+        if is_boundary(link_id, chunk_links) or len(current) >= chunk_links * MAX_CHUNK_FACTOR:
+            chunks.append(''.join(current))
+            current = []
+    if current:
+        chunks.append(''.join(current))
+    return chunks
+
+
+def _write_once(path, data) -> int:
+    """Write a fingerprinted file unless it already exists; returns the bytes written"""
+    if os.path.exists(path):
+        return 0
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return len(data)
+
+
+def manifest_url(output_file, digest="0" * 10) -> str:
+    """Manifest URL relative to the page; the default digest is a same-length placeholder"""
+    stem = os.path.splitext(os.path.basename(output_file))[0]
+    return f"{CHUNKS_DIR}/{stem}-{digest}.json"
+
+
+def publish_chunks(chunks: Sequence[str], output_file) -> Tuple[Optional[str], int]:
+    """Write the chunk files and their manifest next to ``output_file``
+
+    Files that already exist are left alone (their names are content
+    hashes) and files no longer referenced are removed. Returns the manifest
+    URL relative to the page (None when there are no chunks) and the number
+    of bytes actually written.
+    """
+    stem = os.path.splitext(os.path.basename(output_file))[0]
+    chunks_dir = os.path.join(os.path.dirname(output_file), CHUNKS_DIR)
+    os.makedirs(chunks_dir, exist_ok=True)
+
+    urls, keep, written = [], set(), 0
+    for body in chunks:
+        data = body.encode('utf-8')
+        name = f"{stem}-{hashlib.sha256(data).hexdigest()[:10]}.html"
+        written += _write_once(os.path.join(chunks_dir, name), data)
+        keep.add(name)
+        urls.append(f"{CHUNKS_DIR}/{name}")
+
+    url = None
+    if urls:
+        data = json.dumps(urls, separators=(',', ':')).encode('utf-8')
+        url = manifest_url(output_file, hashlib.sha256(data).hexdigest()[:10])
+        written += _write_once(os.path.join(chunks_dir, os.path.basename(url)), data)
+        keep.add(os.path.basename(url))
+
+    for name in os.listdir(chunks_dir):
+        if name.startswith(f"{stem}-") and name.endswith((".html", ".json")) and name not in keep:
+            os.remove(os.path.join(chunks_dir, name))
+    return url, written
+
+
+def loader_html(manifest: Optional[str]) -> str:
+    """Sentinel element plus the script that fetches the chunks on scroll"""
+    if manifest is None:
+        return ""
+    return f"""<div id="more-links" data-manifest="{manifest}"></div>
+{LOADER_SCRIPT}"""
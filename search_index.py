@@ -0,0 +1,182 @@
+"""
+Prebuilt prefix search index over link titles, badges and IDs
+
+Text is case-folded, stripped of accents and split into words. The index is
+the sorted list of distinct words plus, for each word, the positions of the
+links containing it. A query matches links that contain, for every query
+word, some word starting with it ("reu vier" finds "Reunión del Viernes").
+Prefix lookups are a binary search in the sorted word list, both here and
+in the small script the page uses, so the page and ``LinkTreeManager.search``
+return the same results.
+
+Serialized form (compact JSON)::
+
+    {"v": 1,
+     "docs": [["evento", "Reunión del Viernes", "https://..."], ...],
+     "terms": ["del", "evento", "reunion", "viernes", ...],
+     "postings": [[0], [0], [0], [0], ...]}
+"""
+
+import hashlib
+import json
+import os
+import re
+import unicodedata
+from bisect import bisect_left
+from typing import Dict, List, Tuple
+
+INDEX_VERSION = 1
+DEFAULT_LIMIT = 20
+
+_WORD_RE = re.compile(r'[a-z0-9]+')
+
+
+def normalize(text) -> str:
+    """Lower-case ``text`` and strip accents ("Reunión" -> "reunion")"""
+    decomposed = unicodedata.normalize('NFKD', str(text).casefold())
+    return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def words(text) -> List[str]:
+    return _WORD_RE.findall(normalize(text))
+
+
+class SearchIndex:
+    """Sorted terms with postings lists of document positions"""
+
+    def __init__(self, docs: List[Tuple[str, str, str]], terms: List[str], postings: List[List[int]]):
+        self.docs = docs
+        self.terms = terms
+        self.postings = postings
+
+    @classmethod
+    def build(cls, links) -> 'SearchIndex':
+        """Index the title, badge and ID of each link, keeping their order"""
+        docs = []
+        index: Dict[str, List[int]] = {}
+        for position, link in enumerate(links):
+            docs.append((link['id'], link['title'], link['url']))
+            text = f"{link['title']} {link.get('badge') or ''} {link['id']}"
+            for word in set(words(text)):
+                index.setdefault(word, []).append(position)
+        terms = sorted(index)
+        return cls(docs, terms, [index[term] for term in terms])
+
+    def __len__(self):
+        return len(self.docs)
+
+    def _prefix_matches(self, prefix) -> set:
+        matches = set()
+        terms = self.terms
+        i = bisect_left(terms, prefix)
+        while i < len(terms) and terms[i].startswith(prefix):
+            matches.update(self.postings[i])
+            i += 1
+        return matches
+
+    def query(self, text, limit=DEFAULT_LIMIT) -> List[Tuple[str, str, str]]:
+        """Return ``(id, title, url)`` of the links matching every word, in page order"""
+        matched = None
+        # Longest words first: they narrow the candidate set the most
+        for word in sorted(set(words(text)), key=len, reverse=True):
+            docs = self._prefix_matches(word)
+            matched = docs if matched is None else matched & docs
+            if not matched:
+                return []
+        if matched is None:
+            return []
+        return [self.docs[position] for position in sorted(matched)[:limit]]
+
+    def to_dict(self) -> Dict:
+        return {'v': INDEX_VERSION, 'docs': [list(doc) for doc in self.docs],
+                'terms': self.terms, 'postings': self.postings}
+
+    @classmethod
+    def from_dict(cls, data) -> 'SearchIndex':
+        if data.get('v') != INDEX_VERSION:
+            raise ValueError(f"unsupported search index version {data.get('v')!r}")
+        return cls([tuple(doc) for doc in data['docs']], data['terms'], data['postings'])
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, separators=(',', ':'))
+
+
+def publish_index(index: SearchIndex, output_file) -> Tuple[str, int]:
+    """Write the index as ``<page>.search-<hash>.json`` next to the page
+
+    Older index files of the same page are removed. Returns the file name
+    (relative to the page) and the number of bytes written (0 if unchanged).
+    """
+    output_dir = os.path.dirname(output_file)
+    stem = os.path.splitext(os.path.basename(output_file))[0]
+    data = index.to_json().encode('utf-8')
+    name = f"{stem}.search-{hashlib.sha256(data).hexdigest()[:10]}.json"
+    path = os.path.join(output_dir, name)
+    written = 0
+    if not os.path.exists(path):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        written = len(data)
+    for existing in os.listdir(output_dir or '.'):
+        if existing.startswith(f"{stem}.search-") and existing.endswith(".json") and existing != name:
+            os.remove(os.path.join(output_dir, existing))
+    return name, written
+
+
+SEARCH_SCRIPT = """<script>
+(function () {
+    var box = document.getElementById('link-search');
+    var input = box.querySelector('input');
+    var results = box.querySelector('.search-results');
+    var list = document.querySelector('.links');
+    var index = null;
+    list.parentNode.insertBefore(box, list);
+    box.hidden = false;
+    function words(text) {
+        return text.normalize('NFKD').replace(/[\\u0300-\\u036f]/g, '').toLowerCase().match(/[a-z0-9]+/g) || [];
+    }
+    function prefixMatches(prefix) {
+        var terms = index.terms, lo = 0, hi = terms.length, found = new Set();
+        while (lo < hi) { var mid = (lo + hi) >> 1; if (terms[mid] < prefix) lo = mid + 1; else hi = mid; }
+        for (var i = lo; i < terms.length && terms[i].lastIndexOf(prefix, 0) === 0; i++) {
+            index.postings[i].forEach(function (doc) { found.add(doc); });
+        }
+        return found;
+    }
+    function search() {
+        var query = Array.from(new Set(words(input.value))).sort(function (a, b) { return b.length - a.length; });
+        var matched = null;
+        query.forEach(function (word) {
+            var docs = prefixMatches(word);
+            matched = matched === null ? docs : new Set(Array.from(matched).filter(function (doc) { return docs.has(doc); }));
+        });
+        results.textContent = '';
+        if (!matched) return;
+        Array.from(matched).sort(function (a, b) { return a - b; }).slice(0, %(limit)d).forEach(function (doc) {
+            var a = document.createElement('a');
+            a.className = 'link';
+            a.href = index.docs[doc][2];
+            a.textContent = index.docs[doc][1];
+            results.appendChild(a);
+        });
+    }
+    input.addEventListener('focus', function () {
+        if (index) return;
+        fetch(box.getAttribute('data-index')).then(function (response) { return response.json(); })
+            .then(function (data) { index = data; search(); });
+    });
+    input.addEventListener('input', function () { if (index) search(); });
+})();
+</script>
+"""
+
+
+def search_html(index_url, limit=DEFAULT_LIMIT) -> str:
+    """Search box (moved above the links by its script) and the client-side query script"""
+    return f"""<div class="search" id="link-search" data-index="{index_url}" hidden>
+    <input type="search" placeholder="Buscar…" aria-label="Buscar enlaces" style="width: 100%; padding: 12px; margin-bottom: 15px; border-radius: 12px; border: 1px solid #ccc; box-sizing: border-box;">
+    <div class="search-results"></div>
+</div>
+{SEARCH_SCRIPT % {'limit': limit}}"""
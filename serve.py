@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Pythonistas GDL Linktr.ee page server
+
+Serves the rendered page and the ``images/`` icons next to the config file
+straight from memory using asyncio. Every asset is kept together with
+precompressed gzip (and brotli, when the ``brotli`` package is installed)
+variants and a strong ETag, so conditional requests are answered with
+``304 Not Modified`` and nothing is read or compressed per request.
+
+The config file and images are polled for changes; when they change the page
+is re-rendered in memory, in a worker thread so requests keep being answered
+meanwhile, and swapped in atomically.
+
+Usage:
+    python serve.py [config_file] [--host 127.0.0.1] [--port 8000]
+"""
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import os
+import time
+from email.utils import formatdate
+from typing import Dict, Optional
+
+import config_journal
+import instrumentation
+from icon_assets import ICON_ASSETS_DIR
+from manage_links import LinkTreeManager
+from watch import snapshot
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+CONTENT_TYPES = {
+    '.html': 'text/html; charset=utf-8',
+    '.png': 'image/png',
+    '.css': 'text/css; charset=utf-8',
+    '.js': 'application/javascript; charset=utf-8',
+    '.json': 'application/json',
+    '.svg': 'image/svg+xml',
+    '.webp': 'image/webp',
+}
+
+# Already-compressed formats gain nothing from another compression pass
+INCOMPRESSIBLE = {'image/png', 'image/webp'}
+
+
+class Asset:
+    """An in-memory response body with its precompressed variants and ETags"""
+
+    __slots__ = ('content_type', 'variants')
+
+    def __init__(self, body: bytes, content_type: str):
+        self.content_type = content_type
+        etag = hashlib.sha256(body).hexdigest()[:32]
+        # encoding -> (body, etag); each representation gets its own strong ETag
+        self.variants: Dict[str, tuple] = {'identity': (body, f'"{etag}"')}
+        if content_type not in INCOMPRESSIBLE:
+            self.variants['gzip'] = (gzip.compress(body, compresslevel=9, mtime=0), f'"{etag}-gz"')
+            if brotli is not None:
+                self.variants['br'] = (brotli.compress(body, quality=11), f'"{etag}-br"')
+
+    def negotiate(self, accept_encoding: str):
+        """Pick the best variant for an Accept-Encoding header"""
+        accepted = {token.split(';')[0].strip() for token in accept_encoding.lower().split(',')}
+        for encoding in ('br', 'gzip'):
+            if encoding in accepted and encoding in self.variants:
+                return encoding, *self.variants[encoding]
+        return 'identity', *self.variants['identity']
+
+
+def load_assets(manager: LinkTreeManager, images_dir="images", now=None,
+                images_path=None) -> Dict[str, Asset]:
+    """Render the page (as of ``now``) and read the icons into a fresh ``{url_path: Asset}`` map
+
+    Icons are served under ``/<images_dir>/`` and read from ``images_path``
+    (by default ``images_dir`` itself).
+    """
+    page = Asset("".join(manager.iter_html(now=now)).encode('utf-8'), CONTENT_TYPES['.html'])
+    assets = {'/': page, '/' + os.path.basename(manager.config['output_file']): page}
+    # Fingerprinted icons written by the build live next to the output file
+    icons_dir = os.path.join(os.path.dirname(manager.config['output_file']), ICON_ASSETS_DIR)
+    sources = ((images_path or images_dir, images_dir), (icons_dir, ICON_ASSETS_DIR))
+    for directory, url_prefix in sources:
+        if not os.path.isdir(directory):
+            continue
+        for name in sorted(os.listdir(directory)):
+            content_type = CONTENT_TYPES.get(os.path.splitext(name)[1].lower())
+            path = os.path.join(directory, name)
+            if content_type and os.path.isfile(path):
+                with open(path, 'rb') as f:
+                    assets[f"/{url_prefix}/{name}"] = Asset(f.read(), content_type)
+    return assets
+
+
+class LinkTreeServer:
+    """asyncio HTTP/1.1 server for the in-memory page and icons"""
+
+    def __init__(self, config_file="linktree_config.json", images_dir="images", poll_interval=1.0,
+                 metrics=instrumentation.DISABLED):
+        self.config_file = config_file
+        self.metrics = metrics
+        self.images_dir = images_dir
+        # Like watch.py, the images live next to the config, wherever we are run from
+        self.images_path = os.path.join(os.path.dirname(config_file), images_dir)
+        self.poll_interval = poll_interval
+        self.watch_paths = [config_file, config_journal.journal_path(config_file), self.images_path]
+        self.assets: Dict[str, Asset] = {}
+        self._files = {}
+        # When the next scheduled link appears or disappears, and a wake-up for the scheduler
+        self.next_transition: Optional[float] = None
+        self._rescheduled = asyncio.Event()
+        # Serializes background reloads (file changes and schedule transitions)
+        self._reloading = asyncio.Lock()
+        self.reload()
+
+    def _render(self, now):
+        """Render everything as of ``now``; returns (assets, next transition), or None on errors"""
+        try:
+            manager = LinkTreeManager(self.config_file, strict=True, metrics=self.metrics)
+            return (load_assets(manager, self.images_dir, now, self.images_path),
+                    manager.next_transition(now))
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Reload failed, still serving previous version: {e}")
+            return None
+
+    def _swap(self, rendered) -> bool:
+        if rendered is None:
+            # Retrying the transition would fail the same way: wait for the next file change
+            self.next_transition = None
+            self._rescheduled.set()
+            return False
+        # A single reference swap: in-flight requests keep the map they started with
+        self.assets, self.next_transition = rendered
+        self._rescheduled.set()
+        print(f"Serving {len(self.assets)} assets from memory")
+        return True
+
+    def reload(self) -> bool:
+        """Re-render everything and swap it in; keeps serving the old copy on errors"""
+        self._files = snapshot(self.watch_paths)
+        return self._swap(self._render(time.time()))
+
+    async def reload_in_background(self) -> bool:
+        """Like ``reload``, but renders in a worker thread so the event loop keeps serving"""
+        async with self._reloading:
+            self._files = snapshot(self.watch_paths)
+            return self._swap(await asyncio.to_thread(self._render, time.time()))
+
+    async def watch(self):
+        """Poll the config and images and hot-swap the assets when they change"""
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            if snapshot(self.watch_paths) != self._files:
+                await self.reload_in_background()
+
+    async def follow_schedule(self):
+        """Re-render exactly when a scheduled link is published or expires"""
+        while True:
+            self._rescheduled.clear()
+            delay = None
+            if self.next_transition is not None:
+                delay = max(0.0, self.next_transition - time.time())
+            try:
+                await asyncio.wait_for(self._rescheduled.wait(), delay)
+            except asyncio.TimeoutError:
+                await self.reload_in_background()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve requests on one connection, honouring keep-alive"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                parts = request_line.decode('latin-1').split()
+                if len(parts) != 3:
+                    writer.write(self._response(400, b'Bad Request', keep_alive=False))
+                    break
+                method, target, version = parts
+                keep_alive = (headers.get('connection', '').lower() != 'close'
+                              and version == 'HTTP/1.1')
+                writer.write(self._respond(method, target.split('?', 1)[0], headers, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def _respond(self, method, path, headers, keep_alive) -> bytes:
+        if method not in ('GET', 'HEAD'):
+            return self._response(405, b'Method Not Allowed', keep_alive, {'Allow': 'GET, HEAD'})
+        asset = self.assets.get(path)
+        if asset is None:
+            return self._response(404, b'Not Found', keep_alive)
+
+        encoding, body, etag = asset.negotiate(headers.get('accept-encoding', ''))
+        extra = {'ETag': etag, 'Vary': 'Accept-Encoding', 'Cache-Control': 'no-cache'}
+        if encoding != 'identity':
+            extra['Content-Encoding'] = encoding
+
+        if_none_match = headers.get('if-none-match')
+        if if_none_match and (if_none_match.strip() == '*'
+                              or etag in (tag.strip() for tag in if_none_match.split(','))):
+            return self._response(304, b'', keep_alive, extra, send_body=False)
+        return self._response(200, body, keep_alive, extra, asset.content_type,
+                              send_body=method == 'GET')
+
+    @staticmethod
+    def _response(status, body, keep_alive, extra=None, content_type='text/plain; charset=utf-8',
+                  send_body=True) -> bytes:
+        reasons = {200: 'OK', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found',
+                   405: 'Method Not Allowed'}
+        lines = [
+            f"HTTP/1.1 {status} {reasons[status]}",
+            f"Date: {formatdate(usegmt=True)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        if status != 304:
+            lines.append(f"Content-Type: {content_type}")
+            lines.append(f"Content-Length: {len(body)}")
+        lines.extend(f"{name}: {value}" for name, value in (extra or {}).items())
+        head = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+        return head + body if send_body and status != 304 else head
+
+    async def serve(self, host="127.0.0.1", port=8000):
+        """Run the server and the change watcher until cancelled"""
+        server = await asyncio.start_server(self.handle, host, port)
+        print(f"Serving on http://{host}:{port}/ (Ctrl+C to stop)")
+        watcher = asyncio.create_task(self.watch())
+        scheduler = asyncio.create_task(self.follow_schedule())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            watcher.cancel()
+            scheduler.cancel()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the Linktr.ee page from memory")
+    parser.add_argument('config_file', nargs='?', default="linktree_config.json")
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--images', default="images", help="icon directory to serve (relative to the config file)")
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    with instrumentation.from_args(args) as metrics:
+        server = LinkTreeServer(args.config_file, images_dir=args.images, metrics=metrics)
+        try:
+            asyncio.run(server.serve(args.host, args.port))
+        except KeyboardInterrupt:
+            print("Server stopped")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
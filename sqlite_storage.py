@@ -0,0 +1,214 @@
+"""
+SQLite storage backend for LinkTreeManager
+
+Keeps the config and links in a SQLite database instead of
+``linktree_config.json``. Links are indexed by ID and by their fractional
+order key (display order), every save applies only the pending mutations in
+one transaction, and enabled links can be streamed in display order for
+rendering without loading them all. Moving a link updates only its own row.
+
+Usage:
+    storage = SQLiteStorage("linktree.db")
+    manager = LinkTreeManager(storage=storage)
+    manager.update_link("evento", badge="Hoy")
+    manager.save_config()
+
+    # Stream straight from the database into the output file
+    with open("index.html", "w", encoding="utf-8") as f:
+        manager.render_html(f, links=storage.iter_enabled_links())
+
+    import_json("linktree_config.json", "linktree.db")
+    export_json("linktree.db", "linktree_config.json")
+"""
+
+import json
+import sqlite3
+from typing import Iterator
+
+from manage_links import ConfigConflictError, Link, LinkCollection
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS links (
+    id TEXT PRIMARY KEY,
+    sort_key TEXT NOT NULL,
+    title TEXT NOT NULL,
+    url TEXT NOT NULL,
+    icon TEXT,
+    style TEXT NOT NULL,
+    badge TEXT,
+    enabled INTEGER NOT NULL,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS links_by_order ON links (sort_key);
+CREATE INDEX IF NOT EXISTS links_enabled_by_order ON links (enabled, sort_key);
+"""
+
+# Link fields with a column of their own; everything else goes through "extra"
+_COLUMNS = ("title", "url", "icon", "style", "badge", "enabled", "id", "order")
+
+
+def _row(link) -> tuple:
+    """Link to a table row; keys without a column round-trip through ``extra``"""
+    extra = {key: value for key, value in link.items() if key not in _COLUMNS}
+    return (link['id'], link['order'], link['title'], link['url'], link.get('icon'),
+            str(link.get('style', 'default')), link.get('badge'), int(bool(link.get('enabled', True))),
+            json.dumps(extra, ensure_ascii=False) if extra else None)
+
+
+def _link(row) -> Link:
+    id, sort_key, title, url, icon, style, badge, enabled, extra = row
+    data = {"title": title, "url": url, "icon": icon, "style": style,
+            "badge": badge, "enabled": bool(enabled), "id": id, "order": sort_key}
+    if extra:
+        data.update(json.loads(extra))
+    return Link.from_dict(data)
+
+
+_SELECT = "SELECT id, sort_key, title, url, icon, style, badge, enabled, extra FROM links"
+_INSERT = ("INSERT INTO links (id, sort_key, title, url, icon, style, badge, enabled, extra) "
+           "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)")
+
+
+class SQLiteStorage:
+    """Config and links in a SQLite database, updated transactionally"""
+
+    def __init__(self, path="linktree.db"):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def __str__(self):
+        return self.path
+
+    def close(self):
+        self.conn.close()
+
+    def _meta(self, key, default=None):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def is_empty(self) -> bool:
+        return self._meta('config') is None
+
+    def iter_links(self) -> Iterator[Link]:
+        """Stream every link in display order"""
+        for row in self.conn.execute(f"{_SELECT} ORDER BY sort_key"):
+            yield _link(row)
+
+    def iter_enabled_links(self) -> Iterator[Link]:
+        """Stream enabled links in display order, for rendering"""
+        for row in self.conn.execute(f"{_SELECT} WHERE enabled = 1 ORDER BY sort_key"):
+            yield _link(row)
+
+    def get_link(self, id):
+        row = self.conn.execute(f"{_SELECT} WHERE id = ?", (id,)).fetchone()
+        return _link(row) if row else None
+
+    def load(self, manager) -> bool:
+        """Load config and links into ``manager``; returns False if the database is empty"""
+        config = self._meta('config')
+        if config is None:
+            return False
+        manager.config.update(config)
+        manager.links = LinkCollection(self.iter_links())
+        manager.revision = self._meta('revision', 0)
+        manager._pending.clear()
+        return True
+
+    def _write_all(self, config, links, revision):
+        """Replace everything in the database (used for imports and first saves)"""
+        self.conn.execute("DELETE FROM links")
+        self.conn.executemany(_INSERT, (_row(link) for link in links))
+        self._set_meta(config, revision)
+
+    def _set_meta(self, config, revision):
+        self.conn.executemany(
+            "INSERT INTO meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            [('config', json.dumps(config, ensure_ascii=False)), ('revision', json.dumps(revision))])
+
+    def _apply(self, operation, manager):
+        """Apply one pending mutation (same shapes as the config journal)"""
+        op = operation['op']
+        if op == 'add':
+            link = manager.links.get(operation['link']['id']) or operation['link']
+            self.conn.execute(_INSERT, _row(link))
+        elif op == 'update':
+            link = manager.links.get(operation['id'])
+            if link is not None:
+                row = _row(link)
+                self.conn.execute(
+                    "UPDATE links SET title = ?, url = ?, icon = ?, style = ?, badge = ?, "
+                    "enabled = ?, extra = ? WHERE id = ?",
+                    (*row[2:], operation['id']))
+        elif op == 'delete':
+            self.conn.execute("DELETE FROM links WHERE id = ?", (operation['id'],))
+        elif op == 'reorder':
+            self.conn.executemany("UPDATE links SET sort_key = ? WHERE id = ?",
+                                  ((link.order, link.id) for link in manager.links))
+        elif op == 'move':
+            self.conn.execute("UPDATE links SET sort_key = ? WHERE id = ?",
+                              (operation['order'], operation['id']))
+        # 'theme' and 'config' changes are saved with the config below
+
+    def save(self, manager, force=False):
+        """Apply the manager's pending mutations in one transaction
+
+        Raises ConfigConflictError if someone else saved since the manager
+        loaded, unless ``force`` is set.
+        """
+        with self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            revision = self._meta('revision', 0)
+            if revision != manager.revision and not force:
+                raise ConfigConflictError(
+                    f"{self.path} was modified by someone else (revision {revision} in the "
+                    f"database, {manager.revision} loaded); reload it or save with force=True")
+            if self.is_empty() or force:
+                self._write_all(manager.config, manager.links, max(revision, manager.revision) + 1)
+            else:
+                for operation in manager._pending:
+                    self._apply(operation, manager)
+                self._set_meta(manager.config, revision + 1)
+        manager.revision = max(revision, manager.revision) + 1
+        manager._pending.clear()
+
+
+def import_json(json_path, db_path) -> int:
+    """Copy a linktree_config.json into a SQLite database; returns the link count"""
+    with open(json_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    storage = SQLiteStorage(db_path)
+    try:
+        with storage.conn:
+            storage.conn.execute("BEGIN IMMEDIATE")
+            # Going through LinkCollection gives links without order keys their keys
+            storage._write_all(data.get('config', {}), LinkCollection(data.get('links', [])),
+                               data.get('revision', 0))
+    finally:
+        storage.close()
+    return len(data.get('links', []))
+
+
+def export_json(db_path, json_path) -> int:
+    """Write a SQLite database back out in the linktree_config.json format"""
+    storage = SQLiteStorage(db_path)
+    try:
+        with storage.conn:
+            links = [link.to_dict() for link in storage.iter_links()]
+            data = {
+                'revision': storage._meta('revision', 0),
+                'config': storage._meta('config', {}),
+                'links': links,
+            }
+    finally:
+        storage.close()
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    return len(links)
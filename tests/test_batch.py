@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from manage_links import BatchError, LinkTreeManager
+
+
+class ApplyBatchTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.config_file = os.path.join(self.tmp.name, "linktree_config.json")
+        self.manager = LinkTreeManager(self.config_file, verbose=False)
+        self.manager.config['output_file'] = os.path.join(self.tmp.name, "index.html")
+        self.manager.save_config()
+        self.ids = [id for id, _ in self.manager.get_link_ids()]
+
+    def read_config_file(self):
+        with open(self.config_file, 'rb') as f:
+            return f.read()
+
+    def test_invalid_operation_leaves_everything_untouched(self):
+        config = self.manager.config.copy()
+        config['theme'] = dict(config['theme'])
+        links = self.manager.links.to_list()
+        on_disk = self.read_config_file()
+        operations = [
+            {'op': 'update', 'id': self.ids[0], 'badge': "Hoy"},
+            {'op': 'add', 'title': "Meetup", 'url': "https://example.com/meetup", 'id': "meetup"},
+            {'op': 'move', 'id': self.ids[1], 'before': self.ids[0]},
+            {'op': 'theme', 'bg_color': "#FFFFFF"},
+            {'op': 'config', 'logo_text': "PyGDL"},
+            {'op': 'delete', 'id': "no-such-link"},
+            {'op': 'delete', 'id': self.ids[2]},
+        ]
+        with self.assertRaises(BatchError) as caught:
+            self.manager.apply_batch(operations, rebuild=True)
+        self.assertEqual(caught.exception.index, 5)
+        self.assertEqual(self.manager.config, config)
+        self.assertEqual(self.manager.links.to_list(), links)
+        self.assertEqual(self.read_config_file(), on_disk)
+        self.assertFalse(os.path.exists(self.manager.config['output_file']))
+
+    def test_valid_batch_saves_and_builds_once(self):
+        operations = [
+            {'op': 'update', 'id': self.ids[0], 'badge': "Hoy"},
+            {'op': 'add', 'title': "Meetup", 'url': "https://example.com/meetup", 'id': "meetup"},
+            {'op': 'move', 'id': "meetup", 'before': self.ids[0]},
+            {'op': 'toggle', 'id': self.ids[1], 'enabled': False},
+            {'op': 'delete', 'id': self.ids[2]},
+        ]
+        with mock.patch.object(self.manager, 'save_config', wraps=self.manager.save_config) as save, \
+                mock.patch.object(self.manager, 'generate_html',
+                                  wraps=self.manager.generate_html) as build:
+            results = self.manager.apply_batch(operations, rebuild=True)
+        self.assertEqual(results, [self.ids[0], "meetup", "meetup", self.ids[1], self.ids[2]])
+        save.assert_called_once_with()
+        build.assert_called_once_with(incremental=True)
+        self.assertTrue(os.path.exists(self.manager.config['output_file']))
+
+        reloaded = LinkTreeManager(self.config_file, strict=True, verbose=False)
+        self.assertEqual(reloaded.links.to_list(), self.manager.links.to_list())
+        self.assertEqual([id for id, _ in reloaded.get_link_ids()][:2], ["meetup", self.ids[0]])
+        self.assertEqual(reloaded.links.get(self.ids[0])['badge'], "Hoy")
+        self.assertFalse(reloaded.links.get(self.ids[1])['enabled'])
+        self.assertNotIn(self.ids[2], reloaded.links)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+import gzip
+import json
+import os
+import re
+import tempfile
+import time
+import unittest
+
+import config_stream
+import manage_links
+from manage_links import LinkTreeManager
+
+
+class BuildModesTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.config_file = os.path.join(self.tmp.name, "linktree_config.json")
+        self.output_file = os.path.join(self.tmp.name, "index.html")
+        self.now = time.time()
+        manager = LinkTreeManager(self.config_file, verbose=False)
+        manager.config['output_file'] = self.output_file
+        manager.links = []
+        for i in range(60):
+            manager.add_link(f"Enlace {i} ñ", f"https://example.com/{i}", id=f"enlace-{i}",
+                             style="primary" if i % 5 == 0 else "default",
+                             badge="Nuevo" if i % 7 == 0 else None, enabled=i % 11 != 0)
+        manager.save_config()
+
+    def load(self):
+        return LinkTreeManager(self.config_file, strict=True, verbose=False)
+
+    def build(self, **options):
+        """Build with a freshly loaded manager and return the output file's bytes"""
+        self.load().generate_html(now=self.now, **options)
+        with open(self.output_file, 'rb') as f:
+            return f.read()
+
+    def test_streamed_incremental_and_normal_output_match(self):
+        normal = self.build()
+        self.assertEqual(self.build(stream=True), normal)
+        config_stream.build(self.config_file, now=self.now, verbose=False)
+        with open(self.output_file, 'rb') as f:
+            self.assertEqual(f.read(), normal)
+        # A cold cache, then a warm one
+        self.assertEqual(self.build(incremental=True), normal)
+        self.assertEqual(self.build(incremental=True), normal)
+
+        # After a change the warm cache still matches a full build
+        manager = self.load()
+        manager.update_link("enlace-3", title="Enlace tres", badge="Hoy")
+        manager.move_link("enlace-3", before="enlace-0")
+        manager.save_config()
+        normal = self.build()
+        self.assertEqual(self.build(incremental=True), normal)
+
+    def test_unchanged_incremental_rebuild_leaves_the_output_alone(self):
+        built = self.build(incremental=True)
+        # Backdate the file so any rewrite, even within the same clock tick, shows up
+        os.utime(self.output_file, ns=(10**18, 10**18))
+        stat = os.stat(self.output_file)
+        self.assertEqual(self.build(incremental=True), built)
+        after = os.stat(self.output_file)
+        self.assertEqual((after.st_ino, after.st_mtime_ns), (stat.st_ino, stat.st_mtime_ns))
+
+    def test_optimized_build_is_smaller_with_matching_compressed_copies(self):
+        normal = self.build()
+        optimized = self.build(optimize=True)
+        self.assertLess(len(optimized), len(normal))
+        for i in range(60):
+            # Links 0, 11, 22, ... are disabled
+            self.assertEqual(f'id="enlace-{i}"'.encode() in optimized, i % 11 != 0)
+        with open(f"{self.output_file}.gz", 'rb') as f:
+            self.assertEqual(gzip.decompress(f.read()), optimized)
+        if manage_links.brotli is None:
+            self.assertFalse(os.path.exists(f"{self.output_file}.br"))
+        else:
+            with open(f"{self.output_file}.br", 'rb') as f:
+                self.assertEqual(manage_links.brotli.decompress(f.read()), optimized)
+
+    def set_config(self, **settings):
+        manager = self.load()
+        manager.update_config(**settings)
+        manager.save_config()
+
+    def inline_ids(self, page):
+        return re.findall(r' id="(enlace-\d+)"', page.decode('utf-8'))
+
+    def manifest(self, page):
+        url = re.search(r'data-manifest="([^"]+)"', page.decode('utf-8')).group(1)
+        with open(os.path.join(self.tmp.name, url), encoding='utf-8') as f:
+            return json.load(f)
+
+    def test_paginated_first_screen_limits(self):
+        visible = [f"enlace-{i}" for i in range(60) if i % 11 != 0]
+        self.set_config(inline_links=10, first_screen_bytes=10**6)
+        page = self.build(paginate=True)
+        self.assertEqual(self.inline_ids(page), visible[:10])
+
+        # A byte budget just short of that page allows fewer links
+        self.set_config(inline_links=50, first_screen_bytes=len(page) - 1)
+        page = self.build(paginate=True)
+        inline = self.inline_ids(page)
+        self.assertEqual(inline, visible[:len(inline)])
+        self.assertTrue(2 <= len(inline) < 10)
+        self.assertLessEqual(len(page), self.load().config['first_screen_bytes'])
+
+        # Every other visible link is in exactly one chunk, in order
+        chunked = []
+        for url in self.manifest(page):
+            with open(os.path.join(self.tmp.name, url), encoding='utf-8') as f:
+                chunked += re.findall(r' id="(enlace-\d+)"', f.read())
+        self.assertEqual(inline + chunked, visible)
+
+    def test_paginated_chunk_names_are_stable(self):
+        self.set_config(inline_links=5, chunk_links=5)
+        before = self.manifest(self.build(paginate=True))
+        self.assertGreater(len(before), 3)
+
+        manager = self.load()
+        manager.update_link("enlace-40", title="Enlace cuarenta")
+        manager.save_config()
+        after = self.manifest(self.build(paginate=True))
+        self.assertEqual(len(after), len(before))
+        changed = [i for i, (old, new) in enumerate(zip(before, after)) if old != new]
+        self.assertEqual(len(changed), 1)
+        # The replaced chunk file is removed, the others are kept
+        self.assertFalse(os.path.exists(os.path.join(self.tmp.name, before[changed[0]])))
+        self.assertTrue(all(os.path.exists(os.path.join(self.tmp.name, url)) for url in after))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from manage_links import LinkTreeManager, main
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """200 for /ok, 404 for everything else"""
+
+    def do_HEAD(self):
+        self.send_response(200 if self.path == '/ok' else 404)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    do_GET = do_HEAD
+
+    def log_message(self, format, *args):
+        pass
+
+
+class CommandLineTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.config_file = os.path.join(self.tmp.name, "linktree_config.json")
+        self.output_file = os.path.join(self.tmp.name, "index.html")
+        manager = LinkTreeManager(self.config_file, verbose=False)
+        manager.config['output_file'] = self.output_file
+        manager.save_config()
+        self.ids = [id for id, _ in manager.get_link_ids()]
+
+    def run_main(self, *argv):
+        """Run the CLI on the test config; returns (exit status, stdout, stderr)"""
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            status = main(['--config', self.config_file, *argv])
+        return status, stdout.getvalue(), stderr.getvalue()
+
+    def run_json(self, *argv):
+        status, stdout, _ = self.run_main('--json', *argv)
+        return status, json.loads(stdout)
+
+    def load(self):
+        return LinkTreeManager(self.config_file, strict=True, verbose=False)
+
+    def serve_stub(self):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return f"http://127.0.0.1:{server.server_address[1]}"
+
+    def test_link_commands(self):
+        status, out = self.run_json('add', '--title', "Meetup", '--url', "https://example.com/meetup",
+                                    '--id', "meetup", '--badge', "Nuevo")
+        self.assertEqual(status, 0)
+        self.assertEqual(out['command'], "add")
+        self.assertEqual(out['id'], "meetup")
+        self.assertEqual(out['revision'], self.load().revision)
+        self.assertEqual(self.load().links.get("meetup")['badge'], "Nuevo")
+
+        self.assertEqual(self.run_main('update', "meetup", '--badge', '')[0], 0)
+        self.assertIsNone(self.load().links.get("meetup")['badge'])
+
+        self.assertEqual(self.run_main('move', "meetup", '--before', self.ids[0])[0], 0)
+        self.assertEqual(self.load().get_link_ids()[0][0], "meetup")
+
+        status, out = self.run_json('toggle', "meetup", '--off')
+        self.assertEqual((status, out['enabled']), (0, False))
+        self.assertFalse(self.load().links.get("meetup")['enabled'])
+
+        status, stdout, _ = self.run_main('delete', "meetup")
+        self.assertEqual(status, 0)
+        self.assertIn("Deleted link 'meetup'", stdout)
+        self.assertNotIn("meetup", self.load().links)
+
+    def test_theme_and_batch(self):
+        self.assertEqual(self.run_main('theme', '--bg-color', "#FFFFFF")[0], 0)
+        self.assertEqual(self.load().config['theme']['bg_color'], "#FFFFFF")
+
+        batch_file = os.path.join(self.tmp.name, "changes.json")
+        with open(batch_file, 'w', encoding='utf-8') as f:
+            json.dump([{'op': 'delete', 'id': self.ids[0]},
+                       {'op': 'update', 'id': self.ids[1], 'badge': "Hoy"}], f)
+        status, out = self.run_json('batch', batch_file, '--rebuild')
+        self.assertEqual(status, 0)
+        self.assertEqual(out['results'], self.ids[:2])
+        self.assertNotIn(self.ids[0], self.load().links)
+        self.assertTrue(os.path.exists(self.output_file))
+
+    def test_build_modes(self):
+        for mode in ([], ['--stream'], ['--incremental'], ['--optimize'], ['--paginate']):
+            with self.subTest(mode=mode):
+                status, out = self.run_json('build', *mode)
+                self.assertEqual(status, 0)
+                self.assertEqual(out, {'ok': True, 'command': "build", 'output_file': self.output_file,
+                                       'bytes': os.path.getsize(self.output_file)})
+
+    def test_errors_exit_with_status_one(self):
+        with open(self.config_file, 'rb') as f:
+            on_disk = f.read()
+        status, out = self.run_json('update', "no-such-link", '--badge', "Hoy")
+        self.assertEqual(status, 1)
+        self.assertEqual(out['ok'], False)
+        self.assertEqual(out['command'], "update")
+        self.assertIn("no-such-link", out['error'])
+
+        status, stdout, stderr = self.run_main('add', '--title', "Roto", '--url', "not a url")
+        self.assertEqual(status, 1)
+        self.assertEqual(stdout, "")
+        self.assertTrue(stderr.startswith("Error: "))
+        with open(self.config_file, 'rb') as f:
+            self.assertEqual(f.read(), on_disk)
+
+    def test_check_links(self):
+        base = self.serve_stub()
+        manager = self.load()
+        manager.links = []
+        manager.add_link("Bien", f"{base}/ok", id="bien")
+        manager.add_link("Correo", "mailto:hola@example.com", id="correo")
+        manager.save_config()
+
+        status, out = self.run_json('check-links', '--ttl', '0')
+        self.assertEqual(status, 0)
+        self.assertEqual((out['ok'], out['checked'], out['broken'], out['skipped']),
+                         (True, 1, [], ["correo"]))
+
+        manager = self.load()
+        manager.add_link("Roto", f"{base}/missing", id="roto")
+        manager.save_config()
+        status, out = self.run_json('check-links', '--ttl', '0')
+        self.assertEqual(status, 1)
+        self.assertEqual((out['ok'], out['broken']), (False, ["roto"]))
+        self.assertEqual(out['links']['roto']['status'], 404)
+
+    def test_bench(self):
+        status, stdout, stderr = self.run_main('--json', 'bench', '--sizes', '10', '--repeat', '1',
+                                               '--no-memory')
+        self.assertEqual(status, 0)
+        out = json.loads(stdout)
+        self.assertTrue(out['ok'])
+        self.assertTrue(out['results'])
+        # The progress rows go to stderr, leaving stdout to the JSON document
+        self.assertIn("load_config", stderr)
+
+    def test_json_metrics_go_to_stderr(self):
+        status, stdout, stderr = self.run_main('--json', '--metrics', '-', 'build')
+        self.assertEqual(status, 0)
+        self.assertEqual(json.loads(stdout)['command'], "build")
+        self.assertIn('generate_html', json.loads(stderr)['spans'])
+
+
+if __name__ == "__main__":
+    unittest.main()
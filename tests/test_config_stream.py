@@ -0,0 +1,91 @@
+import json
+import os
+import re
+import tempfile
+import unittest
+
+from config_stream import StreamedConfigStorage
+from config_validation import ConfigValidationError
+from manage_links import LinkTreeManager
+
+
+class StreamedConfigStorageTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.config_file = os.path.join(self.tmp.name, "linktree_config.json")
+        manager = LinkTreeManager(self.config_file, verbose=False)
+        # Multibyte titles of every UTF-8 length, so read boundaries fall inside them
+        for i in range(300):
+            manager.add_link(f"Enlace {i} ñ € 🐍", f"https://example.com/{i}", id=f"enlace-{i}",
+                             badge="Año 🎉" if i % 7 == 0 else None)
+        manager.save_config()
+        self.expected = LinkTreeManager(self.config_file, strict=True, verbose=False).links.to_list()
+
+    def stream(self, chunk_size, batch_size=7):
+        storage = StreamedConfigStorage(self.config_file, batch_size=batch_size, chunk_size=chunk_size)
+        return [link.to_dict() for link in storage.iter_links()]
+
+    def write(self, text):
+        with open(self.config_file, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+    def read(self):
+        with open(self.config_file, encoding='utf-8') as f:
+            return f.read()
+
+    def test_links_split_across_read_chunks(self):
+        for chunk_size in (*range(1, 41), 97, 1 << 16):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(self.stream(chunk_size), self.expected)
+
+    def test_multibyte_characters_at_byte_boundaries(self):
+        # Pad the first title so its 🐍 straddles the first 8 KiB block the file is read in
+        data = json.loads(self.read())
+        text = json.dumps(data, ensure_ascii=False)
+        offset = len(text[:text.index("🐍")].encode('utf-8'))
+        data['links'][0]['title'] = "x" * (8192 - 2 - offset) + data['links'][0]['title']
+        self.expected[0]['title'] = data['links'][0]['title']
+        self.write(json.dumps(data, ensure_ascii=False))
+        with open(self.config_file, 'rb') as f:
+            raw = f.read()
+        self.assertEqual(raw[8190:8194], "🐍".encode('utf-8'))
+        for chunk_size in (1, 3, 4096, 8191, 8192):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(self.stream(chunk_size), self.expected)
+
+    def test_truncated_json_raises(self):
+        text = self.read()
+        for cut in (len(text) // 2, len(text) - 2, text.index('"links"') + 12):
+            self.write(text[:cut])
+            with self.subTest(cut=cut), self.assertRaisesRegex(
+                    ValueError, rf"^{re.escape(self.config_file)}: .* at character \d+$"):
+                self.stream(chunk_size=64)
+
+    def test_malformed_json_raises(self):
+        text = self.read()
+        broken = text.replace('},\n    {', '}\n    {', 1)
+        self.assertNotEqual(broken, text)
+        self.write(broken)
+        with self.assertRaisesRegex(ValueError, r"expected ',' or '\]' at character \d+$"):
+            self.stream(chunk_size=64)
+        self.write(text + "{}")
+        with self.assertRaisesRegex(ValueError, r"unexpected data after the config at character \d+$"):
+            self.stream(chunk_size=64)
+
+    def test_invalid_link_stops_the_stream(self):
+        data = json.loads(self.read())
+        data['links'][20]['url'] = "not a url"
+        self.write(json.dumps(data, indent=2, ensure_ascii=False))
+        streamed = []
+        storage = StreamedConfigStorage(self.config_file, batch_size=7, chunk_size=64)
+        with self.assertRaises(ConfigValidationError) as caught:
+            for link in storage.iter_links():
+                streamed.append(link.id)
+        self.assertEqual([path for path, _ in caught.exception.errors], ["$.links[20].url"])
+        # Only the batches before the bad one were produced
+        self.assertEqual(streamed, [link['id'] for link in self.expected[:14]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import config_journal
+import manage_links
+from manage_links import LinkTreeManager
+
+
+class JournalCompactionTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.config_file = os.path.join(self.tmp.name, "linktree_config.json")
+        LinkTreeManager(self.config_file, verbose=False).save_config()
+
+    def journaled_save(self, badge):
+        """Append one update to the journal and rotate it straight into a compaction"""
+        manager = LinkTreeManager(self.config_file, strict=True, verbose=False,
+                                  journal=True, journal_threshold=0)
+        manager.update_link("evento", badge=badge)
+        manager.save_config()
+        return manager
+
+    def load(self):
+        return LinkTreeManager(self.config_file, strict=True, verbose=False)
+
+    def test_compaction_folds_the_journal_into_the_snapshot(self):
+        self.journaled_save("J1").wait_for_compaction()
+
+        self.assertFalse(os.path.exists(config_journal.compacting_path(self.config_file)))
+        self.assertEqual(config_journal.snapshot_revision(self.config_file), 2)
+        self.assertEqual(self.load().links.get("evento")["badge"], "J1")
+
+    def test_full_save_during_compaction_is_kept(self):
+        real_lock = manage_links.file_lock
+        raced = threading.Event()
+
+        def racing_lock(lock_path, *args, **kwargs):
+            # Land a full save after the compactor has loaded, before it takes the lock
+            if threading.current_thread() is not threading.main_thread() and not raced.is_set():
+                raced.set()
+                manager = self.load()
+                manager.update_link("evento", badge="FULL-SAVE")
+                manager.save_config()
+            return real_lock(lock_path, *args, **kwargs)
+
+        with mock.patch.object(manage_links, "file_lock", racing_lock):
+            self.journaled_save("J1").wait_for_compaction()
+
+        self.assertTrue(raced.is_set())
+        self.assertFalse(os.path.exists(config_journal.compacting_path(self.config_file)))
+        manager = self.load()
+        self.assertEqual(manager.revision, 3)
+        self.assertEqual(manager.links.get("evento")["badge"], "FULL-SAVE")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import link_checker
+from link_checker import check_urls
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """/ok, /missing, /moved (-> /ok), /loop (redirects forever), /slow and /wait"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_HEAD(self):
+        self.respond(body=False)
+
+    def do_GET(self):
+        self.respond(body=True)
+
+    def respond(self, body):
+        path = self.path.split('?')[0]
+        server = self.server
+        with server.lock:
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            if path == '/slow':
+                time.sleep(1.0)
+            elif path == '/wait':
+                time.sleep(0.1)
+            status, headers = {
+                '/moved': (301, {'Location': '/ok'}),
+                '/loop': (302, {'Location': '/loop'}),
+                '/missing': (404, {}),
+            }.get(path, (200, {}))
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+        payload = b"stub" if body else b""
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(b"stub")))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LinkCheckerTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+        cls.server.daemon_threads = True
+        cls.server.lock = threading.Lock()
+        cls.server.in_flight = cls.server.max_in_flight = 0
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def check(self, *paths, **options):
+        options.setdefault('timeout', 5.0)
+        results = check_urls([self.base + path for path in paths], cache_file=None, **options)
+        return [results[self.base + path] for path in paths]
+
+    def test_ok_and_missing(self):
+        ok, missing = self.check('/ok', '/missing')
+        self.assertTrue(ok['ok'])
+        self.assertEqual(ok['status'], 200)
+        self.assertFalse(missing['ok'])
+        self.assertEqual(missing['status'], 404)
+
+    def test_redirect_is_followed(self):
+        (result,) = self.check('/moved')
+        self.assertTrue(result['ok'])
+        self.assertEqual(result['final_url'], self.base + '/ok')
+
+    def test_redirect_limit_is_broken(self):
+        (result,) = self.check('/loop')
+        self.assertFalse(result['ok'])
+        self.assertEqual(result['status'], 302)
+        self.assertEqual(result['error'], f"too many redirects (more than {link_checker.MAX_REDIRECTS})")
+
+    def test_timeout(self):
+        (result,) = self.check('/slow', timeout=0.2)
+        self.assertFalse(result['ok'])
+        self.assertIn("timeout", result['error'])
+
+    def test_queueing_for_a_host_is_not_timed(self):
+        # Twelve 0.1 s answers two at a time take 0.6 s, longer than the timeout
+        results = self.check(*(f"/wait?q{i}" for i in range(12)), timeout=0.35, per_host=2)
+        self.assertEqual([result['error'] for result in results], [None] * 12)
+        self.assertTrue(all(result['ok'] for result in results))
+
+    def test_non_web_links_are_skipped(self):
+        results = check_urls(["mailto:hola@example.com", "tel:+523300000000"], cache_file=None)
+        for result in results.values():
+            self.assertTrue(result['ok'])
+            self.assertTrue(result['skipped'])
+
+    def test_concurrency_caps(self):
+        for per_host, concurrency in ((2, 10), (10, 3)):
+            with self.subTest(per_host=per_host, concurrency=concurrency):
+                self.server.max_in_flight = 0
+                results = self.check(*(f"/wait?{i}" for i in range(8)),
+                                     per_host=per_host, concurrency=concurrency)
+                self.assertTrue(all(result['ok'] for result in results))
+                self.assertEqual(self.server.max_in_flight, min(per_host, concurrency))
+
+
+if __name__ == "__main__":
+    unittest.main()
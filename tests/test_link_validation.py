@@ -0,0 +1,44 @@
+import os
+import tempfile
+import unittest
+
+from config_validation import ConfigValidationError
+from manage_links import LinkTreeManager
+
+
+class MutationValidationTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.config_file = os.path.join(self.tmp.name, "linktree_config.json")
+        self.manager = LinkTreeManager(self.config_file, verbose=False)
+
+    def test_add_link_rejects_what_loading_would_reject(self):
+        for fields in ({'url': "www.example.com"}, {'url': "https://example.com", 'style': "bold"},
+                       {'url': "https://example.com", 'publish_at': "tomorrow"}):
+            with self.subTest(**fields), self.assertRaises(ConfigValidationError):
+                self.manager.add_link("Example", **fields)
+        self.assertNotIn("example", self.manager.links)
+
+    def test_update_link_leaves_the_link_unchanged_on_error(self):
+        url = self.manager.links.get("evento")['url']
+        with self.assertRaises(ConfigValidationError):
+            self.manager.update_link("evento", url="www.example.com", badge="Hoy")
+        self.assertEqual(self.manager.links.get("evento")['url'], url)
+
+    def test_saved_mutations_load_strictly(self):
+        self.manager.add_link("Example", "https://example.com", badge="Nuevo")
+        self.manager.update_link("evento", url="mailto:hola@example.com")
+        self.manager.update_theme(bg_color="#FFFFFF")
+        self.manager.save_config()
+        loaded = LinkTreeManager(self.config_file, strict=True, verbose=False)
+        self.assertEqual(loaded.links.get("example")['badge'], "Nuevo")
+
+    def test_update_theme_rejects_invalid_colors(self):
+        with self.assertRaises(ConfigValidationError):
+            self.manager.update_theme(bg_color="red")
+        self.assertNotEqual(self.manager.config['theme']['bg_color'], "red")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,32 @@
+import os
+import tempfile
+import unittest
+
+from manage_links import LinkCollection, LinkTreeManager
+
+
+class ReorderTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.manager = LinkTreeManager(os.path.join(self.tmp.name, "linktree_config.json"),
+                                       verbose=False)
+        self.ids = [id for id, _ in self.manager.get_link_ids()]
+
+    def test_reorder_links_rejects_duplicate_ids(self):
+        orders = [link.order for link in self.manager.links]
+        self.assertFalse(self.manager.reorder_links([self.ids[0]] * 2 + self.ids[2:]))
+        self.assertEqual([id for id, _ in self.manager.get_link_ids()], self.ids)
+        self.assertEqual([link.order for link in self.manager.links], orders)
+
+    def test_collection_reorder_needs_every_id_once(self):
+        links = LinkCollection(self.manager.links)
+        self.assertFalse(links.reorder([self.ids[0]] * 2 + self.ids[2:]))
+        self.assertFalse(links.reorder(self.ids[1:]))
+        self.assertTrue(links.reorder(self.ids[::-1]))
+        self.assertEqual([link.id for link in links], self.ids[::-1])
+        self.assertEqual(len({link.order for link in links}), len(self.ids))
+
+
+if __name__ == "__main__":
+    unittest.main()
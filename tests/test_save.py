@@ -0,0 +1,62 @@
+import errno
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from manage_links import ConfigConflictError, LinkTreeManager
+
+
+class SaveConfigTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.config_file = os.path.join(self.tmp.name, "linktree_config.json")
+        LinkTreeManager(self.config_file, verbose=False).save_config()
+
+    def open_manager(self):
+        return LinkTreeManager(self.config_file, strict=True, verbose=False)
+
+    def read_config_file(self):
+        with open(self.config_file, 'rb') as f:
+            return f.read()
+
+    def test_stale_manager_conflicts_unless_forced(self):
+        first, stale = self.open_manager(), self.open_manager()
+        first.update_link("evento", badge="Hoy")
+        first.save_config()
+        saved = self.read_config_file()
+
+        stale.update_link("evento", badge="Mañana")
+        with self.assertRaises(ConfigConflictError):
+            stale.save_config()
+        self.assertEqual(self.read_config_file(), saved)
+
+        stale.save_config(force=True)
+        reloaded = self.open_manager()
+        self.assertEqual(reloaded.links.get("evento")['badge'], "Mañana")
+        self.assertGreater(reloaded.revision, first.revision)
+
+    def test_failed_write_keeps_the_previous_file(self):
+        manager = self.open_manager()
+        saved = self.read_config_file()
+        revision = manager.revision
+        manager.update_link("evento", badge="Hoy")
+        for target in ('fsync', 'replace'):
+            with self.subTest(failing=target), \
+                    mock.patch(f"manage_links.os.{target}",
+                               side_effect=OSError(errno.ENOSPC, "No space left on device")):
+                with self.assertRaises(OSError):
+                    manager.save_config()
+            self.assertEqual(self.read_config_file(), saved)
+            self.assertEqual(manager.revision, revision)
+            self.assertEqual(sorted(os.listdir(self.tmp.name)),
+                             ["linktree_config.json", "linktree_config.json.lock"])
+
+        # Nothing was left half-done: the same manager saves normally afterwards
+        manager.save_config()
+        self.assertEqual(self.open_manager().links.get("evento")['badge'], "Hoy")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+import os
+import tempfile
+import unittest
+
+from manage_links import LinkTreeManager
+
+
+class SearchOrderTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.manager = LinkTreeManager(os.path.join(self.tmp.name, "linktree_config.json"),
+                                       verbose=False)
+
+    def ids(self, query):
+        return [match['id'] for match in self.manager.search(query)]
+
+    def test_search_follows_move_link(self):
+        self.assertEqual(self.ids("t"), ['evento', 'twitter', 'tiktok'])
+        self.assertTrue(self.manager.move_link("twitter", before="evento"))
+        self.assertEqual(self.ids("t"), ['twitter', 'evento', 'tiktok'])
+
+    def test_search_follows_reorder_links(self):
+        self.ids("t")
+        ids = [id for id, _ in self.manager.get_link_ids()]
+        self.assertTrue(self.manager.reorder_links(ids[::-1]))
+        self.assertEqual(self.ids("t"), ['tiktok', 'twitter', 'evento'])
+
+    def test_search_follows_batch_moves(self):
+        self.ids("t")
+        self.manager.apply_batch([{'op': 'move', 'id': 'tiktok', 'position': 0}], save=False)
+        self.assertEqual(self.ids("t"), ['tiktok', 'evento', 'twitter'])
+
+
+if __name__ == "__main__":
+    unittest.main()
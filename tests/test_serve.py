@@ -0,0 +1,61 @@
+import asyncio
+import contextlib
+import io
+import os
+import tempfile
+import time
+import unittest
+
+from manage_links import LinkTreeManager
+from serve import LinkTreeServer
+
+
+class LinkTreeServerTest(unittest.TestCase):
+    def setUp(self):
+        site = tempfile.TemporaryDirectory()
+        self.addCleanup(site.cleanup)
+        self.site = site.name
+        self.config_file = os.path.join(self.site, "linktree_config.json")
+        LinkTreeManager(self.config_file, verbose=False).save_config()
+        self.enterContext(contextlib.redirect_stdout(io.StringIO()))
+
+    def test_failed_render_at_a_transition_is_not_retried(self):
+        server = LinkTreeServer(self.config_file)
+        renders = 0
+        render = server._render
+
+        def counting_render(now):
+            nonlocal renders
+            renders += 1
+            return render(now)
+
+        server._render = counting_render
+        with open(self.config_file, 'w', encoding='utf-8') as f:
+            f.write("{")
+        server.next_transition = time.time() - 1
+
+        async def follow_briefly():
+            task = asyncio.create_task(server.follow_schedule())
+            await asyncio.sleep(0.3)
+            task.cancel()
+
+        asyncio.run(follow_briefly())
+        self.assertEqual(renders, 1)
+        self.assertIsNone(server.next_transition)
+
+    def test_images_are_served_and_watched_next_to_the_config(self):
+        os.mkdir(os.path.join(self.site, "images"))
+        with open(os.path.join(self.site, "images", "logo.png"), 'wb') as f:
+            f.write(b"png")
+        elsewhere = tempfile.TemporaryDirectory()
+        self.addCleanup(elsewhere.cleanup)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(elsewhere.name)
+
+        server = LinkTreeServer(self.config_file)
+        self.assertIn(os.path.join(self.site, "images"), server.watch_paths)
+        self.assertEqual(server.assets["/images/logo.png"].variants['identity'][0], b"png")
+
+
+if __name__ == "__main__":
+    unittest.main()
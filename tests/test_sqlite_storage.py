@@ -0,0 +1,85 @@
+import json
+import os
+import tempfile
+import unittest
+
+from manage_links import ConfigConflictError, LinkTreeManager
+from sqlite_storage import SQLiteStorage, export_json, import_json
+
+
+class SQLiteStorageTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.db_path = os.path.join(self.tmp.name, "linktree.db")
+
+    def open_manager(self):
+        storage = SQLiteStorage(self.db_path)
+        self.addCleanup(storage.close)
+        return LinkTreeManager(storage=storage, verbose=False)
+
+    def assertSameState(self, manager, other):
+        self.assertEqual(other.config, manager.config)
+        self.assertEqual(other.links.to_list(), manager.links.to_list())
+        self.assertEqual(other.revision, manager.revision)
+
+    def test_save_and_load_round_trip(self):
+        manager = self.open_manager()
+        manager.add_link("Meetup", "https://example.com/meetup", badge="Nuevo", id="meetup",
+                         publish_at="2030-01-01T00:00:00")
+        manager.save_config()
+        self.assertSameState(manager, self.open_manager())
+
+    def test_pending_operations_are_applied(self):
+        self.open_manager().save_config()
+        manager = self.open_manager()
+        ids = [id for id, _ in manager.get_link_ids()]
+        manager.add_link("Meetup", "https://example.com/meetup", id="meetup")
+        manager.update_link(ids[0], badge="Hoy")
+        manager.disable_link(ids[1])
+        manager.delete_link(ids[2])
+        manager.move_link("meetup", before=ids[0])
+        manager.update_theme(bg_color="#FFFFFF")
+        manager.update_config(logo_text="PyGDL")
+        self.assertTrue(manager._pending)
+        manager.save_config()
+        self.assertFalse(manager._pending)
+
+        reloaded = self.open_manager()
+        self.assertSameState(manager, reloaded)
+        self.assertEqual([id for id, _ in reloaded.get_link_ids()][:2], ["meetup", ids[0]])
+        self.assertEqual([link.id for link in reloaded.storage.iter_enabled_links()],
+                         [link.id for link in manager.links if link['enabled']])
+
+    def test_stale_revision_conflicts(self):
+        self.open_manager().save_config()
+        first, second = self.open_manager(), self.open_manager()
+        first.update_link(first.get_link_ids()[0][0], badge="Hoy")
+        first.save_config()
+        second.update_config(logo_text="PyGDL")
+        with self.assertRaises(ConfigConflictError):
+            second.save_config()
+        self.assertSameState(first, self.open_manager())
+
+        second.save_config(force=True)
+        reloaded = self.open_manager()
+        self.assertSameState(second, reloaded)
+        self.assertEqual(reloaded.config['logo_text'], "PyGDL")
+
+    def test_import_and_export_json(self):
+        json_path = os.path.join(self.tmp.name, "linktree_config.json")
+        manager = LinkTreeManager(json_path, verbose=False)
+        manager.add_link("Meetup", "https://example.com/meetup", id="meetup")
+        manager.save_config()
+
+        self.assertEqual(import_json(json_path, self.db_path), len(manager.links))
+        self.assertSameState(manager, self.open_manager())
+
+        exported = os.path.join(self.tmp.name, "exported.json")
+        self.assertEqual(export_json(self.db_path, exported), len(manager.links))
+        with open(json_path, encoding='utf-8') as f, open(exported, encoding='utf-8') as g:
+            self.assertEqual(json.load(g), json.load(f))
+
+
+if __name__ == "__main__":
+    unittest.main()
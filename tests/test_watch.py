@@ -0,0 +1,49 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from manage_links import LinkTreeManager
+from watch import ConfigWatcher
+
+
+class ConfigWatcherTest(unittest.TestCase):
+    def setUp(self):
+        site = tempfile.TemporaryDirectory()
+        elsewhere = tempfile.TemporaryDirectory()
+        self.addCleanup(site.cleanup)
+        self.addCleanup(elsewhere.cleanup)
+        self.site = site.name
+        self.config_file = os.path.join(self.site, "linktree_config.json")
+        LinkTreeManager(self.config_file, verbose=False).save_config()
+        os.mkdir(os.path.join(self.site, "images"))
+        # Run from another directory, as cron or a service manager would
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(elsewhere.name)
+
+    def test_images_are_watched_next_to_the_config(self):
+        watcher = ConfigWatcher(self.config_file, interval=0, debounce=0)
+        self.assertIn(os.path.join(self.site, "images"), watcher.watch_paths)
+        self.assertFalse(watcher.poll())
+        with open(os.path.join(self.site, "images", "logo.png"), 'wb') as f:
+            f.write(b"png")
+        self.assertTrue(watcher.poll())
+
+    def test_failed_build_keeps_watching(self):
+        manager = LinkTreeManager(self.config_file, verbose=False)
+        output_dir = os.path.join(self.site, "public")
+        manager.config['output_file'] = os.path.join(output_dir, "index.html")
+        manager.save_config()
+        watcher = ConfigWatcher(self.config_file, interval=0, debounce=0)
+        with contextlib.redirect_stdout(io.StringIO()):
+            # The output directory does not exist yet
+            self.assertFalse(watcher.rebuild(force=True))
+            self.assertIsNone(watcher.next_transition)
+            os.mkdir(output_dir)
+            self.assertTrue(watcher.rebuild())
+        self.assertTrue(os.path.exists(os.path.join(output_dir, "index.html")))
+
+
+if __name__ == "__main__":
+    unittest.main()
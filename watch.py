@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Pythonistas GDL Linktr.ee watch mode
+
+Watches ``linktree_config.json`` and the ``images/`` directory next to it and
+rebuilds the HTML page whenever they change. Bursts of writes (editors saving several
+times, the interactive menu saving) are coalesced with a debounce window, and
+a rebuild only happens when the parsed config or the images actually changed.
+Links with a ``publish_at``/``expire_at`` window trigger a rebuild at exactly
+the moment they appear or disappear.
+
+Only stdlib polling of file metadata is used, so it works everywhere.
+
+Usage:
+    python watch.py [config_file] [--interval 0.5] [--debounce 0.3]
+"""
+
+import argparse
+import os
+import time
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+import config_journal
+import instrumentation
+from manage_links import LinkTreeManager, content_hash
+
+
+def snapshot(paths) -> Dict[str, Tuple[int, int]]:
+    """Return ``{path: (mtime_ns, size)}`` for the given files and directory entries"""
+    state = {}
+    for path in paths:
+        if os.path.isdir(path):
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        st = entry.stat()
+                        state[entry.path] = (st.st_mtime_ns, st.st_size)
+        elif os.path.exists(path):
+            st = os.stat(path)
+            state[path] = (st.st_mtime_ns, st.st_size)
+    return state
+
+
+def _log(message):
+    print(f"[{datetime.now():%H:%M:%S}] {message}")
+
+
+class ConfigWatcher:
+    """Polls the config file and asset directories and rebuilds on change"""
+
+    def __init__(self, config_file="linktree_config.json", watch_dirs=("images",),
+                 interval=0.5, debounce=0.3, metrics=instrumentation.DISABLED):
+        self.config_file = config_file
+        self.metrics = metrics
+        self.config_paths = [config_file, config_journal.journal_path(config_file)]
+        # Relative asset directories live next to the config, wherever we are run from
+        base = os.path.dirname(config_file)
+        self.watch_paths = [*self.config_paths, *(os.path.join(base, path) for path in watch_dirs)]
+        self.interval = interval
+        self.debounce = debounce
+        self.rebuilds = 0
+        self._files = snapshot(self.watch_paths)
+        self._config_hash: Optional[str] = None
+        self._assets_hash: Optional[str] = None
+        # When a scheduled link next appears or disappears (POSIX time)
+        self.next_transition: Optional[float] = None
+
+    def _wait_for_quiet(self):
+        """Block until nothing has changed for a whole debounce window"""
+        while True:
+            time.sleep(self.debounce)
+            current = snapshot(self.watch_paths)
+            if current == self._files:
+                return
+            self._files = current
+
+    def poll(self) -> bool:
+        """Check once for changes; returns True when a change burst has settled"""
+        current = snapshot(self.watch_paths)
+        if current == self._files:
+            return False
+        self._files = current
+        self._wait_for_quiet()
+        return True
+
+    def rebuild(self, force=False) -> bool:
+        """Rebuild the page if the parsed config or the assets changed"""
+        start = time.perf_counter()
+        try:
+            manager = LinkTreeManager(self.config_file, strict=True, verbose=False,
+                                      metrics=self.metrics)
+        except (OSError, ValueError) as e:
+            _log(f"Skipping rebuild, config unreadable: {e}")
+            # The next file change brings a fresh schedule
+            self.next_transition = None
+            return False
+
+        # Hash the loaded state (snapshot plus journal), not the raw file bytes
+        config_hash = content_hash([manager.config, manager.links.to_list()])
+        assets_hash = content_hash(sorted(
+            [path, *stat] for path, stat in self._files.items() if path not in self.config_paths
+        ))
+        if not force and config_hash == self._config_hash and assets_hash == self._assets_hash:
+            _log("No relevant changes, skipping rebuild")
+            return False
+
+        manager.verbose = True
+        now = time.time()
+        try:
+            manager.generate_html(incremental=True, now=now)
+        except (OSError, ValueError, KeyError) as e:
+            # Keep watching: the hashes are not updated, so the next change retries
+            _log(f"Rebuild failed: {e}")
+            self.next_transition = None
+            return False
+        self.next_transition = manager.next_transition(now)
+        elapsed = (time.perf_counter() - start) * 1000
+
+        self._config_hash = config_hash
+        self._assets_hash = assets_hash
+        self.rebuilds += 1
+        _log(f"Rebuilt {manager.config['output_file']} in {elapsed:.1f} ms")
+        if self.next_transition is not None:
+            _log(f"Next scheduled change at {datetime.fromtimestamp(self.next_transition):%Y-%m-%d %H:%M:%S}")
+        return True
+
+    def _until_transition(self) -> Optional[float]:
+        """Seconds until the next scheduled change, or None if nothing is scheduled"""
+        if self.next_transition is None:
+            return None
+        return max(0.0, self.next_transition - time.time())
+
+    def run(self, max_rebuilds=None):
+        """Build once, then keep rebuilding on changes until interrupted"""
+        _log(f"Watching {', '.join(self.watch_paths)} (Ctrl+C to stop)")
+        self.rebuild(force=True)
+        try:
+            while max_rebuilds is None or self.rebuilds < max_rebuilds:
+                if self.poll():
+                    self.rebuild()
+                elif self._until_transition() == 0.0:
+                    # A scheduled link was published or expired: the page changes now
+                    self.rebuild(force=True)
+                else:
+                    # Sleep until the next file poll, or exactly until the next transition
+                    wait = self._until_transition()
+                    time.sleep(self.interval if wait is None else min(self.interval, wait))
+        except KeyboardInterrupt:
+            _log("Stopped watching")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rebuild the Linktr.ee page when its config changes")
+    parser.add_argument('config_file', nargs='?', default="linktree_config.json")
+    parser.add_argument('--images', default="images", help="asset directory to watch (relative to the config file)")
+    parser.add_argument('--interval', type=float, default=0.5, help="polling interval in seconds")
+    parser.add_argument('--debounce', type=float, default=0.3,
+                        help="quiet period in seconds before rebuilding")
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    with instrumentation.from_args(args) as metrics:
+        watcher = ConfigWatcher(args.config_file, watch_dirs=(args.images,),
+                                interval=args.interval, debounce=args.debounce, metrics=metrics)
+        watcher.run()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())